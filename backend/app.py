@@ -3,22 +3,41 @@
 import os
 from flask import Flask, jsonify, request
 from flask_sqlalchemy import SQLAlchemy
+from flask_migrate import Migrate
 from flask_cors import CORS
 from datetime import datetime
 import logging
 from models.linkedin_models import LinkedInUser, LinkedInPost, ContentTemplate, init_linkedin_db
-from services.linkedin_service import LinkedInService
-from services.gemini_service import GeminiService
-from services.news_service import NewsService
 # LINKEDIN INTEGRATION - Ajout
 from routes.linkedin_auth import linkedin_auth_bp, init_linkedin_routes
 from routes.linkedin_content import linkedin_content_bp, init_linkedin_content_routes
-# Configuration du logging
-logging.basicConfig(level=logging.INFO)
+from routes.linkedin_calendar import linkedin_calendar_bp, init_linkedin_calendar_routes
+from routes.linkedin_export import linkedin_export_bp, init_linkedin_export_routes
+from routes.linkedin_async import linkedin_async_bp, init_linkedin_async_routes, ASYNC_VIEWS_AVAILABLE
+from services.publish_relay import init_publish_relay
+from services.usage_counters import init_template_usage
+from services.usage_ledger import init_usage_ledger
+from services.template_catalogue import init_template_catalogue
+from services.metrics_timeseries import init_snapshot_compactor
+from services.lazy_imports import start_prewarm
+from db_engine import build_engine_profile, install_engine_events, get_pool_metrics
+from http_cache import init_http_cache
+from json_provider import init_json_provider
+from metrics import init_metrics, reset_metrics_dir, metrics_authorized
+from query_guard import init_query_guard
+from health import init_health
+from rate_limit import init_rate_limit
+from logging_config import configure_logging, init_request_logging
+# Configuration du logging : file en mémoire, JSON sur stdout écrit en arrière-plan
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # Initialisation Flask
 app = Flask(__name__)
+# Sérialisation JSON : orjson si installé, sinon bibliothèque standard
+init_json_provider(app)
+# X-Request-ID repris ou généré, présent dans chaque ligne de log
+init_request_logging(app)
 app.config['LINKEDIN_CLIENT_ID'] = os.getenv('LINKEDIN_CLIENT_ID')
 app.config['LINKEDIN_CLIENT_SECRET'] = os.getenv('LINKEDIN_CLIENT_SECRET')
 app.config['LINKEDIN_REDIRECT_URI'] = os.getenv('LINKEDIN_REDIRECT_URI')
@@ -47,15 +66,48 @@ else:
     app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///linkedboost_dev.db'
 
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+
+# Profil du pool dérivé du modèle de workers gunicorn
+engine_profile = build_engine_profile(app.config['SQLALCHEMY_DATABASE_URI'])
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_profile['engine_options']
 app.secret_key = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
 
 # Initialisation extensions
 init_linkedin_db(db)
 db = SQLAlchemy(app)
+# Migrations de schéma : flask --app app db upgrade
+migrate = Migrate(app, db)
+with app.app_context():
+    install_engine_events(db.engine, engine_profile['profile'])
 init_linkedin_routes(db)
 init_linkedin_content_routes(db)
+init_linkedin_calendar_routes(db)
+init_linkedin_export_routes(db)
+init_linkedin_async_routes(db)
+publish_relay = init_publish_relay(app, db)
+template_usage = init_template_usage(app, db)
+# Tokens Gemini par génération, écrits par lots
+usage_ledger = init_usage_ledger(app, db)
+init_template_catalogue(app, db)
+# Compactage de l'historique des métriques en arrière-plan
+snapshot_compactor = init_snapshot_compactor(app, db)
+# Métriques Prometheus : /api/metrics, agrégées sur les workers
+app_metrics = init_metrics(app, db)
+# Budget SQL par endpoint et détection des N+1
+init_query_guard(app, db)
+# /livez et /readyz : sondes en arrière-plan, résultat en cache
+health_monitor = init_health(app, db)
+# Token bucket par utilisateur et global sur les routes @rate_limit (429 + Retry-After)
+init_rate_limit(app)
 app.register_blueprint(linkedin_auth_bp)
 app.register_blueprint(linkedin_content_bp)
+app.register_blueprint(linkedin_calendar_bp)
+app.register_blueprint(linkedin_export_bp)
+init_http_cache(app)
+if ASYNC_VIEWS_AVAILABLE:
+    app.register_blueprint(linkedin_async_bp)
+else:
+    logger.warning("⚠️ asgiref/httpx absents : routes /api/linkedin/async désactivées")
 # Modèles de données
 class User(db.Model):
     __tablename__ = 'users'
@@ -123,7 +175,7 @@ class GeminiService:
         self.simulation_mode = True  # Mode simulation pour Render
     
     def generate_from_prompt(self, prompt, tone="professionnel", sector="general"):
-        logger.info(f"🤖 Génération simulée: {prompt[:50]}...")
+        logger.info("🤖 Génération simulée: %s...", prompt[:50])
         
         if tone == "inspirant":
             return f"""✨ {prompt} - Une réflexion qui m'inspire aujourd'hui.
@@ -209,15 +261,16 @@ def test_linkedin():
 # Routes API
 @app.route('/api/health')
 def health_check():
-    """Route de santé pour vérifier que l'API fonctionne"""
-    try:
-        # Test base de données
-        db.session.execute('SELECT 1')
+    """Route de santé pour vérifier que l'API fonctionne (état de la base lu dans le cache des sondes)"""
+    health_monitor.start()
+    readiness = health_monitor.readiness()
+    database = readiness['dependencies'].get('database')
+    if database is None:
+        db_status = readiness['status']
+    elif database['status'] == 'up':
         db_status = 'connected'
-    except Exception as e:
-        db_status = f'error: {str(e)}'
-    
-    logger.info("✅ Health check appelé - API fonctionnelle")
+    else:
+        db_status = f"error: {database.get('error', database['status'])}"
     
     return jsonify({
         'status': 'healthy',
@@ -228,6 +281,12 @@ def health_check():
         'cors': 'enabled',
         'environment': os.getenv('FLASK_ENV', 'development')
     })
+@app.route('/api/health/pool')
+def pool_health():
+    """Métriques du pool de connexions de ce worker (même jeton que /api/metrics)"""
+    if not metrics_authorized():
+        return jsonify({'error': 'Non autorisé'}), 401
+    return jsonify(get_pool_metrics(db.engine, engine_profile['profile']))
 # Routes d'authentification
 @app.route('/api/auth/status')
 def auth_status():
@@ -345,7 +404,7 @@ def generate_post():
     prompt = data.get('prompt', '')
     tone = data.get('tone', 'professionnel')
     
-    logger.info(f"🤖 Génération de post: {prompt[:50]}...")
+    logger.info("🤖 Génération de post: %s...", prompt[:50])
     
     gemini = GeminiService()
     draft = gemini.generate_from_prompt(prompt, tone)
@@ -361,7 +420,7 @@ def publish_post():
     content = data.get('content', '')
     publish_now = data.get('publishNow', False)
     
-    logger.info(f"📤 Publication simulée: {len(content)} caractères")
+    logger.info("📤 Publication simulée: %s caractères", len(content))
     
     if publish_now:
         return jsonify({
@@ -398,7 +457,7 @@ def not_found(error):
 
 @app.errorhandler(500)
 def internal_error(error):
-    logger.error(f"Erreur 500: {str(error)}")
+    logger.error("Erreur 500: %s", error)
     return jsonify({'error': 'Internal server error'}), 500
 
 @app.route('/')
@@ -418,6 +477,13 @@ def index():
         'frontend': 'https://privalead-1.onrender.com'
     })
 
+@app.cli.command('compact-metrics')
+def compact_metrics_command():
+    """Sous-échantillonner et purger l'historique des métriques"""
+    from services.metrics_timeseries import compact_snapshots
+    result = compact_snapshots(db)
+    print(f"Points journaliers écrits: {result['dailyWritten']}, points supprimés: {result['deleted']}")
+
 if __name__ == '__main__':
     # Créer les tables si elles n'existent pas
     with app.app_context():
@@ -425,8 +491,17 @@ if __name__ == '__main__':
             db.create_all()
             logger.info("✅ Base de données initialisée")
         except Exception as e:
-            logger.error(f"❌ Erreur base de données: {e}")
+            logger.error("❌ Erreur base de données: %s", e)
+    
+    publish_relay.start()
+    template_usage.start()
+    usage_ledger.start()
+    snapshot_compactor.start()
+    reset_metrics_dir()
+    app_metrics.start()
+    health_monitor.start()
+    start_prewarm()
     
     port = int(os.environ.get('PORT', 5000))
-    logger.info(f"🚀 LinkedBoost API démarrant sur le port {port}")
+    logger.info("🚀 LinkedBoost API démarrant sur le port %s", port)
     app.run(host='0.0.0.0', port=port, debug=False)
@@ -0,0 +1,113 @@
+# backend/bench_analytics.py - Rafraîchissement des métriques LinkedIn : un par un contre récupération groupée
+#
+# Usage :
+#   python bench_analytics.py --posts 1000 --latency fixed:50
+#
+# Démarre le serveur de substitution (standin_server.py) dans le processus,
+# crée --posts posts publiés dans bench_app, puis mesure :
+#   sequential : get_post_analytics post par post, puis un flush ORM par post
+#                (mesuré sur --sample posts et extrapolé)
+#   bulk       : POST /api/linkedin/analytics/refresh (requêtes en parallèle
+#                bornées, un UPDATE groupé, points d'historique, un commit)
+# Le plancher du chemin groupé est posts × latence / connexions par hôte
+# (10 par défaut dans get_bulk_post_analytics). Échoue si le
+# rafraîchissement groupé dépasse --budget-s.
+
+import os
+import time
+import logging
+import argparse
+import threading
+import random
+from werkzeug.serving import make_server
+
+# Connexions par hôte de get_bulk_post_analytics (valeur par défaut de la route)
+BULK_CONNECTIONS = 10
+
+
+def start_standin(latency: str):
+    """Serveur de substitution sur un port libre ; renvoie son URL de base"""
+    from standin_server import create_standin_app
+    server = make_server('127.0.0.1', 0, create_standin_app(latency=latency, seed=1), threaded=True)
+    threading.Thread(target=server.serve_forever, name='standin', daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}'
+
+
+def seed_posts(db, models, linkedin_user, count: int):
+    db.session.execute(models.LinkedInPost.__table__.insert(), [
+        {
+            'user_id': linkedin_user.user_id,
+            'linkedin_user_id': linkedin_user.id,
+            'content': f'Post de mesure {i}',
+            'status': 'published',
+            'linkedin_post_id': f'urn:li:share:{7000000000000000000 + i}'
+        }
+        for i in range(count)
+    ])
+    db.session.commit()
+
+
+def run_sequential(db, models, service, sample: int) -> float:
+    """Ancien chemin : un appel puis un flush ORM par post ; secondes par post"""
+    posts = models.LinkedInPost.query.filter_by(status='published').limit(sample).all()
+    started = time.perf_counter()
+    for post in posts:
+        metrics = service.get_post_analytics(post.linkedin_post_id)
+        post.likes_count = metrics.get('likes', 0)
+        post.comments_count = metrics.get('comments', 0)
+        post.shares_count = metrics.get('shares', 0)
+        post.views_count = metrics.get('views', 0)
+        db.session.flush()
+    db.session.commit()
+    return (time.perf_counter() - started) / len(posts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Rafraîchissement groupé des métriques LinkedIn')
+    parser.add_argument('--posts', type=int, default=1000)
+    parser.add_argument('--latency', default='fixed:50', help='Latence du serveur de substitution')
+    parser.add_argument('--sample', type=int, default=50, help='Posts mesurés en séquentiel (extrapolé)')
+    parser.add_argument('--budget-s', type=float, default=8.0)
+    args = parser.parse_args()
+    
+    # LINKEDIN_API_BASE_URL est lu à l'import de linkedin_service
+    base_url = start_standin(args.latency)
+    os.environ['LINKEDIN_API_BASE_URL'] = f'{base_url}/linkedin/v2'
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    
+    from bench_app import create_bench_app, seed_user, logged_in_client
+    from standin_server import LatencyModel
+    from services.linkedin_service import LinkedInService
+    
+    app, db, models = create_bench_app()
+    with app.app_context():
+        linkedin_user = seed_user(db, models)
+        seed_posts(db, models, linkedin_user, args.posts)
+        per_post = run_sequential(db, models, LinkedInService(linkedin_user.access_token), args.sample)
+    
+    client = logged_in_client(app)
+    started = time.perf_counter()
+    response = client.post('/api/linkedin/analytics/refresh')
+    bulk = time.perf_counter() - started
+    result = response.get_json()
+    
+    sequential = per_post * args.posts
+    print(f"{args.posts} posts, latence {args.latency}")
+    print(f"  sequential : {sequential:7.2f} s (extrapolé de {args.sample} posts, {per_post * 1000:.1f} ms/post)")
+    print(f"  bulk       : {bulk:7.2f} s ({result.get('updated')}/{result.get('requested')} posts mis à jour)")
+    print(f"  gain       : ×{sequential / bulk:.1f}")
+    latency_ms = LatencyModel(args.latency).sample(random.Random(0)) * 1000
+    print(f"  plancher   : {args.posts * latency_ms / 1000 / BULK_CONNECTIONS:7.2f} s ({BULK_CONNECTIONS} connexions, {latency_ms:.0f} ms)")
+    
+    if response.status_code != 200 or result.get('updated') != args.posts:
+        print(f"❌ Rafraîchissement incomplet: {response.status_code} {result}")
+        raise SystemExit(1)
+    if bulk > args.budget_s:
+        print(f"❌ Budget dépassé : {bulk:.2f} s > {args.budget_s} s")
+        raise SystemExit(1)
+    print("✅ Rafraîchissement dans le budget")
+
+
+if __name__ == '__main__':
+    main()
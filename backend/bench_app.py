@@ -0,0 +1,154 @@
+# backend/bench_app.py - Application autonome pour les benchmarks et vérifications (bench_*.py)
+#
+# app.py n'est pas importable dans cet arbre : models/*.py lisent `db` à la
+# définition des classes alors qu'il n'est injecté qu'après l'import. Ce
+# module crée d'abord l'instance SQLAlchemy, charge les modèles avec `db`
+# déjà en place (sans exécuter models/__init__ ni routes/__init__, qui
+# importent les anciens modules), puis branche les blueprints LinkedIn et
+# les hooks d'infrastructure dans le même ordre qu'app.py.
+#
+#   from bench_app import create_bench_app, seed_user
+#   app, db, models = create_bench_app()
+#
+# create_bench_app() est aussi l'instruction mesurée par défaut dans
+# bench_startup.py.
+
+import os
+import sys
+import types
+import importlib
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+MODEL_MODULES = ('models.user', 'models.post', 'models.linkedin_models')
+
+
+def _package(name: str):
+    """Paquet sans son __init__ (les sous-modules se chargent un par un)"""
+    if name not in sys.modules:
+        package = types.ModuleType(name)
+        package.__path__ = [os.path.join(BACKEND_DIR, name)]
+        sys.modules[name] = package
+
+
+def _load_with_db(name: str, db):
+    """Exécuter un module de modèles avec `db` injecté avant les classes"""
+    path = os.path.join(BACKEND_DIR, *name.split('.')) + '.py'
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    module = types.ModuleType(name)
+    module.__file__ = path
+    module.db = db
+    sys.modules[name] = module
+    # `db = None` écraserait l'instance injectée
+    exec(compile(source.replace('\ndb = None\n', '\n', 1), path, 'exec'), module.__dict__)
+    return module
+
+
+def create_bench_app(database_uri: str = 'sqlite://', **config):
+    """
+    Application Flask avec les modèles, blueprints et hooks du backend
+    
+    Args:
+        database_uri: URL SQLAlchemy (SQLite en mémoire par défaut)
+        config: Clés de configuration Flask supplémentaires
+    
+    Returns:
+        tuple: (app, db, module models.linkedin_models)
+    """
+    from json_provider import init_json_provider
+    from db_engine import build_engine_profile, install_engine_events
+    
+    app = Flask('bench_app')
+    init_json_provider(app)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_uri
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    engine_profile = build_engine_profile(database_uri)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_profile['engine_options']
+    app.secret_key = 'bench'
+    app.config.update(config)
+    db = SQLAlchemy(app)
+    with app.app_context():
+        install_engine_events(db.engine, engine_profile['profile'])
+    
+    _package('models')
+    _package('routes')
+    for name in MODEL_MODULES:
+        _load_with_db(name, db)
+    models = sys.modules['models.linkedin_models']
+    with app.app_context():
+        db.create_all()
+    
+    from services.publish_relay import init_publish_relay
+    from services.usage_counters import init_template_usage
+    from services.usage_ledger import init_usage_ledger
+    from services.template_catalogue import init_template_catalogue
+    from services.metrics_timeseries import init_snapshot_compactor
+    from metrics import init_metrics
+    from query_guard import init_query_guard
+    from health import init_health
+    from rate_limit import init_rate_limit
+    from http_cache import init_http_cache
+    
+    blueprints = [
+        ('routes.linkedin_auth', 'linkedin_auth_bp', 'init_linkedin_routes'),
+        ('routes.linkedin_content', 'linkedin_content_bp', 'init_linkedin_content_routes'),
+        ('routes.linkedin_calendar', 'linkedin_calendar_bp', 'init_linkedin_calendar_routes'),
+        ('routes.linkedin_export', 'linkedin_export_bp', 'init_linkedin_export_routes'),
+        ('routes.linkedin_async', 'linkedin_async_bp', 'init_linkedin_async_routes')
+    ]
+    for module_name, _, init_name in blueprints:
+        getattr(importlib.import_module(module_name), init_name)(db)
+    
+    init_publish_relay(app, db)
+    init_template_usage(app, db)
+    init_usage_ledger(app, db)
+    init_template_catalogue(app, db)
+    init_snapshot_compactor(app, db)
+    init_metrics(app, db)
+    init_query_guard(app, db)
+    init_health(app, db)
+    init_rate_limit(app)
+    
+    async_available = importlib.import_module('routes.linkedin_async').ASYNC_VIEWS_AVAILABLE
+    for module_name, blueprint_name, _ in blueprints:
+        if module_name == 'routes.linkedin_async' and not async_available:
+            continue
+        app.register_blueprint(getattr(sys.modules[module_name], blueprint_name))
+    init_http_cache(app)
+    return app, db, models
+
+
+def seed_user(db, models, user_id: int = 1, access_token: str = 'bench-token'):
+    """Utilisateur et compte LinkedIn actif ; renvoie le LinkedInUser"""
+    user_model = sys.modules['models.user'].User
+    db.session.add(user_model(id=user_id, sub=f'bench-{user_id}', email=f'user{user_id}@bench.local'))
+    # Pas de relationship User -> LinkedInUser : l'utilisateur d'abord, pour la clé étrangère
+    db.session.flush()
+    linkedin_user = models.LinkedInUser(
+        user_id=user_id,
+        linkedin_id=f'bench-{user_id}',
+        email=f'user{user_id}@bench.local',
+        access_token=access_token,
+        is_active=True
+    )
+    db.session.add(linkedin_user)
+    db.session.commit()
+    return linkedin_user
+
+
+def logged_in_client(app, user_id: int = 1):
+    """Client de test avec session['user_id']"""
+    client = app.test_client()
+    with client.session_transaction() as flask_session:
+        flask_session['user_id'] = user_id
+    return client
+
+
+if __name__ == '__main__':
+    bench_app, _, _ = create_bench_app()
+    print(f"{len(list(bench_app.url_map.iter_rules()))} routes enregistrées")
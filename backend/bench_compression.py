@@ -0,0 +1,166 @@
+# backend/bench_compression.py - Octets économisés par la compression et coût des revalidations (304)
+#
+# Usage :
+#   python bench_compression.py --posts 200 --repeat 20
+#
+# Démarre le serveur de substitution LinkedIn (standin_server.py) dans le
+# processus, crée --posts posts au texte varié et --templates templates dans
+# bench_app, puis pour chaque endpoint :
+#   - taille du corps sans compression (Accept-Encoding: identity), en gzip
+#     et en brotli si le module est installé ;
+#   - coût d'une revalidation : If-None-Match avec l'ETag reçu, 304 attendu ;
+#     octets d'en-têtes, requêtes SQL et temps médian, comparés au 200.
+# Les tailles dépendent du contenu : des posts réels compressent moins bien
+# que des textes générés à partir d'un vocabulaire réduit.
+
+import os
+import time
+import random
+import logging
+import argparse
+import threading
+import statistics
+from datetime import datetime, timedelta
+from werkzeug.serving import make_server
+
+ENDPOINTS = [
+    ('posts (page)', '/api/linkedin/posts?limit=20'),
+    ('posts (résumé)', '/api/linkedin/posts?limit=20&view=summary'),
+    ('templates', '/api/linkedin/templates'),
+    ('analytics', '/api/linkedin/analytics')
+]
+WORDS = (
+    "stratégie équipe croissance données IA réseau leçon client produit lancement "
+    "recrutement marché confiance innovation projet résultat semaine retour expérience "
+    "collaboration transformation talents objectif apprentissage impact décision"
+).split()
+
+
+def start_standin():
+    """Serveur de substitution sur un port libre ; renvoie son URL de base"""
+    from standin_server import create_standin_app
+    server = make_server('127.0.0.1', 0, create_standin_app(seed=1), threaded=True)
+    threading.Thread(target=server.serve_forever, name='standin', daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}'
+
+
+def seed_posts(db, models, linkedin_user, count: int):
+    """Posts aux textes tirés au hasard (moins répétitifs qu'un gabarit)"""
+    rng = random.Random(1)
+    now = datetime.utcnow()
+    statuses = ('published', 'scheduled', 'draft')
+    db.session.execute(models.LinkedInPost.__table__.insert(), [
+        {
+            'user_id': linkedin_user.user_id,
+            'linkedin_user_id': linkedin_user.id,
+            'content': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(40, 160))),
+            'status': statuses[i % 3],
+            'linkedin_post_id': f'urn:li:share:{7300000000000000000 + i}' if i % 3 == 0 else None,
+            'published_at': now - timedelta(hours=i) if i % 3 == 0 else None,
+            'scheduled_for': now + timedelta(hours=i) if i % 3 == 1 else None,
+            'hashtags': [f'#{rng.choice(WORDS)}' for _ in range(3)],
+            'likes_count': rng.randint(0, 500),
+            'views_count': rng.randint(0, 20000),
+            'created_at': now - timedelta(minutes=i),
+            'updated_at': now - timedelta(minutes=i)
+        }
+        for i in range(count)
+    ])
+    db.session.commit()
+
+
+def seed_templates(db, models, count: int):
+    """Catalogue de templates (aucun n'est créé par défaut)"""
+    rng = random.Random(2)
+    categories = ('leadership', 'recrutement', 'produit', 'événement', 'conseil')
+    db.session.add_all([
+        models.ContentTemplate(
+            name=f"{rng.choice(WORDS).capitalize()} {rng.choice(WORDS)} {i}",
+            category=categories[i % len(categories)],
+            prompt_template=' '.join(rng.choice(WORDS) for _ in range(rng.randint(20, 60))) + ' : {sujet}',
+            tone=rng.choice(('professionnel', 'inspirant', 'décontracté')),
+            tags=[rng.choice(WORDS) for _ in range(3)],
+            icon='💡'
+        )
+        for i in range(count)
+    ])
+    db.session.commit()
+
+
+def header_bytes(response) -> int:
+    """Octets de la ligne de statut et des en-têtes, tels qu'envoyés"""
+    lines = [f'HTTP/1.1 {response.status}'] + [f'{name}: {value}' for name, value in response.headers.items()]
+    return len('\r\n'.join(lines).encode()) + 4
+
+
+def timed(client, url: str, headers: dict, repeat: int):
+    """Dernière réponse, temps médian (ms) et requêtes SQL d'un appel"""
+    from query_guard import max_queries
+    samples = []
+    for _ in range(repeat):
+        with max_queries(10 ** 6) as log:
+            started = time.perf_counter()
+            response = client.get(url, headers=headers)
+            samples.append(time.perf_counter() - started)
+    return response, round(statistics.median(samples) * 1000, 2), log.count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compression des réponses et coût des 304')
+    parser.add_argument('--posts', type=int, default=200, help='Posts créés pour l\'utilisateur')
+    parser.add_argument('--templates', type=int, default=30, help='Templates du catalogue')
+    parser.add_argument('--repeat', type=int, default=20, help='Répétitions par mesure de temps')
+    args = parser.parse_args()
+    
+    # LINKEDIN_API_BASE_URL est lu à l'import de linkedin_service
+    os.environ['LINKEDIN_API_BASE_URL'] = f'{start_standin()}/linkedin/v2'
+    os.environ['PUBLISH_RELAY_ENABLED'] = 'false'
+    logging.getLogger().setLevel(logging.ERROR)
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    
+    from bench_app import create_bench_app, seed_user, logged_in_client
+    from http_cache import BROTLI_AVAILABLE
+    
+    app, db, models = create_bench_app()
+    with app.app_context():
+        seed_posts(db, models, seed_user(db, models), args.posts)
+        seed_templates(db, models, args.templates)
+    client = logged_in_client(app)
+    
+    encodings = ['gzip', 'br'] if BROTLI_AVAILABLE else ['gzip']
+    print(f"{'endpoint':>16} {'brut':>9} " + ' '.join(f'{encoding:>16}' for encoding in encodings))
+    revalidations = []
+    for name, url in ENDPOINTS:
+        raw = client.get(url, headers={'Accept-Encoding': 'identity'})
+        raw_size = len(raw.get_data())
+        sizes = []
+        for encoding in encodings:
+            compressed = client.get(url, headers={'Accept-Encoding': encoding})
+            size = len(compressed.get_data())
+            served = compressed.headers.get('Content-Encoding', 'aucun')
+            sizes.append(f"{size / 1024:7.1f} Ko ({served}, -{100 - size * 100 // max(raw_size, 1)} %)" if served != 'aucun' else f"{size / 1024:7.1f} Ko (non compressé)")
+        print(f"{name:>16} {raw_size / 1024:6.1f} Ko " + ' '.join(f'{size:>16}' for size in sizes))
+        
+        etag = raw.headers.get('ETag')
+        if not etag:
+            continue
+        full, full_ms, full_queries = timed(client, url, {'Accept-Encoding': 'gzip'}, args.repeat)
+        revalidated, revalidated_ms, revalidated_queries = timed(
+            client, url, {'Accept-Encoding': 'gzip', 'If-None-Match': full.headers['ETag']}, args.repeat
+        )
+        revalidations.append((
+            name, full.status_code, header_bytes(full) + len(full.get_data()), full_ms, full_queries,
+            revalidated.status_code, header_bytes(revalidated) + len(revalidated.get_data()), revalidated_ms, revalidated_queries
+        ))
+    
+    print()
+    print(f"{'endpoint':>16} {'réponse gzip':>28} {'revalidation':>28}")
+    for name, status, size, ms, queries, status_304, size_304, ms_304, queries_304 in revalidations:
+        print(
+            f"{name:>16} {status} {size:>7} o {ms:>7.2f} ms {queries:>2} SQL "
+            f"{status_304} {size_304:>7} o {ms_304:>7.2f} ms {queries_304:>2} SQL"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+# backend/bench_json.py - Micro-benchmark de sérialisation JSON (providers stdlib et orjson)
+#
+# Usage :
+#   python bench_json.py --count 1000 --repeat 20
+#
+# Sérialise `count` payloads LinkedInPost.to_dict() avec chaque provider :
+# liste complète (GET /posts), un document par post (export JSONL) et
+# réponse jsonify complète. Compare aussi la taille de la liste en vue
+# complète (to_dict) et en vue résumée (to_summary_dict, view=summary),
+# brute et en gzip. Vérifie au passage que les deux providers
+# produisent les mêmes valeurs, sur ces payloads et sur EDGE_CASES
+# (flottants en notation exponentielle, NaN/Infinity, clés non chaînes).
+# Les octets peuvent différer : 1e+20 (json) contre 1e20 (orjson).
+
+import json
+import gzip
+import math
+import time
+import argparse
+import statistics
+from datetime import datetime, timedelta
+from json_provider import StdlibJSONProvider, OrjsonProvider, ORJSON_AVAILABLE
+from http_cache import GZIP_LEVEL
+
+EDGE_CASES = {
+    'floats': [0.1, 1 / 3, 2.5, 100.0, -0.0, 1e15, 1e16, 1e20, 1.2345678901234568e17, 1e-5, 1.5e-7, 5e-324, 1.7976931348623157e308],
+    'nonFinite': [math.nan, math.inf, -math.inf, {'rate': math.nan}],
+    'mixedKeys': {1: 'un', 'b': 2, 2: 'deux', False: 'faux', None: 'nul', 1.5: 'flottant'},
+    'engagement': {'avgEngagement': round(7 / 3 * 100, 2), 'ratio': 7 / 3}
+}
+
+
+def build_posts(post_class, count: int) -> list:
+    """Posts transitoires (sans base) représentatifs d'une liste utilisateur"""
+    now = datetime.utcnow()
+    posts = []
+    for i in range(count):
+        created_at = now - timedelta(hours=i, microseconds=i)
+        published = i % 3 == 0
+        posts.append(post_class(
+            id=i + 1,
+            user_id=1,
+            linkedin_user_id=1,
+            content=f"Post n°{i} : retour d'expérience sur l'IA générative en entreprise. " * 6,
+            linkedin_post_id=f"urn:li:share:{7100000000000000000 + i}" if published else None,
+            published_at=created_at + timedelta(minutes=5) if published else None,
+            scheduled_for=created_at + timedelta(days=1) if i % 3 == 1 else None,
+            status='published' if published else ('scheduled' if i % 3 == 1 else 'draft'),
+            likes_count=i * 7,
+            comments_count=i % 13,
+            shares_count=i % 5,
+            views_count=i * 120,
+            tone='professionnel',
+            generated_by_ai=True,
+            prompt_used="Rédige un post sur l'IA générative",
+            article_source={'title': 'Étude IA 2024', 'url': f'https://example.com/article/{i}'} if i % 4 == 0 else None,
+            hashtags=['#IA', '#Innovation', '#Leadership'],
+            mentions=[],
+            images=[],
+            created_at=created_at,
+            updated_at=created_at
+        ))
+        # Rempli en base par with_expression (summary_options)
+        posts[-1].snippet = posts[-1].content[:post_class.SNIPPET_LENGTH]
+    return posts
+
+
+def _timed(func, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - started)
+    return {
+        'bestMs': round(min(samples) * 1000, 2),
+        'medianMs': round(statistics.median(samples) * 1000, 2)
+    }
+
+
+def run_benchmark(app, post_class, count: int = 1000, repeat: int = 20) -> dict:
+    """Mesurer chaque provider sur les mêmes payloads to_dict()"""
+    posts = build_posts(post_class, count)
+    payloads = [post.to_dict() for post in posts]
+    body = {'success': True, 'posts': payloads, 'total': count}
+    
+    providers = {'stdlib': StdlibJSONProvider(app)}
+    if ORJSON_AVAILABLE:
+        providers['orjson'] = OrjsonProvider(app)
+    
+    results = {'to_dict': _timed(lambda: [post.to_dict() for post in posts], repeat)}
+    outputs = {}
+    with app.app_context():
+        for name, provider in providers.items():
+            outputs[name] = provider.dumps(body)
+            results[name] = {
+                'list': _timed(lambda: provider.dumps(body), repeat),
+                'perPost': _timed(lambda: [provider.dumps(payload) for payload in payloads], repeat),
+                'response': _timed(lambda: provider.response(body).get_data(), repeat),
+                'bytes': len(outputs[name].encode())
+            }
+    
+    edge_outputs = {name: provider.dumps(EDGE_CASES) for name, provider in providers.items()}
+    results['equivalent'] = _same_values(outputs.values()) and _same_values(edge_outputs.values())
+    results['identicalBytes'] = len(set(outputs.values())) == 1
+    results['edgeCases'] = edge_outputs
+    
+    # Vue résumée (view=summary) contre vue complète, mêmes posts
+    summaries = [post.to_summary_dict() for post in posts]
+    summary_body = {'success': True, 'posts': summaries, 'total': count}
+    provider = providers['stdlib']
+    with app.app_context():
+        full_bytes = provider.dumps(body).encode()
+        summary_bytes = provider.dumps(summary_body).encode()
+    results['summary'] = {
+        'to_summary_dict': _timed(lambda: [post.to_summary_dict() for post in posts], repeat),
+        'fullBytes': len(full_bytes),
+        'summaryBytes': len(summary_bytes),
+        'fullGzipBytes': len(gzip.compress(full_bytes, compresslevel=GZIP_LEVEL, mtime=0)),
+        'summaryGzipBytes': len(gzip.compress(summary_bytes, compresslevel=GZIP_LEVEL, mtime=0))
+    }
+    return results
+
+
+def _same_values(outputs) -> bool:
+    """Sorties JSON valides (sans NaN ni Infinity) et de même valeur décodée"""
+    decoded = [json.loads(output, parse_constant=_reject_constant) for output in outputs]
+    return all(value == decoded[0] for value in decoded)
+
+
+def _reject_constant(name):
+    raise ValueError(f"{name} n'est pas du JSON valide")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Micro-benchmark de sérialisation JSON')
+    parser.add_argument('--count', type=int, default=1000, help='Nombre de posts sérialisés')
+    parser.add_argument('--repeat', type=int, default=20, help='Répétitions par mesure')
+    args = parser.parse_args()
+    
+    from bench_app import create_bench_app
+    
+    app, _, models = create_bench_app()
+    results = run_benchmark(app, models.LinkedInPost, args.count, args.repeat)
+    print(f"to_dict() x{args.count} : {results['to_dict']['bestMs']} ms (médiane {results['to_dict']['medianMs']} ms)")
+    print(f"{'provider':>8} {'mesure':>10} {'best ms':>9} {'médiane':>9}")
+    for name in ('stdlib', 'orjson'):
+        if name not in results:
+            print(f"{name:>8} {'(non installé)':>10}")
+            continue
+        for measure in ('list', 'perPost', 'response'):
+            timing = results[name][measure]
+            print(f"{name:>8} {measure:>10} {timing['bestMs']:>9} {timing['medianMs']:>9}")
+    summary = results['summary']
+    print(f"to_summary_dict() x{args.count} : {summary['to_summary_dict']['bestMs']} ms (médiane {summary['to_summary_dict']['medianMs']} ms)")
+    print(
+        f"Taille x{args.count} : to_dict {summary['fullBytes'] / 1024:.1f} Ko, "
+        f"to_summary_dict {summary['summaryBytes'] / 1024:.1f} Ko "
+        f"(-{100 - summary['summaryBytes'] * 100 // summary['fullBytes']} %) ; "
+        f"gzip {summary['fullGzipBytes'] / 1024:.1f} Ko contre {summary['summaryGzipBytes'] / 1024:.1f} Ko"
+    )
+    for name, output in results['edgeCases'].items():
+        print(f"{name:>8} cas limites : {output}")
+    print(f"Mêmes valeurs : {'oui' if results['equivalent'] else 'NON'} (mêmes octets sur les posts : {'oui' if results['identicalBytes'] else 'non'})")
+    if not results['equivalent']:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+# backend/bench_logging.py - Coût de la journalisation par requête, avant/après la file de logs
+#
+# Usage :
+#   python bench_logging.py --requests 5000 --write-latency-us 200
+#
+# Chaque « requête » émet les lignes INFO d'une génération (NewsService,
+# recherche, contenu généré) et deux DEBUG désactivés. Mesure le temps
+# passé dans le thread de la requête :
+#   before : logging.basicConfig, f-strings, écriture synchrone
+#   after  : QueueHandler + JSON en arrière-plan, arguments %s, échantillonnage
+# La sortie est /dev/null, puis un flux lent (stdout saturé, pipe de Render)
+# simulé par une attente de --write-latency-us par écriture.
+
+import io
+import os
+import time
+import logging
+import argparse
+from logging_config import LogPipeline
+
+logger = logging.getLogger('bench')
+
+
+class SlowStream(io.TextIOBase):
+    """Flux dont chaque écriture bloque (tube plein, collecteur lent)"""
+    
+    def __init__(self, latency_us: float):
+        self.latency = latency_us / 1_000_000
+    
+    def write(self, text):
+        time.sleep(self.latency)
+        return len(text)
+    
+    def flush(self):
+        pass
+
+
+def request_before(user_id, keyword, prompt):
+    logger.info(f"✅ NewsAPI configuré")
+    logger.info(f"🔍 Recherche actualités: {keyword} (fr)")
+    logger.debug(f"Prompt complet: {prompt}")
+    logger.debug(f"Contexte: {dict(user=user_id, keyword=keyword)}")
+    logger.info(f"✅ Contenu généré pour user {user_id}")
+
+
+def request_after(user_id, keyword, prompt):
+    logger.info("✅ NewsAPI configuré")
+    logger.info("🔍 Recherche actualités: %s (%s)", keyword, 'fr')
+    logger.debug("Prompt complet: %s", prompt)
+    logger.debug("Contexte: %s", dict(user=user_id, keyword=keyword))
+    logger.info("✅ Contenu généré pour user %s", user_id)
+
+
+def configure_before(stream):
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    root.addHandler(handler)
+    root.setLevel(logging.INFO)
+    return None
+
+
+def run(mode: str, stream, requests: int) -> dict:
+    pipeline = LogPipeline().configure(level='INFO', stream=stream) if mode == 'after' else configure_before(stream)
+    handle_request = request_after if mode == 'after' else request_before
+    prompt = "Rédige un post sur l'IA générative en entreprise " * 20
+    
+    started = time.perf_counter()
+    for i in range(requests):
+        handle_request(i, f'mot-clé {i}', prompt)
+    in_request = time.perf_counter() - started
+    
+    if pipeline:
+        pipeline.stop()
+    total = time.perf_counter() - started
+    
+    return {
+        'perRequestUs': round(in_request / requests * 1_000_000, 1),
+        'drainMs': round((total - in_request) * 1000, 1)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Coût de la journalisation par requête')
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--write-latency-us', type=float, default=200)
+    args = parser.parse_args()
+    
+    print(f"{'sortie':>12} {'mode':>7} {'µs/requête':>11} {'vidage ms':>10}")
+    with open(os.devnull, 'w') as devnull:
+        sinks = [('/dev/null', devnull), ('flux lent', SlowStream(args.write_latency_us))]
+        for sink_name, stream in sinks:
+            # Le flux lent est réduit : l'ancien mode y passe requests × 3 × latence
+            requests = args.requests if stream is devnull else max(args.requests // 10, 100)
+            for mode in ('before', 'after'):
+                result = run(mode, stream, requests)
+                print(f"{sink_name:>12} {mode:>7} {result['perRequestUs']:>11} {result['drainMs']:>10}")
+    logging.getLogger().handlers.clear()
+
+
+if __name__ == '__main__':
+    main()
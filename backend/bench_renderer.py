@@ -0,0 +1,175 @@
+# backend/bench_renderer.py - Rendu des posts : propriétés et mesure contre l'ancien traitement des mentions
+#
+# Usage :
+#   python bench_renderer.py --posts 500 --sizes 1000,10000,100000
+#
+# 1. Propriétés, sur --posts posts générés aléatoirement (mentions, hashtags,
+#    liens suivis de ponctuation, accents, emojis, retours à la ligne) :
+#    - text[start:start+length] == '@Nom' pour chaque mention, dans l'ordre ;
+#    - content[start:start+length] == '@[Nom](URL)' pour chaque sourceMention ;
+#    - text == content avec chaque mention remplacée par '@Nom' ;
+#    - hashtags et liens = ceux générés, dédoublonnés dans l'ordre (hashtags
+#      insensibles à la casse, ponctuation finale retirée des liens).
+# 2. Mesure de render_content contre l'ancien _process_mentions (find +
+#    replace par mention, quadratique) sur des posts de --sizes caractères.
+# Échoue si une propriété est fausse ou si le plus grand post dépasse
+# --budget-ms.
+
+import re
+import sys
+import time
+import random
+import argparse
+from services.content_renderer import render_content
+
+WORDS = [
+    'stratégie', 'équipe', 'croissance', 'données', 'IA', 'réseau', 'leçon',
+    'client', 'produit', 'lancement', 'recrutement', '🚀', '👉', 'été', 'ça'
+]
+NAMES = ['Jane Doe', 'Éloïse Martin', 'Jean-Luc Picard', 'Zoé', 'Ada Lovelace']
+PUNCTUATION = ['', '', '.', ',', '!', '?', ';']
+MENTION_PATTERN = re.compile(r'@\[([^\]]*)\]\(([^)]*)\)')
+
+
+def legacy_process_mentions(content: str) -> tuple:
+    """Ancien LinkedInService._process_mentions (find + replace sur tout le texte par mention)"""
+    mentions = re.findall(r'@\[(.*?)\]\((.*?)\)', content)
+    if not mentions:
+        return content, []
+    
+    mention_entities = []
+    processed_content = content
+    for name, url in mentions:
+        linkedin_id = url.rstrip('/').split('/')[-1]
+        mention_start = processed_content.find(f"@[{name}]({url})")
+        if mention_start == -1:
+            continue
+        mention_entities.append({
+            "entity": f"urn:li:person:{linkedin_id}",
+            "textRange": {"start": mention_start, "length": len(f"@{name}")}
+        })
+        processed_content = processed_content.replace(f"@[{name}]({url})", f"@{name}", 1)
+    return processed_content, mention_entities
+
+
+def generate_post(rng: random.Random, length: int) -> dict:
+    """Post aléatoire d'environ `length` caractères et les entités attendues"""
+    tokens = []
+    expected = {'mentions': [], 'hashtags': [], 'urls': []}
+    size = 0
+    while size < length:
+        roll = rng.random()
+        if roll < 0.08:
+            name = rng.choice(NAMES)
+            slug = f"membre-{rng.randint(1, 50)}"
+            token = f"@[{name}](https://www.linkedin.com/in/{slug}/)"
+            expected['mentions'].append((name, f"urn:li:person:{slug}", token))
+        elif roll < 0.16:
+            token = f"#{rng.choice(['IA', 'ia', 'Data', 'RH', 'Leadership', 'été'])}{rng.randint(0, 3)}"
+            expected['hashtags'].append(token)
+        elif roll < 0.22:
+            url = f"https://exemple.fr/article/{rng.randint(1, 40)}"
+            token = url + rng.choice(PUNCTUATION)
+            expected['urls'].append(url)
+        else:
+            token = rng.choice(WORDS)
+        tokens.append(token)
+        tokens.append(rng.choice([' ', ' ', ' ', '\n', '\n\n']))
+        size += len(tokens[-2]) + 1
+    return {'content': ''.join(tokens), 'expected': expected}
+
+
+def dedupe(items, key=lambda item: item):
+    seen = set()
+    result = []
+    for item in items:
+        if key(item) not in seen:
+            seen.add(key(item))
+            result.append(item)
+    return result
+
+
+def check_properties(post: dict) -> list:
+    """Propriétés violées par render_content sur un post généré"""
+    content, expected = post['content'], post['expected']
+    rendered = render_content(content)
+    text = rendered['text']
+    errors = []
+    
+    if text != MENTION_PATTERN.sub(lambda m: f"@{m.group(1)}", content):
+        errors.append('texte rendu différent du remplacement de référence')
+    
+    if len(rendered['mentions']) != len(expected['mentions']) or len(rendered['sourceMentions']) != len(expected['mentions']):
+        errors.append(f"{len(rendered['mentions'])} mentions pour {len(expected['mentions'])} attendues")
+        return errors
+    
+    previous_end = 0
+    for mention, source, (name, entity, raw) in zip(rendered['mentions'], rendered['sourceMentions'], expected['mentions']):
+        start, length = mention['textRange']['start'], mention['textRange']['length']
+        if mention['entity'] != entity or source['entity'] != entity:
+            errors.append(f"entité {mention['entity']} au lieu de {entity}")
+        if text[start:start + length] != f"@{name}":
+            errors.append(f"mention décalée : {text[start:start + length]!r} au lieu de '@{name}'")
+        if start < previous_end:
+            errors.append(f"mentions qui se chevauchent à {start}")
+        previous_end = start + length
+        source_start, source_length = source['textRange']['start'], source['textRange']['length']
+        if content[source_start:source_start + source_length] != raw:
+            errors.append(f"position brute décalée : {content[source_start:source_start + source_length]!r}")
+    
+    if rendered['hashtags'] != dedupe(expected['hashtags'], key=str.lower):
+        errors.append(f"hashtags {rendered['hashtags']}")
+    if rendered['urls'] != dedupe(expected['urls']):
+        errors.append(f"liens {rendered['urls']}")
+    return errors
+
+
+def measure(func, content: str, repeat: int) -> float:
+    """Meilleur temps d'appel en millisecondes"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(content)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Propriétés et mesure du rendu des posts')
+    parser.add_argument('--posts', type=int, default=500, help='Posts générés pour les propriétés')
+    parser.add_argument('--sizes', default='1000,10000,100000', help='Tailles de post mesurées (caractères)')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--budget-ms', type=float, default=50.0, help='Budget du plus grand post')
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    failures = 0
+    for i in range(args.posts):
+        post = generate_post(rng, rng.choice([0, 50, 300, 3000]))
+        errors = check_properties(post)
+        if errors:
+            failures += 1
+            if failures <= 5:
+                print(f"❌ Post {i} : {'; '.join(errors[:3])}")
+    print(f"Propriétés : {args.posts - failures}/{args.posts} posts conformes")
+    
+    largest = 0.0
+    for size in sorted(int(value) for value in args.sizes.split(',')):
+        content = generate_post(rng, size)['content']
+        mentions = len(MENTION_PATTERN.findall(content))
+        legacy = measure(legacy_process_mentions, content, args.repeat)
+        current = measure(render_content, content, args.repeat)
+        largest = current
+        print(f"  {size:>7} car., {mentions:>5} mentions : ancien {legacy:9.2f} ms, render_content {current:7.2f} ms (×{legacy / current:.1f})")
+    
+    if failures:
+        sys.exit(1)
+    if largest > args.budget_ms:
+        print(f"❌ Budget dépassé : {largest:.2f} ms > {args.budget_ms} ms")
+        sys.exit(1)
+    print("✅ Rendu conforme et dans le budget")
+
+
+if __name__ == '__main__':
+    main()
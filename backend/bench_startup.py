@@ -0,0 +1,93 @@
+# backend/bench_startup.py - Temps de démarrage à froid et profil d'import (-X importtime)
+#
+# Usage :
+#   python bench_startup.py --runs 5
+#   python bench_startup.py --statement "import app" --budget-ms 1500 --top 25
+#
+# Chaque mesure lance un interpréteur neuf (caches de bytecode déjà écrits),
+# construit l'application et relève la durée totale et le profil d'import.
+# Par défaut l'application est celle de bench_app.py (modèles, blueprints et
+# hooks d'app.py sur SQLite en mémoire) : app.py ne s'importe pas seul.
+# Échoue si la médiane dépasse le budget ou si un SDK lourd est importé au
+# démarrage (il doit l'être au premier usage, voir services/lazy_imports.py).
+
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+# Budget de démarrage (import de l'application, hors fork gunicorn)
+COLD_START_BUDGET_MS = int(os.getenv('COLD_START_BUDGET_MS', 1500))
+DEFAULT_STATEMENT = 'from bench_app import create_bench_app; create_bench_app()'
+# Chargés au premier appel, jamais à l'import de l'application
+LAZY_MODULES = ('google.generativeai', 'grpc', 'google.protobuf', 'httpx')
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Durée cumulée (µs) par module, d'après la sortie de -X importtime"""
+    cumulative = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumul, name = line[len('import time:'):].split('|')
+        cumulative[name.strip()] = int(cumul)
+    return cumulative
+
+
+def measure(statement: str) -> dict:
+    """Un démarrage à froid : durée murale et profil d'import"""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(f"échec de `{statement}`:\n{result.stderr[-2000:]}")
+    return {
+        'wallMs': elapsed * 1000,
+        'imports': parse_importtime(result.stderr)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Temps de démarrage à froid')
+    parser.add_argument('--statement', default=DEFAULT_STATEMENT, help="Instruction de démarrage mesurée")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--budget-ms', type=int, default=COLD_START_BUDGET_MS)
+    parser.add_argument('--top', type=int, default=15, help='Modules les plus coûteux affichés')
+    args = parser.parse_args()
+    
+    # Premier lancement : écrire les .pyc, non compté
+    measure(args.statement)
+    runs = [measure(args.statement) for _ in range(args.runs)]
+    
+    wall = statistics.median(run['wallMs'] for run in runs)
+    imports = runs[-1]['imports']
+    
+    print(f"Démarrage à froid ({args.runs} runs) : médiane {wall:.0f} ms, "
+          f"min {min(run['wallMs'] for run in runs):.0f} ms, budget {args.budget_ms} ms")
+    print(f"{'cumul ms':>9}  module")
+    top_level = sorted(
+        ((micros, name) for name, micros in imports.items() if '.' not in name),
+        reverse=True
+    )[:args.top]
+    for micros, name in top_level:
+        print(f"{micros / 1000:>9.1f}  {name}")
+    
+    eager = [name for name in LAZY_MODULES if name in imports]
+    if eager:
+        print(f"❌ Importés au démarrage alors qu'ils devraient être paresseux : {', '.join(eager)}")
+    if wall > args.budget_ms:
+        print(f"❌ Budget dépassé de {wall - args.budget_ms:.0f} ms")
+    if eager or wall > args.budget_ms:
+        raise SystemExit(1)
+    print("✅ Démarrage dans le budget")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+# backend/check_query_budgets.py - Vérification des budgets SQL déclarés par @query_budget
+#
+# Usage :
+#   python check_query_budgets.py
+#
+# Démarre le serveur de substitution LinkedIn (standin_server.py) dans le
+# processus, crée un jeu de données dans bench_app, puis appelle chaque
+# endpoint décoré par @query_budget dans un bloc max_queries(budget). Échoue
+# si un endpoint dépasse son budget, répond en erreur, ou si un endpoint
+# budgété n'a pas de cas ici (un nouveau budget doit être épinglé).
+
+import os
+import sys
+import logging
+import threading
+from datetime import datetime, timedelta
+from werkzeug.serving import make_server
+
+# Endpoints budgétés non vérifiables hors ligne
+SKIPPED = {
+    'linkedin_content.generate_content': 'appel Gemini réel'
+}
+
+
+def start_standin():
+    """Serveur de substitution sur un port libre ; renvoie son URL de base"""
+    from standin_server import create_standin_app
+    server = make_server('127.0.0.1', 0, create_standin_app(seed=1), threaded=True)
+    threading.Thread(target=server.serve_forever, name='standin', daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}'
+
+
+def seed(db, models, linkedin_user):
+    """Posts publiés, programmés et brouillons ; renvoie leurs ids par statut"""
+    now = datetime.utcnow()
+    posts = []
+    for i in range(30):
+        status = ('published', 'scheduled', 'draft')[i % 3]
+        post = models.LinkedInPost(
+            user_id=linkedin_user.user_id,
+            linkedin_user_id=linkedin_user.id,
+            content=f'Post de vérification {i} #budget',
+            status=status,
+            linkedin_post_id=f'urn:li:share:{7200000000000000000 + i}' if status == 'published' else None,
+            published_at=now - timedelta(days=i) if status == 'published' else None,
+            scheduled_for=now + timedelta(days=i % 20 + 1, hours=i % 5) if status == 'scheduled' else None,
+            likes_count=i,
+            views_count=i * 10
+        )
+        db.session.add(post)
+        posts.append(post)
+    db.session.commit()
+    return {status: [post.id for post in posts if post.status == status] for status in ('published', 'scheduled', 'draft')}
+
+
+def cases(post_ids):
+    """(méthode, URL, corps JSON) par endpoint"""
+    published, draft = post_ids['published'][0], post_ids['draft']
+    future = (datetime.utcnow() + timedelta(days=2)).isoformat()
+    return {
+        'linkedin_auth.linkedin_status': ('GET', '/api/linkedin/status', None),
+        'linkedin_content.publish_content': ('POST', '/api/linkedin/publish', {
+            'content': 'Programmé par @[Jane Doe](https://www.linkedin.com/in/janedoe) #budget',
+            'publishNow': False,
+            'scheduledTime': future
+        }),
+        'linkedin_content.get_posts': ('GET', '/api/linkedin/posts?limit=20&includeTotal=true', None),
+        'linkedin_content.get_post_status': ('GET', f'/api/linkedin/posts/{published}/status', None),
+        'linkedin_content.get_post_metrics_history': ('GET', f'/api/linkedin/posts/{published}/metrics/history', None),
+        'linkedin_content.delete_post': ('DELETE', f'/api/linkedin/posts/{draft[0]}', None),
+        'linkedin_content.update_post': ('PUT', f'/api/linkedin/posts/{draft[1]}', {'content': 'Brouillon modifié #budget'}),
+        'linkedin_content.get_templates': ('GET', '/api/linkedin/templates', None),
+        'linkedin_content.get_analytics': ('GET', '/api/linkedin/analytics', None),
+        'linkedin_content.get_analytics_history': ('GET', '/api/linkedin/analytics/history', None),
+        'linkedin_content.refresh_analytics': ('POST', '/api/linkedin/analytics/refresh', None),
+        'linkedin_calendar.get_calendar': ('GET', '/api/linkedin/calendar', None)
+    }
+
+
+def main():
+    # LINKEDIN_API_BASE_URL est lu à l'import de linkedin_service
+    os.environ['LINKEDIN_API_BASE_URL'] = f'{start_standin()}/linkedin/v2'
+    logging.getLogger().setLevel(logging.ERROR)
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    
+    from bench_app import create_bench_app, seed_user, logged_in_client
+    from query_guard import max_queries, QueryBudgetExceeded
+    
+    app, db, models = create_bench_app()
+    with app.app_context():
+        post_ids = seed(db, models, seed_user(db, models))
+    client = logged_in_client(app)
+    
+    budgets = {
+        endpoint: view.query_budget
+        for endpoint, view in app.view_functions.items()
+        if getattr(view, 'query_budget', None) is not None
+    }
+    endpoint_cases = cases(post_ids)
+    failures = []
+    
+    for endpoint, budget in sorted(budgets.items()):
+        if endpoint in SKIPPED:
+            print(f"  {endpoint:50} ignoré ({SKIPPED[endpoint]})")
+            continue
+        if endpoint not in endpoint_cases:
+            failures.append(f"{endpoint}: budget {budget} sans cas de vérification")
+            continue
+        
+        method, url, body = endpoint_cases[endpoint]
+        try:
+            with max_queries(budget) as log:
+                response = client.open(url, method=method, json=body)
+        except QueryBudgetExceeded as e:
+            failures.append(f"{endpoint}: {e}")
+            continue
+        
+        print(f"  {endpoint:50} {log.count}/{budget} requêtes ({response.status_code})")
+        if response.status_code >= 400:
+            failures.append(f"{endpoint}: réponse {response.status_code} {response.get_data(as_text=True)[:200]}")
+    
+    if failures:
+        print("❌ Budgets SQL non respectés :")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print(f"✅ {len(budgets) - len(SKIPPED)} endpoints dans leur budget SQL")
+
+
+if __name__ == '__main__':
+    main()
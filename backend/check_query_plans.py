@@ -0,0 +1,202 @@
+# backend/check_query_plans.py - Régression des plans d'exécution des requêtes fréquentes
+#
+# Usage :
+#   python check_query_plans.py                                   (SQLite, schéma des modèles)
+#   python check_query_plans.py --database-url postgresql://...   (base de test, schéma migré)
+#
+# Crée un jeu de données multi-utilisateurs (ANALYZE ensuite), appelle les
+# endpoints chauds et le relais de publication en capturant leurs
+# instructions SQL, puis lance EXPLAIN sur chacune. Pour chaque forme de
+# requête, l'index attendu doit apparaître dans le plan, et aucune
+# instruction ne doit parcourir toute la table visée. Sur PostgreSQL,
+# enable_seqscan est désactivé pendant EXPLAIN : la question posée est
+# « l'index est-il utilisable », pas « est-il choisi sur ce volume ».
+#
+# Les index viennent des modèles (__table_args__) et des migrations
+# 8c4e2a91d5f3, c9b2f7e4d815, d58a0c7e9b12 et e2f91b4c6a37.
+
+import os
+import sys
+import json
+import logging
+import argparse
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from sqlalchemy import event, text
+from werkzeug.serving import make_server
+
+USERS = 20
+POSTS_PER_USER = 200
+CHECKED_USER = 1
+
+# (forme, appel, table, index attendu)
+CHECKS = [
+    ('compte LinkedIn actif', ('GET', '/api/linkedin/status'), 'linkedin_users', 'ix_linkedin_users_user_id_is_active'),
+    ('liste des posts', ('GET', '/api/linkedin/posts?limit=20'), 'linkedin_posts', 'ix_linkedin_posts_user_created_at_id'),
+    ('validateur ETag', ('GET', '/api/linkedin/posts?limit=20'), 'linkedin_posts', 'ix_linkedin_posts_user_updated_at'),
+    ('liste par statut', ('GET', '/api/linkedin/posts?status=draft&limit=20'), 'linkedin_posts', 'ix_linkedin_posts_user_status_created_at_id'),
+    ('posts publiés récents', ('GET', '/api/linkedin/analytics'), 'linkedin_posts', 'ix_linkedin_posts_user_status_published_at'),
+    ('calendrier', ('GET', '/api/linkedin/calendar'), 'linkedin_posts', 'ix_linkedin_posts_user_scheduled_for'),
+    ('historique des métriques', ('GET', '/api/linkedin/analytics/history?resolution=hour'), 'post_metric_snapshots', 'ix_post_metric_snapshots_user_bucket'),
+    ('réclamation de l\'outbox', 'relay', 'publish_outbox', 'ix_publish_outbox_status_next_attempt_at')
+]
+
+
+def start_standin():
+    """Serveur de substitution LinkedIn (métriques live de GET /posts)"""
+    from standin_server import create_standin_app
+    server = make_server('127.0.0.1', 0, create_standin_app(seed=1), threaded=True)
+    threading.Thread(target=server.serve_forever, name='standin', daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}'
+
+
+def seed(db, models, seed_user):
+    """USERS utilisateurs × POSTS_PER_USER posts, snapshots horaires et outbox"""
+    now = datetime.utcnow()
+    statuses = ('published', 'scheduled', 'draft', 'failed')
+    for user_id in range(1, USERS + 1):
+        linkedin_user = seed_user(db, models, user_id=user_id)
+        db.session.execute(models.LinkedInPost.__table__.insert(), [
+            {
+                'user_id': user_id,
+                'linkedin_user_id': linkedin_user.id,
+                'content': f'Post {i} de {user_id}',
+                'status': statuses[i % 4],
+                'linkedin_post_id': f'urn:li:share:{user_id * 100000 + i}' if i % 4 == 0 else None,
+                'published_at': now - timedelta(hours=i) if i % 4 == 0 else None,
+                'scheduled_for': now + timedelta(hours=i) if i % 4 == 1 else None,
+                'created_at': now - timedelta(minutes=i),
+                'updated_at': now - timedelta(minutes=i)
+            }
+            for i in range(POSTS_PER_USER)
+        ])
+    db.session.commit()
+    
+    published = db.session.query(models.LinkedInPost.id, models.LinkedInPost.user_id).filter_by(status='published').all()
+    db.session.execute(models.PostMetricSnapshot.__table__.insert(), [
+        {'post_id': post_id, 'user_id': user_id, 'resolution': 'hour', 'bucket_start': now - timedelta(hours=hour), 'views': hour}
+        for post_id, user_id in published[::5]
+        for hour in range(24)
+    ])
+    # Outbox réaliste : presque tout traité, quelques échecs et entrées dues
+    db.session.execute(models.PublishOutbox.__table__.insert(), [
+        {
+            'post_id': post_id,
+            'status': ('pending', 'processing', 'failed')[i % 3] if i % 50 == 0 else 'done',
+            'attempts': 1,
+            'next_attempt_at': now - timedelta(minutes=i),
+            'locked_until': now - timedelta(minutes=1) if i % 150 == 50 else None
+        }
+        for i, (post_id, _) in enumerate(published)
+    ])
+    db.session.commit()
+    db.session.execute(text('ANALYZE'))
+    db.session.commit()
+
+
+@contextmanager
+def capture(engine):
+    """Instructions SELECT exécutées dans le bloc, avec leurs paramètres"""
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            statements.append((statement, parameters))
+    
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+
+def explain(connection, statement, parameters) -> list:
+    """Lignes du plan : (table, index ou None, parcours complet ?)"""
+    if connection.dialect.name == 'postgresql':
+        connection.exec_driver_sql('SET LOCAL enable_seqscan = off')
+        plan = connection.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {statement}', parameters).scalar()
+        plan = plan if isinstance(plan, list) else json.loads(plan)
+        nodes, stack = [], [plan[0]['Plan']]
+        while stack:
+            node = stack.pop()
+            stack.extend(node.get('Plans', []))
+            if 'Relation Name' in node:
+                nodes.append((node['Relation Name'], node.get('Index Name'), node['Node Type'] == 'Seq Scan'))
+        return nodes
+    
+    nodes = []
+    for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters):
+        detail = row[-1]
+        words = detail.split()
+        if len(words) < 2 or words[0] not in ('SEARCH', 'SCAN'):
+            continue
+        index = None
+        if ' INDEX ' in detail:
+            index = detail.split(' INDEX ', 1)[1].split()[0]
+        # SCAN sans index : toute la table ; SCAN ... USING INDEX : tout l'index
+        nodes.append((words[1], index, words[0] == 'SCAN'))
+    return nodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plans d'exécution des requêtes fréquentes")
+    parser.add_argument('--database-url', default='sqlite://', help='Base vide dédiée à la vérification')
+    args = parser.parse_args()
+    
+    # LINKEDIN_API_BASE_URL est lu à l'import de linkedin_service
+    os.environ['LINKEDIN_API_BASE_URL'] = f'{start_standin()}/linkedin/v2'
+    os.environ['PUBLISH_RELAY_ENABLED'] = 'false'
+    logging.getLogger().setLevel(logging.ERROR)
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    
+    from bench_app import create_bench_app, seed_user, logged_in_client
+    
+    app, db, models = create_bench_app(args.database_url)
+    # Après create_bench_app : les modèles doivent être chargés avec `db`
+    from services.publish_relay import publish_relay
+    with app.app_context():
+        seed(db, models, seed_user)
+        engine = db.engine
+    client = logged_in_client(app, CHECKED_USER)
+    
+    failures = []
+    for shape, call, table, expected_index in CHECKS:
+        with capture(engine) as statements:
+            if call == 'relay':
+                with app.app_context():
+                    publish_relay._claim(10)
+            else:
+                method, url = call
+                response = client.open(url, method=method)
+                if response.status_code >= 400:
+                    failures.append(f"{shape}: {method} {url} -> {response.status_code}")
+                    continue
+        
+        plans = []
+        with engine.connect() as connection:
+            for statement, parameters in statements:
+                with connection.begin():
+                    nodes = [node for node in explain(connection, statement, parameters) if node[0] == table]
+                if nodes:
+                    plans.append((statement, nodes))
+        
+        used = {index for _, nodes in plans for _, index, _ in nodes if index}
+        full_scans = [statement for statement, nodes in plans if any(scan and not index for _, index, scan in nodes)]
+        ok = expected_index in used and not full_scans
+        print(f"  {'✅' if ok else '❌'} {shape:28} {table}: {', '.join(sorted(used)) or 'aucun index'}")
+        if expected_index not in used:
+            failures.append(f"{shape}: {expected_index} absent des plans ({len(plans)} requêtes sur {table})")
+        for statement in full_scans:
+            failures.append(f"{shape}: parcours complet de {table}: {' '.join(statement.split())[:200]}")
+    
+    if failures:
+        print("❌ Régressions de plan :")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print(f"✅ {len(CHECKS)} formes de requête servies par leur index")
+
+
+if __name__ == '__main__':
+    main()
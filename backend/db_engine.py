@@ -0,0 +1,206 @@
+# backend/db_engine.py - Profil du moteur SQLAlchemy (pool, timeouts, métriques)
+
+import os
+import time
+import logging
+import threading
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool, NullPool
+
+logger = logging.getLogger(__name__)
+
+# Render coupe les connexions Postgres inactives : recycler avant
+DEFAULT_POOL_RECYCLE = 280
+DEFAULT_STATEMENT_TIMEOUT_MS = 15000
+# Connexions Postgres disponibles pour ce service (plan gratuit Render)
+DEFAULT_MAX_CONNECTIONS = 20
+# Threads d'arrière-plan qui tiennent une connexion, démarrés dans chaque worker
+BACKGROUND_DB_THREADS = (
+    'publish-relay',         # services/publish_relay.py
+    'template-usage-flush',  # services/usage_counters.py
+    'gemini-usage-flush',    # services/usage_ledger.py
+    'metrics-compaction',    # services/metrics_timeseries.py
+    'health-probes'          # health.py
+)
+# Exécuteur des accès base des vues async (routes/linkedin_async.py)
+DEFAULT_ASYNC_DB_THREADS = 8
+
+
+def background_db_threads(env) -> int:
+    """Connexions que les threads hors requête peuvent tenir en même temps"""
+    return len(BACKGROUND_DB_THREADS) + int(env.get('ASYNC_DB_THREADS', DEFAULT_ASYNC_DB_THREADS))
+
+
+class PoolStats:
+    """Compteurs d'attente au checkout, partagés par le pool instrumenté"""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.timeouts = 0
+    
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+    
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+    
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'waitSecondsTotal': round(self.wait_seconds_total, 6),
+                'waitSecondsMax': round(self.wait_seconds_max, 6),
+                'waitSecondsAvg': round(self.wait_seconds_total / self.checkouts, 6) if self.checkouts else 0,
+                'timeouts': self.timeouts
+            }
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool mesurant le temps d'attente d'une connexion"""
+    
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            pool_stats.record_timeout()
+            raise
+        pool_stats.record_wait(time.perf_counter() - started)
+        return connection
+
+
+def _worker_model(env) -> dict:
+    """Lire le modèle de workers gunicorn (WEB_CONCURRENCY / GUNICORN_THREADS)"""
+    workers = int(env.get('WEB_CONCURRENCY', env.get('GUNICORN_WORKERS', 1)))
+    threads = int(env.get('GUNICORN_THREADS', 1))
+    return {'workers': max(workers, 1), 'threads': max(threads, 1)}
+
+
+def build_engine_profile(database_url: str, env=None) -> dict:
+    """
+    Calculer le profil du moteur pour ce processus
+    
+    Le pool est dimensionné sur les threads du worker plus les threads
+    hors requête (BACKGROUND_DB_THREADS et l'exécuteur async), et le débordement est borné pour que l'ensemble des
+    workers reste sous DB_MAX_CONNECTIONS.
+    
+    Args:
+        database_url: URL SQLAlchemy
+        env: Variables d'environnement (os.environ par défaut)
+    
+    Returns:
+        Dict avec 'engine_options' (SQLALCHEMY_ENGINE_OPTIONS) et le profil retenu
+    """
+    env = env if env is not None else os.environ
+    is_postgres = database_url.startswith('postgresql')
+    model = _worker_model(env)
+    statement_timeout = int(env.get('DB_STATEMENT_TIMEOUT_MS', DEFAULT_STATEMENT_TIMEOUT_MS))
+    pool_mode = env.get('DB_POOL_MODE', 'session')  # session, pgbouncer
+    
+    profile = {
+        'backend': 'postgresql' if is_postgres else 'sqlite',
+        'poolMode': pool_mode,
+        'workers': model['workers'],
+        'threads': model['threads'],
+        'statementTimeoutMs': statement_timeout if is_postgres else None
+    }
+    
+    if not is_postgres:
+        # SQLite : le pool par défaut de SQLAlchemy convient
+        return {'engine_options': {}, 'profile': profile}
+    
+    if pool_mode == 'pgbouncer':
+        # PgBouncer en mode transaction gère le pool ; pas de paramètres de
+        # démarrage (options=...) ni d'état de session côté client
+        profile.update({'poolSize': 0, 'maxOverflow': 0})
+        return {
+            'engine_options': {
+                'poolclass': NullPool,
+                'pool_pre_ping': False
+            },
+            'profile': profile
+        }
+    
+    max_connections = int(env.get('DB_MAX_CONNECTIONS', DEFAULT_MAX_CONNECTIONS))
+    pool_size = int(env.get('DB_POOL_SIZE', model['threads'] + background_db_threads(env)))
+    budget = max(max_connections // model['workers'], 1)
+    pool_size = min(pool_size, budget)
+    max_overflow = int(env.get('DB_MAX_OVERFLOW', max(min(model['threads'], budget - pool_size), 0)))
+    
+    profile.update({
+        'backgroundThreads': background_db_threads(env),
+        'poolSize': pool_size,
+        'maxOverflow': max_overflow,
+        'maxConnections': max_connections
+    })
+    
+    return {
+        'engine_options': {
+            'poolclass': InstrumentedQueuePool,
+            'pool_size': pool_size,
+            'max_overflow': max_overflow,
+            'pool_timeout': int(env.get('DB_POOL_TIMEOUT', 10)),
+            'pool_recycle': int(env.get('DB_POOL_RECYCLE', DEFAULT_POOL_RECYCLE)),
+            'pool_pre_ping': True,
+            'connect_args': {
+                'options': f'-c statement_timeout={statement_timeout}',
+                'connect_timeout': 10
+            }
+        },
+        'profile': profile
+    }
+
+
+def install_engine_events(engine, profile: dict):
+    """
+    Brancher les événements dépendant du profil
+    
+    SQLite : clés étrangères activées sur chaque connexion, sans quoi les
+    ON DELETE CASCADE (post_metric_snapshots) sont ignorés. PostgreSQL en
+    mode PgBouncer : statement_timeout par transaction.
+    """
+    if profile['backend'] == 'sqlite':
+        @event.listens_for(engine, 'connect')
+        def _enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute('PRAGMA foreign_keys=ON')
+            cursor.close()
+        return
+    
+    if profile['poolMode'] != 'pgbouncer':
+        return
+    
+    timeout = int(profile['statementTimeoutMs'])
+    
+    @event.listens_for(engine, 'begin')
+    def _set_local_statement_timeout(connection):
+        # SET LOCAL reste limité à la transaction, compatible avec le pooling transactionnel
+        connection.exec_driver_sql(f'SET LOCAL statement_timeout = {timeout}')
+
+
+def get_pool_metrics(engine, profile: dict) -> dict:
+    """État courant du pool : connexions utilisées, débordement, attente au checkout"""
+    pool = engine.pool
+    metrics = {'profile': profile, 'poolClass': type(pool).__name__}
+    
+    if isinstance(pool, QueuePool):
+        metrics.update({
+            'size': pool.size(),
+            'checkedIn': pool.checkedin(),
+            'inUse': pool.checkedout(),
+            # overflow() est négatif tant que le pool n'est pas plein
+            'overflow': max(pool.overflow(), 0),
+            'checkoutWait': pool_stats.snapshot()
+        })
+    
+    return metrics
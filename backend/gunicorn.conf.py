@@ -1,11 +1,96 @@
 import os
+import multiprocessing
 
 bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
-workers = 1
-worker_class = "sync"
-worker_connections = 1000
+
+# Profil concurrent : le temps de requête est surtout de l'attente réseau
+# (Gemini, NewsAPI, LinkedIn). gthread par défaut ; gevent si installé.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+if worker_class == 'gevent':
+    try:
+        import gevent  # noqa: F401
+    except ImportError:
+        worker_class = 'gthread'
+
+# Mémoire disponible pour le conteneur (cgroup v2/v1, puis /proc/meminfo)
+def _memory_limit_mb():
+    for path in ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+            if value.isdigit() and int(value) < 1 << 50:
+                return int(value) // (1024 * 1024)
+        except OSError:
+            continue
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemTotal:'):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+    return 512
+
+# Workers bornés par le CPU (2n+1) et par la mémoire (~WORKER_MEMORY_MB chacun)
+worker_memory_mb = int(os.environ.get('WORKER_MEMORY_MB', 160))
+workers = int(os.environ.get('WEB_CONCURRENCY', 0)) or max(1, min(
+    multiprocessing.cpu_count() * 2 + 1,
+    _memory_limit_mb() // worker_memory_mb
+))
+threads = int(os.environ.get('GUNICORN_THREADS', 8)) if worker_class == 'gthread' else 1
+# Nombre de greenlets par worker gevent
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 100))
+
+# db_engine dimensionne le pool à partir de ces variables (lues au chargement de l'app)
+os.environ['WEB_CONCURRENCY'] = str(workers)
+os.environ['GUNICORN_THREADS'] = str(worker_connections if worker_class == 'gevent' else threads)
+
 timeout = 120
 keepalive = 2
 max_requests = 1000
 max_requests_jitter = 50
-preload_app = True
\ No newline at end of file
+# gevent patche le worker après le fork : l'app doit être chargée ensuite
+# pour que threading.local et les verrous soient ceux de gevent
+preload_app = worker_class != 'gevent'
+
+def on_starting(server):
+    # Fichiers de métriques d'un lancement précédent (pids réutilisés)
+    from metrics import reset_metrics_dir
+    reset_metrics_dir()
+
+def post_worker_init(worker):
+    if worker_class == 'gevent':
+        # psycopg2 bloque la boucle gevent sans ce correctif
+        try:
+            from psycogreen.gevent import patch_psycopg
+            patch_psycopg()
+        except ImportError:
+            worker.log.warning("psycogreen absent : les requêtes SQL bloquent le worker gevent")
+
+    from app import app, db, publish_relay, template_usage, usage_ledger, snapshot_compactor, app_metrics, health_monitor
+    from services.lazy_imports import start_prewarm
+    # Connexions ouvertes par le maître (preload_app) : ne pas les partager entre processus
+    with app.app_context():
+        db.engine.dispose(close=False)
+    # Les threads ne survivent pas au fork : démarrer le relais dans chaque worker
+    publish_relay.start()
+    template_usage.start()
+    usage_ledger.start()
+    snapshot_compactor.start()
+    app_metrics.start()
+    # Première sonde dès le démarrage : /readyz passe au vert sans attendre une requête
+    health_monitor.start()
+    # Le maître écoute déjà sur le port : les SDK se chargent pendant que le worker sert
+    start_prewarm()
+
+def worker_exit(server, worker):
+    # max_requests recycle les workers : écrire les compteurs en attente
+    from app import template_usage, usage_ledger, app_metrics
+    template_usage.stop()
+    usage_ledger.stop()
+    app_metrics.stop()
+
+def child_exit(server, worker):
+    # Compteurs du worker arrêté conservés dans l'archive, jauges abandonnées
+    from metrics import mark_process_dead
+    mark_process_dead(worker.pid)
@@ -0,0 +1,172 @@
+# backend/health.py - Liveness et readiness (sondes en arrière-plan, résultat en cache)
+
+import os
+import time
+import logging
+import threading
+from datetime import datetime
+from flask import jsonify
+from sqlalchemy import text
+from services.http_client import get_http_session
+from services.news_service import NEWS_API_BASE_URL
+from services.linkedin_service import LINKEDIN_API_BASE_URL
+
+logger = logging.getLogger(__name__)
+
+PROBE_INTERVAL = float(os.getenv('HEALTH_PROBE_INTERVAL', 30))
+PROBE_TIMEOUT = float(os.getenv('HEALTH_PROBE_TIMEOUT', 3))
+# Au-delà, le résultat en cache n'est plus une preuve de disponibilité
+MAX_RESULT_AGE = PROBE_INTERVAL * 3
+GEMINI_API_BASE_URL = os.getenv('GEMINI_API_BASE_URL', 'https://generativelanguage.googleapis.com')
+
+# Sans base le worker ne peut rien servir ; les API externes ont un mode simulation
+CRITICAL_DEPENDENCIES = ('database',)
+
+
+class HealthMonitor:
+    """
+    Sondes des dépendances exécutées par un thread du worker
+    
+    /readyz sert le dernier résultat sans toucher à la base ni au réseau :
+    les health checks fréquents de Render ne consomment ni connexion du
+    pool ni thread de requête.
+    """
+    
+    def __init__(self):
+        self.app = None
+        self.db = None
+        self._results = {}
+        self._checked_at = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop_event = threading.Event()
+    
+    def init_app(self, app, db):
+        self.app = app
+        self.db = db
+    
+    # Sondes : (statut, détail)
+    
+    def _probe_database(self):
+        with self.app.app_context():
+            with self.db.engine.connect() as connection:
+                connection.execute(text('SELECT 1'))
+        return 'up', None
+    
+    def _probe_http(self, url: str):
+        # Toute réponse HTTP prouve que l'hôte est joignable ; 5xx = service en panne
+        response = get_http_session().head(url, timeout=PROBE_TIMEOUT, allow_redirects=False)
+        if response.status_code >= 500:
+            return 'down', f'HTTP {response.status_code}'
+        return 'up', None
+    
+    def _probes(self):
+        return {
+            'database': self._probe_database,
+            'gemini': (lambda: self._probe_http(GEMINI_API_BASE_URL)) if os.getenv('GEMINI_API_KEY') else None,
+            'newsapi': (lambda: self._probe_http(NEWS_API_BASE_URL)) if os.getenv('NEWS_API_KEY') else None,
+            'linkedin': lambda: self._probe_http(LINKEDIN_API_BASE_URL)
+        }
+    
+    def probe(self) -> dict:
+        """Exécuter toutes les sondes et mettre le résultat en cache"""
+        results = {}
+        for name, probe in self._probes().items():
+            if probe is None:
+                # Clé absente : le service tourne en mode simulation
+                results[name] = {'status': 'disabled', 'latencyMs': None}
+                continue
+            started = time.perf_counter()
+            try:
+                status, detail = probe()
+            except Exception as e:
+                status, detail = 'down', f"{type(e).__name__}: {e}"[:200]
+            results[name] = {
+                'status': status,
+                'latencyMs': round((time.perf_counter() - started) * 1000, 1)
+            }
+            if detail:
+                results[name]['error'] = detail
+        
+        down = [name for name, result in results.items() if result['status'] == 'down']
+        previously_down = [name for name, result in self._results.items() if result['status'] == 'down']
+        # Journaliser les changements d'état, pas chaque sonde
+        if down != previously_down:
+            if down:
+                logger.warning("⚠️ Dépendances indisponibles: %s", ', '.join(down))
+            else:
+                logger.info("✅ Toutes les dépendances sont de nouveau disponibles")
+        
+        with self._lock:
+            self._results = results
+            self._checked_at = time.time()
+        return results
+    
+    def readiness(self) -> dict:
+        """Dernier résultat en cache, avec le statut global"""
+        with self._lock:
+            results = dict(self._results)
+            checked_at = self._checked_at
+        
+        if checked_at is None:
+            status = 'starting'
+        elif time.time() - checked_at > MAX_RESULT_AGE:
+            status = 'stale'
+        elif any(results.get(name, {}).get('status') != 'up' for name in CRITICAL_DEPENDENCIES):
+            status = 'unavailable'
+        elif any(result['status'] == 'down' for result in results.values()):
+            status = 'degraded'
+        else:
+            status = 'ready'
+        
+        return {
+            'status': status,
+            'ready': status in ('ready', 'degraded'),
+            'checkedAt': datetime.utcfromtimestamp(checked_at).isoformat() if checked_at else None,
+            'dependencies': results
+        }
+    
+    def start(self):
+        """Démarrer les sondes périodiques (idempotent, dans le worker)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name='health-probes', daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        self._stop_event.set()
+    
+    def _run(self):
+        while True:
+            try:
+                self.probe()
+            except Exception as e:
+                logger.error("Erreur sondes de santé: %s", e)
+            if self._stop_event.wait(PROBE_INTERVAL):
+                return
+
+
+health_monitor = HealthMonitor()
+
+
+def livez():
+    """Liveness : le processus répond, sans aucune dépendance"""
+    return jsonify({'status': 'alive'})
+
+
+def readyz():
+    """Readiness : dernier résultat des sondes, 503 si la base est indisponible"""
+    # Démarré à la première sonde, donc après le fork du worker
+    health_monitor.start()
+    readiness = health_monitor.readiness()
+    return jsonify(readiness), 200 if readiness['ready'] else 503
+
+
+def init_health(app, db):
+    """Enregistrer /livez et /readyz"""
+    health_monitor.init_app(app, db)
+    app.add_url_rule('/livez', 'livez', livez)
+    app.add_url_rule('/readyz', 'readyz', readyz)
+    return health_monitor
@@ -0,0 +1,148 @@
+# backend/http_cache.py - Compression des réponses et GET conditionnels
+
+import os
+import time
+import gzip
+import hashlib
+import logging
+from flask import request, make_response
+from metrics import record_cache
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# En dessous, l'en-tête gzip coûte plus qu'il ne rapporte
+COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/x-ndjson',
+    'text/csv',
+    'text/calendar',
+    'text/html',
+    'text/plain'
+}
+# Chaque encodage est une représentation distincte : son ETag porte un suffixe
+ETAG_SUFFIXES = {'br': '-br', 'gzip': '-gzip'}
+PRIVATE_CACHE_CONTROL = 'private, no-cache'
+
+
+def make_etag(*parts) -> str:
+    """ETag fort dérivé de versions (updated_at, compteurs, paramètres)"""
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(repr(part).encode())
+        digest.update(b'\0')
+    return digest.hexdigest()[:32]
+
+
+def freshness_bucket(seconds: int) -> int:
+    """
+    Créneau de temps à inclure dans l'ETag d'une réponse qui embarque des
+    données externes (métriques LinkedIn) : l'ETag change au plus tard à la
+    fin du créneau, même si la base n'a pas bougé
+    """
+    return int(time.time() // max(seconds, 1))
+
+
+def etag_matches(etag: str) -> bool:
+    """If-None-Match correspond à l'ETag, quel que soit l'encodage servi"""
+    if_none_match = request.if_none_match
+    if not if_none_match:
+        return False
+    if if_none_match.star_tag:
+        return True
+    return any(
+        if_none_match.contains_weak(etag + suffix)
+        for suffix in ('', *ETAG_SUFFIXES.values())
+    )
+
+
+def not_modified(etag: str, cache_control: str = PRIVATE_CACHE_CONTROL):
+    """Réponse 304 sans corps, sans sérialiser la ressource"""
+    response = make_response('', 304)
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def _choose_encoding():
+    offered = ['br', 'gzip'] if BROTLI_AVAILABLE else ['gzip']
+    return request.accept_encodings.best_match(offered)
+
+
+def _is_compressible(response) -> bool:
+    return (
+        200 <= response.status_code < 300
+        and response.status_code not in (204, 206)
+        and not response.direct_passthrough
+        and not response.is_streamed
+        and 'Content-Encoding' not in response.headers
+        and response.mimetype in COMPRESSIBLE_MIMETYPES
+    )
+
+
+def _apply_conditional(response):
+    """ETag par empreinte du corps pour les GET JSON qui n'en ont pas"""
+    if (
+        request.method != 'GET'
+        or response.status_code != 200
+        or response.is_streamed
+        or response.mimetype != 'application/json'
+        or response.get_etag()[0]
+    ):
+        return response
+    
+    etag = hashlib.sha1(response.get_data()).hexdigest()[:32]
+    if etag_matches(etag):
+        return not_modified(etag, response.headers.get('Cache-Control', PRIVATE_CACHE_CONTROL))
+    
+    response.set_etag(etag)
+    response.headers.setdefault('Cache-Control', PRIVATE_CACHE_CONTROL)
+    return response
+
+
+def compress_response(response):
+    """Hook after_request : ETag de repli, puis gzip/brotli au-delà du seuil"""
+    response = _apply_conditional(response)
+    if request.method == 'GET' and response.status_code in (200, 304) and response.get_etag()[0]:
+        record_cache('http_conditional', response.status_code == 304)
+    
+    if not _is_compressible(response):
+        return response
+    
+    response.vary.add('Accept-Encoding')
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+    
+    encoding = _choose_encoding()
+    if not encoding:
+        return response
+    
+    if encoding == 'br':
+        compressed = brotli.compress(data, quality=BROTLI_QUALITY)
+    else:
+        compressed = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(etag + ETAG_SUFFIXES[encoding], weak)
+    
+    return response
+
+
+def init_http_cache(app):
+    """Brancher la compression et les ETags de repli sur l'application"""
+    app.after_request(compress_response)
+    logger.info("🗜️ Compression HTTP active (%s, seuil %s o)", 'br, gzip' if BROTLI_AVAILABLE else 'gzip', COMPRESS_MIN_SIZE)
@@ -0,0 +1,147 @@
+# backend/json_provider.py - Sérialisation JSON des réponses (orjson si disponible)
+
+import os
+import json
+import math
+import logging
+from datetime import date, datetime
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# JSON_PROVIDER=auto (orjson si installé) | orjson | stdlib
+JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'auto').lower()
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """
+    Provider json de la bibliothèque standard, aligné sur orjson
+    
+    Dates en ISO 8601 (comme isoformat() dans les to_dict) au lieu du format
+    HTTP de Flask, UTF-8 non échappé, NaN/Infinity en null et clés non
+    chaînes converties puis triées, comme orjson. Les deux providers
+    produisent les mêmes valeurs, pas toujours les mêmes octets : les
+    flottants en notation exponentielle s'écrivent 1e+20 ici et 1e20 avec
+    orjson. Changer de provider change donc certains ETags (une
+    revalidation complète, sans réponse périmée).
+    """
+    ensure_ascii = False
+    
+    @staticmethod
+    def default(o):
+        if isinstance(o, (datetime, date)):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+    
+    def dumps(self, obj, **kwargs):
+        # Compact comme orjson, hors sortie indentée
+        if not kwargs.get('indent'):
+            kwargs.setdefault('separators', (',', ':'))
+        kwargs.setdefault('allow_nan', False)
+        try:
+            return super().dumps(obj, **kwargs)
+        except (ValueError, TypeError):
+            # NaN/Infinity (ValueError) ou clés mixtes non triables (TypeError) :
+            # cas rares, normalisés seulement ici pour garder le chemin rapide
+            return super().dumps(_normalise(obj), **kwargs)
+
+
+def _json_key(key):
+    """Clé de dictionnaire convertie comme json l'écrit (les autres types restent refusés)"""
+    if key is True or key is False or key is None:
+        return json.dumps(key)
+    if isinstance(key, float):
+        return float.__repr__(key)
+    if isinstance(key, int):
+        return int.__repr__(key)
+    return key
+
+
+def _normalise(obj):
+    """Copie de `obj` avec NaN/Infinity en None et clés converties en chaînes"""
+    if isinstance(obj, float):
+        return obj if math.isfinite(obj) else None
+    if isinstance(obj, dict):
+        return {_json_key(key): _normalise(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_normalise(value) for value in obj]
+    return obj
+
+
+class OrjsonProvider(StdlibJSONProvider):
+    """
+    Provider orjson : encodeur natif, datetime sérialisés sans isoformat() Python
+    
+    Les options propres au module json (cls, ensure_ascii...) repassent par la
+    bibliothèque standard, de même que les valeurs qu'orjson refuse (entiers
+    au-delà de 64 bits).
+    """
+    
+    def _options(self, kwargs):
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.pop('indent', None):
+            option |= orjson.OPT_INDENT_2
+        if kwargs.pop('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        # orjson est toujours compact
+        kwargs.pop('separators', None)
+        return option
+    
+    def _encode(self, obj, kwargs, option=0):
+        """Octets orjson, ou None s'il faut repasser par json"""
+        extra = dict(kwargs)
+        option |= self._options(extra)
+        if extra:
+            return None
+        try:
+            return orjson.dumps(obj, default=self.default, option=option)
+        except orjson.JSONEncodeError:
+            return None
+    
+    def dumps(self, obj, **kwargs):
+        encoded = self._encode(obj, kwargs)
+        if encoded is None:
+            return super().dumps(obj, **kwargs)
+        return encoded.decode()
+    
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        """Corps construit directement en octets, sans décodage ni copie"""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        encoded = self._encode(obj, {'indent': 2} if indent else {}, orjson.OPT_APPEND_NEWLINE)
+        if encoded is None:
+            return super().response(obj)
+        return self._app.response_class(encoded, mimetype=self.mimetype)
+
+
+def json_provider_class(name: str = None):
+    """Classe de provider pour JSON_PROVIDER (auto, orjson, stdlib)"""
+    name = name or JSON_PROVIDER
+    if name == 'stdlib':
+        return StdlibJSONProvider
+    if not ORJSON_AVAILABLE:
+        if name == 'orjson':
+            logger.warning("⚠️ orjson non installé : sérialisation JSON via la bibliothèque standard")
+        return StdlibJSONProvider
+    return OrjsonProvider
+
+
+def init_json_provider(app):
+    """Installer le provider JSON de l'application (jsonify, request.get_json)"""
+    provider_class = json_provider_class()
+    app.json_provider_class = provider_class
+    app.json = provider_class(app)
+    logger.info("🧾 Provider JSON : %s", 'orjson' if provider_class is OrjsonProvider else 'json (stdlib)')
+    return app.json
+
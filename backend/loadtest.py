@@ -0,0 +1,86 @@
+# backend/loadtest.py - Test de charge en boucle fermée contre l'API
+#
+# Usage :
+#   python standin_server.py --port 8099 --latency fixed:200 &
+#   NEWS_API_KEY=test NEWS_API_BASE_URL=http://localhost:8099/newsapi/v2 gunicorn -c gunicorn.conf.py app:app &
+#   python loadtest.py --url "http://localhost:5000/api/linkedin/news?keyword=ia" --concurrency 1,8,32 --duration 10
+#
+# Comparer les profils avec GUNICORN_WORKER_CLASS=sync|gthread|gevent et GUNICORN_THREADS.
+# Seules les réponses 2xx/3xx comptent dans le débit et les latences ; les
+# 4xx, 5xx et erreurs réseau sont comptées comme erreurs.
+
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+
+
+def run_level(url: str, concurrency: int, duration: float, cookie: str = None) -> dict:
+    """Lancer `concurrency` clients en boucle pendant `duration` secondes"""
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+    headers = {'Cookie': cookie} if cookie else {}
+    
+    def client():
+        http = requests.Session()
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                response = http.get(url, headers=headers, timeout=30)
+                # 401 (cookie absent) ou 429 (rate limit) : erreur, pas débit
+                ok = response.status_code < 400
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - started
+            with lock:
+                if ok:
+                    latencies.append(elapsed)
+                else:
+                    errors[0] += 1
+    
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(client)
+    # Les dernières requêtes se terminent après l'échéance
+    elapsed = time.monotonic() - started
+    
+    latencies.sort()
+    count = len(latencies)
+    
+    def percentile(p):
+        return round(latencies[min(int(count * p), count - 1)] * 1000, 1) if count else None
+    
+    return {
+        'concurrency': concurrency,
+        'requests': count,
+        'errors': errors[0],
+        'throughput': round(count / elapsed, 1),
+        'p50Ms': percentile(0.50),
+        'p95Ms': percentile(0.95),
+        'p99Ms': percentile(0.99)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Test de charge en boucle fermée')
+    parser.add_argument('--url', required=True)
+    parser.add_argument('--concurrency', default='1,8,32', help='Niveaux de concurrence, séparés par des virgules')
+    parser.add_argument('--duration', type=float, default=10.0, help='Durée de chaque niveau (secondes)')
+    parser.add_argument('--cookie', help='En-tête Cookie (session authentifiée)')
+    args = parser.parse_args()
+    
+    print(f"{'clients':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'erreurs':>8}")
+    for level in [int(value) for value in args.concurrency.split(',')]:
+        result = run_level(args.url, level, args.duration, args.cookie)
+        print(
+            f"{result['concurrency']:>8} {result['throughput']:>8} {result['p50Ms']!s:>8} "
+            f"{result['p95Ms']!s:>8} {result['p99Ms']!s:>8} {result['errors']:>8}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+# backend/logging_config.py - Journalisation non bloquante (QueueHandler) en JSON structuré
+
+import os
+import sys
+import json
+import time
+import uuid
+import queue
+import atexit
+import logging
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from flask import g, has_app_context, request
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+# json (production) ou text (lecture en local)
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')
+# Enregistrements en attente ; au-delà ils sont abandonnés plutôt que de bloquer
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+# Échantillonnage des INFO répétés : N identiques par fenêtre, puis 1 sur M
+LOG_SAMPLE_BURST = int(os.getenv('LOG_SAMPLE_BURST', 20))
+LOG_SAMPLE_EVERY = int(os.getenv('LOG_SAMPLE_EVERY', 10))
+LOG_SAMPLE_WINDOW = float(os.getenv('LOG_SAMPLE_WINDOW', 60))
+REQUEST_ID_HEADER = 'X-Request-ID'
+
+# Attributs standard d'un LogRecord : le reste (extra=...) est sérialisé tel quel
+_RESERVED = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'request_id', 'sample_rate'}
+
+
+class JsonFormatter(logging.Formatter):
+    """Une ligne JSON par enregistrement"""
+    
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'pid': record.process
+        }
+        if getattr(record, 'request_id', None):
+            entry['requestId'] = record.request_id
+        if getattr(record, 'sample_rate', 1) > 1:
+            entry['sampleRate'] = record.sample_rate
+        for key, value in vars(record).items():
+            if key not in _RESERVED and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RequestContextFilter(logging.Filter):
+    """Identifiant de la requête courante (lu dans le thread appelant)"""
+    
+    def filter(self, record):
+        record.request_id = g.get('request_id') if has_app_context() else None
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Échantillonnage des INFO/DEBUG à fort volume
+    
+    Compté par gabarit de message (logger, msg avant interpolation) : les
+    LOG_SAMPLE_BURST premiers d'une fenêtre passent, puis un sur
+    LOG_SAMPLE_EVERY. WARNING et au-delà passent toujours.
+    """
+    
+    def __init__(self, burst: int = LOG_SAMPLE_BURST, every: int = LOG_SAMPLE_EVERY, window: float = LOG_SAMPLE_WINDOW):
+        super().__init__()
+        self.burst = burst
+        self.every = max(every, 1)
+        self.window = window
+        self._counts = {}
+        self._window_started = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        
+        key = (record.name, record.msg if isinstance(record.msg, str) else type(record.msg))
+        with self._lock:
+            now = time.monotonic()
+            if now - self._window_started > self.window:
+                self._counts.clear()
+                self._window_started = now
+            count = self._counts.get(key, 0) + 1
+            self._counts[key] = count
+        
+        if count <= self.burst:
+            return True
+        record.sample_rate = self.every
+        return (count - self.burst) % self.every == 0
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    QueueHandler qui ne bloque jamais l'appelant
+    
+    Le message est interpolé ici (seulement s'il a passé niveau et
+    échantillonnage) : les arguments ne quittent pas le thread de la
+    requête. Sérialisation et écriture sur stdout se font dans le thread
+    du QueueListener.
+    """
+    
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def prepare(self, record):
+        message = record.getMessage()
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = logging.Formatter().formatException(record.exc_info)
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = message
+        record.args = None
+        record.exc_info = None
+        record.exc_text = exc_text
+        return record
+    
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogPipeline:
+    """Handler de file sur le logger racine et listener écrivant sur stdout"""
+    
+    def __init__(self):
+        self.handler = None
+        self.listener = None
+        self.output = None
+    
+    def configure(self, level: str = LOG_LEVEL, fmt: str = LOG_FORMAT, stream=None):
+        self.output = logging.StreamHandler(stream or sys.stdout)
+        if fmt == 'json':
+            self.output.setFormatter(JsonFormatter())
+        else:
+            self.output.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s'))
+        
+        self.handler = NonBlockingQueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+        self.handler.addFilter(SamplingFilter())
+        self.handler.addFilter(RequestContextFilter())
+        
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(self.handler)
+        root.setLevel(level)
+        
+        self._start_listener()
+        atexit.register(self.stop)
+        # Le thread du listener ne survit pas au fork des workers gunicorn
+        os.register_at_fork(after_in_child=self._restart_after_fork)
+        return self
+    
+    def _start_listener(self):
+        self.listener = QueueListener(self.handler.queue, self.output, respect_handler_level=True)
+        self.listener.start()
+    
+    def _restart_after_fork(self):
+        # File neuve : celle du parent peut contenir des enregistrements déjà écrits par lui
+        self.handler.queue = queue.Queue(LOG_QUEUE_SIZE)
+        self._start_listener()
+    
+    def stop(self):
+        """Vider la file et arrêter le listener (fin de processus)"""
+        if self.listener and self.listener._thread:
+            self.listener.stop()
+
+
+log_pipeline = LogPipeline()
+
+
+def configure_logging(**kwargs):
+    """Remplace logging.basicConfig : file en mémoire, écriture JSON en arrière-plan"""
+    return log_pipeline.configure(**kwargs)
+
+
+def _assign_request_id():
+    # Identifiant fourni par le proxy (Render) si présent, borné en taille
+    g.request_id = (request.headers.get(REQUEST_ID_HEADER) or uuid.uuid4().hex)[:64]
+
+
+def _echo_request_id(response):
+    if 'request_id' in g:
+        response.headers[REQUEST_ID_HEADER] = g.request_id
+    return response
+
+
+def init_request_logging(app):
+    """Identifiant de requête (X-Request-ID reçu ou généré), renvoyé dans la réponse"""
+    app.before_request(_assign_request_id)
+    app.after_request(_echo_request_id)
@@ -0,0 +1,384 @@
+# backend/metrics.py - Métriques Prometheus (routes, appels externes, base, caches)
+
+import os
+import hmac
+import json
+import time
+import atexit
+import asyncio
+import logging
+import tempfile
+import functools
+import threading
+from contextlib import contextmanager
+from flask import Response, g, request
+
+logger = logging.getLogger(__name__)
+
+# Un fichier par worker gunicorn, agrégés à la lecture de /api/metrics
+METRICS_DIR = os.getenv('METRICS_DIR') or os.path.join(tempfile.gettempdir(), 'privalead-metrics')
+FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 5))
+# Si défini, /api/metrics exige Authorization: Bearer <token>
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+ARCHIVE_FILE = 'archive.json'
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+UPSTREAM_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 60.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Nom -> (type, aide, bornes des histogrammes)
+METRICS = {
+    'http_requests_in_flight': ('gauge', 'Requêtes HTTP en cours de traitement', None),
+    'http_request_duration_seconds': ('histogram', 'Latence des requêtes HTTP par blueprint et route', LATENCY_BUCKETS),
+    'http_request_db_queries': ('histogram', 'Requêtes SQL exécutées par requête HTTP', QUERY_COUNT_BUCKETS),
+    'http_request_db_seconds': ('histogram', 'Temps SQL cumulé par requête HTTP', LATENCY_BUCKETS),
+    'db_queries_total': ('counter', 'Requêtes SQL exécutées', None),
+    'db_query_seconds_total': ('counter', 'Temps SQL cumulé', None),
+    'db_slow_queries_total': ('counter', 'Requêtes SQL lentes (SLOW_QUERY_MS) par route', None),
+    'db_repeated_statements_total': ('counter', 'Instructions SQL répétées dans une requête (N+1 probables) par route', None),
+    'upstream_requests_in_flight': ('gauge', 'Appels aux API externes en cours', None),
+    'upstream_request_duration_seconds': ('histogram', 'Latence des appels aux API externes par méthode de service', UPSTREAM_BUCKETS),
+    'cache_requests_total': ('counter', 'Consultations des caches (hit/miss)', None),
+    'rate_limited_total': ('counter', 'Requêtes refusées (429) par route et seau (utilisateur ou global)', None),
+    'gemini_tokens_total': ('counter', 'Tokens Gemini consommés (prompt/réponse) par opération', None)
+}
+
+
+def _labels_key(labels: dict) -> tuple:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+class MetricsRegistry:
+    """
+    Compteurs, jauges et histogrammes du processus
+    
+    Chaque worker écrit son état dans METRICS_DIR (toutes les FLUSH_INTERVAL
+    secondes et à chaque lecture) ; /api/metrics additionne les fichiers de
+    tous les workers. Les compteurs des workers arrêtés sont versés dans une
+    archive, leurs jauges sont ignorées.
+    """
+    
+    def __init__(self, directory: str = METRICS_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._values = {}
+        self._histograms = {}
+        self._thread = None
+        self._stop_event = threading.Event()
+        # Un worker forké ne doit pas hériter (et recompter) l'état du maître
+        os.register_at_fork(after_in_child=self._reset)
+    
+    def _reset(self):
+        self._lock = threading.Lock()
+        self._values = {}
+        self._histograms = {}
+        self._thread = None
+        self._stop_event = threading.Event()
+    
+    def inc(self, name: str, amount: float = 1, **labels):
+        key = (name, _labels_key(labels))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def dec(self, name: str, amount: float = 1, **labels):
+        self.inc(name, -amount, **labels)
+    
+    def observe(self, name: str, value: float, **labels):
+        bounds = METRICS[name][2]
+        index = next((i for i, bound in enumerate(bounds) if value <= bound), len(bounds))
+        key = (name, _labels_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {'buckets': [0] * (len(bounds) + 1), 'sum': 0.0}
+            histogram['buckets'][index] += 1
+            histogram['sum'] += value
+    
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'pid': os.getpid(),
+                'values': [[name, list(labels), value] for (name, labels), value in self._values.items()],
+                'histograms': [
+                    [name, list(labels), list(histogram['buckets']), histogram['sum']]
+                    for (name, labels), histogram in self._histograms.items()
+                ]
+            }
+    
+    # Persistance multi-processus
+    
+    def _path(self, pid: int) -> str:
+        return os.path.join(self.directory, f'worker-{pid}.json')
+    
+    def flush(self):
+        """Écrire l'état du processus (remplacement atomique du fichier)"""
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(os.getpid())
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+    
+    def start(self):
+        """Démarrer l'écriture périodique (idempotent, à appeler après le fork)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name='metrics-flush', daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        self._stop_event.set()
+        self._safe_flush()
+    
+    def _safe_flush(self):
+        try:
+            self.flush()
+        except OSError as e:
+            logger.error("Erreur écriture métriques: %s", e)
+    
+    def _run(self):
+        while not self._stop_event.wait(FLUSH_INTERVAL):
+            self._safe_flush()
+
+
+metrics = MetricsRegistry()
+
+
+def _read(path: str):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _merge(states, with_gauges=True) -> dict:
+    """Additionner les états de plusieurs processus"""
+    values = {}
+    histograms = {}
+    for state in states:
+        for name, labels, value in state['values']:
+            if METRICS[name][0] == 'gauge' and not with_gauges:
+                continue
+            key = (name, tuple(tuple(label) for label in labels))
+            values[key] = values.get(key, 0) + value
+        for name, labels, buckets, total in state['histograms']:
+            key = (name, tuple(tuple(label) for label in labels))
+            merged = histograms.setdefault(key, {'buckets': [0] * len(buckets), 'sum': 0.0})
+            merged['buckets'] = [a + b for a, b in zip(merged['buckets'], buckets)]
+            merged['sum'] += total
+    return {'values': values, 'histograms': histograms}
+
+
+def collect(directory: str = METRICS_DIR) -> dict:
+    """État agrégé de tous les workers (jauges des seuls workers vivants)"""
+    states = []
+    if os.path.isdir(directory):
+        for filename in os.listdir(directory):
+            if not filename.endswith('.json'):
+                continue
+            state = _read(os.path.join(directory, filename))
+            if state is None:
+                continue
+            if filename != ARCHIVE_FILE and not _pid_alive(state['pid']):
+                # Worker mort sans child_exit (SIGKILL) : compteurs conservés
+                state['values'] = [
+                    entry for entry in state['values'] if METRICS[entry[0]][0] != 'gauge'
+                ]
+            states.append(state)
+    return _merge(states)
+
+
+def mark_process_dead(pid: int, directory: str = METRICS_DIR):
+    """Verser les compteurs d'un worker arrêté dans l'archive (hook child_exit, maître)"""
+    path = os.path.join(directory, f'worker-{pid}.json')
+    state = _read(path)
+    if state is None:
+        return
+    archive = _read(os.path.join(directory, ARCHIVE_FILE)) or {'pid': 0, 'values': [], 'histograms': []}
+    merged = _merge([archive, state], with_gauges=False)
+    archive = {
+        'pid': 0,
+        'values': [[name, list(labels), value] for (name, labels), value in merged['values'].items()],
+        'histograms': [
+            [name, list(labels), histogram['buckets'], histogram['sum']]
+            for (name, labels), histogram in merged['histograms'].items()
+        ]
+    }
+    tmp_path = os.path.join(directory, f'{ARCHIVE_FILE}.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(archive, f)
+    os.replace(tmp_path, os.path.join(directory, ARCHIVE_FILE))
+    os.remove(path)
+
+
+def reset_metrics_dir(directory: str = METRICS_DIR):
+    """Vider le répertoire au démarrage du maître (pids réutilisés d'un lancement précédent)"""
+    if not os.path.isdir(directory):
+        return
+    for filename in os.listdir(directory):
+        if filename.endswith(('.json', '.tmp')):
+            os.remove(os.path.join(directory, filename))
+
+
+# Format d'exposition texte Prometheus
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=()) -> str:
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+def _format_bound(bound) -> str:
+    return '+Inf' if bound is None else repr(float(bound))
+
+
+def render(state: dict) -> str:
+    lines = []
+    for name, (kind, help_text, bounds) in METRICS.items():
+        lines.append(f'# HELP {name} {help_text}')
+        lines.append(f'# TYPE {name} {kind}')
+        if kind == 'histogram':
+            for (metric, labels), histogram in sorted(state['histograms'].items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(list(bounds) + [None], histogram['buckets']):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{_format_labels(labels, [("le", _format_bound(bound))])} {cumulative}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {histogram["sum"]}')
+                lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+        else:
+            for (metric, labels), value in sorted(state['values'].items()):
+                if metric == name:
+                    lines.append(f'{name}{_format_labels(labels)} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+# Instrumentation
+
+def record_cache(cache: str, hit: bool):
+    """Compter une consultation de cache"""
+    metrics.inc('cache_requests_total', cache=cache, result='hit' if hit else 'miss')
+
+
+@contextmanager
+def _upstream_call(service: str, method: str):
+    metrics.inc('upstream_requests_in_flight', service=service)
+    started = time.perf_counter()
+    outcome = {'value': 'error'}
+    try:
+        yield outcome
+    finally:
+        metrics.dec('upstream_requests_in_flight', service=service)
+        metrics.observe(
+            'upstream_request_duration_seconds',
+            time.perf_counter() - started,
+            service=service,
+            method=method,
+            outcome=outcome['value']
+        )
+
+
+def _outcome(result) -> str:
+    # Les services renvoient {'success': False, ...} plutôt que de lever
+    return 'error' if isinstance(result, dict) and result.get('success') is False else 'ok'
+
+
+def observe_upstream(func):
+    """Décorateur : latence et appels en cours d'une méthode de service (sync ou async)"""
+    service, method = func.__qualname__.split('.')[-2:]
+    
+    if asyncio.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with _upstream_call(service, method) as outcome:
+                result = await func(*args, **kwargs)
+                outcome['value'] = _outcome(result)
+                return result
+        return async_wrapper
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with _upstream_call(service, method) as outcome:
+            result = func(*args, **kwargs)
+            outcome['value'] = _outcome(result)
+            return result
+    return wrapper
+
+
+def _before_request():
+    g.metrics_started = time.perf_counter()
+    g.metrics_in_flight = True
+    metrics.inc('http_requests_in_flight')
+
+
+def _after_request(response):
+    started = g.pop('metrics_started', None)
+    if started is None:
+        return response
+    
+    labels = {
+        'blueprint': request.blueprint or 'app',
+        # Règle de routage, pas l'URL : cardinalité bornée
+        'route': request.url_rule.rule if request.url_rule else 'unmatched',
+        'method': request.method
+    }
+    metrics.observe('http_request_duration_seconds', time.perf_counter() - started, status=response.status_code, **labels)
+    # Journal SQL tenu par query_guard (une seule instrumentation des requêtes)
+    query_log = g.get('query_log')
+    metrics.observe('http_request_db_queries', query_log.count if query_log else 0, **labels)
+    metrics.observe('http_request_db_seconds', query_log.seconds if query_log else 0.0, **labels)
+    return response
+
+
+def _teardown_request(exc):
+    if g.pop('metrics_in_flight', False):
+        metrics.dec('http_requests_in_flight')
+
+
+def metrics_authorized() -> bool:
+    """Jeton METRICS_TOKEN exigé (s'il est défini) pour les endpoints d'exploitation"""
+    if not METRICS_TOKEN:
+        return True
+    # Comparaison en temps constant ; en octets, compare_digest refuse les str non ASCII
+    return hmac.compare_digest(
+        request.headers.get('Authorization', '').encode(),
+        f'Bearer {METRICS_TOKEN}'.encode()
+    )
+
+
+def metrics_view():
+    """Exposition Prometheus agrégée sur tous les workers"""
+    if not metrics_authorized():
+        return Response('Non autorisé\n', status=401, mimetype='text/plain')
+    metrics.flush()
+    return Response(render(collect(metrics.directory)), mimetype='text/plain; version=0.0.4')
+
+
+def init_metrics(app, db):
+    """Brancher les hooks de requête et /api/metrics (les événements SQL sont posés par query_guard)"""
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    app.add_url_rule('/api/metrics', 'metrics', metrics_view)
+    atexit.register(metrics._safe_flush)
+    logger.info("📈 Métriques Prometheus sur /api/metrics (répertoire %s)", metrics.directory)
+    return metrics
@@ -0,0 +1,131 @@
+"""Schéma initial (tables créées jusqu'ici par db.create_all)
+
+Revision ID: 3f9a1c2d7b10
+Revises:
+Create Date: 2026-10-19 10:00:00.000000
+
+Les bases existantes créées par db.create_all doivent être marquées avec
+`flask db stamp 3f9a1c2d7b10` avant `flask db upgrade` (ou
+`flask db stamp 5b2d8e0f3c71` si la table publish_outbox existe déjà).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a1c2d7b10'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('sub', sa.String(length=128), nullable=False),
+        sa.Column('email', sa.String(length=120), nullable=False),
+        sa.Column('name', sa.String(length=120), nullable=True),
+        sa.Column('first_name', sa.String(length=80), nullable=True),
+        sa.Column('last_name', sa.String(length=80), nullable=True),
+        sa.Column('picture', sa.String(length=250), nullable=True),
+        sa.Column('language', sa.String(length=10), nullable=True),
+        sa.Column('country', sa.String(length=10), nullable=True),
+        sa.Column('email_verified', sa.Boolean(), nullable=True),
+        sa.Column('secteur', sa.String(length=120), nullable=True),
+        sa.Column('interets', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('sub')
+    )
+    op.create_table(
+        'posts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('published_at', sa.DateTime(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('scheduled', sa.Boolean(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('likes_count', sa.Integer(), nullable=True),
+        sa.Column('comments_count', sa.Integer(), nullable=True),
+        sa.Column('shares_count', sa.Integer(), nullable=True),
+        sa.Column('views_count', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'linkedin_users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('linkedin_id', sa.String(length=128), nullable=False),
+        sa.Column('access_token', sa.Text(), nullable=True),
+        sa.Column('refresh_token', sa.Text(), nullable=True),
+        sa.Column('email', sa.String(length=120), nullable=True),
+        sa.Column('name', sa.String(length=120), nullable=True),
+        sa.Column('first_name', sa.String(length=80), nullable=True),
+        sa.Column('last_name', sa.String(length=80), nullable=True),
+        sa.Column('picture', sa.String(length=250), nullable=True),
+        sa.Column('headline', sa.String(length=250), nullable=True),
+        sa.Column('industry', sa.String(length=120), nullable=True),
+        sa.Column('location', sa.String(length=120), nullable=True),
+        sa.Column('language', sa.String(length=10), nullable=True),
+        sa.Column('email_verified', sa.Boolean(), nullable=True),
+        sa.Column('token_expires_at', sa.DateTime(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('linkedin_id')
+    )
+    op.create_table(
+        'linkedin_posts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('linkedin_user_id', sa.Integer(), nullable=False),
+        sa.Column('content', sa.Text(), nullable=False),
+        sa.Column('linkedin_post_id', sa.String(length=100), nullable=True),
+        sa.Column('published_at', sa.DateTime(), nullable=True),
+        sa.Column('scheduled_for', sa.DateTime(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('likes_count', sa.Integer(), nullable=True),
+        sa.Column('comments_count', sa.Integer(), nullable=True),
+        sa.Column('shares_count', sa.Integer(), nullable=True),
+        sa.Column('views_count', sa.Integer(), nullable=True),
+        sa.Column('tone', sa.String(length=50), nullable=True),
+        sa.Column('generated_by_ai', sa.Boolean(), nullable=True),
+        sa.Column('prompt_used', sa.Text(), nullable=True),
+        sa.Column('article_source', sa.JSON(), nullable=True),
+        sa.Column('hashtags', sa.JSON(), nullable=True),
+        sa.Column('mentions', sa.JSON(), nullable=True),
+        sa.Column('images', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['linkedin_user_id'], ['linkedin_users.id']),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table(
+        'content_templates',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=120), nullable=False),
+        sa.Column('category', sa.String(length=50), nullable=True),
+        sa.Column('prompt_template', sa.Text(), nullable=False),
+        sa.Column('tone', sa.String(length=50), nullable=True),
+        sa.Column('tags', sa.JSON(), nullable=True),
+        sa.Column('icon', sa.String(length=10), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('usage_count', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('content_templates')
+    op.drop_table('linkedin_posts')
+    op.drop_table('linkedin_users')
+    op.drop_table('posts')
+    op.drop_table('users')
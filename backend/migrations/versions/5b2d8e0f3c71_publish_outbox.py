@@ -0,0 +1,38 @@
+"""Outbox de publication LinkedIn
+
+Revision ID: 5b2d8e0f3c71
+Revises: 3f9a1c2d7b10
+Create Date: 2026-10-19 10:15:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b2d8e0f3c71'
+down_revision = '3f9a1c2d7b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'publish_outbox',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('post_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=True),
+        sa.Column('locked_until', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('processed_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['post_id'], ['linkedin_posts.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+
+
+def downgrade():
+    op.drop_table('publish_outbox')
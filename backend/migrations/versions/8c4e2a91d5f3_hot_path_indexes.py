@@ -0,0 +1,46 @@
+"""Index des requêtes fréquentes sur linkedin_users / linkedin_posts
+
+Revision ID: 8c4e2a91d5f3
+Revises: 5b2d8e0f3c71
+Create Date: 2026-10-19 10:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4e2a91d5f3'
+down_revision = '5b2d8e0f3c71'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_linkedin_users_user_id_is_active', 'linkedin_users', ['user_id', 'is_active'])
+
+    op.create_index('ix_linkedin_posts_user_created_at', 'linkedin_posts', ['user_id', 'created_at'])
+    op.create_index('ix_linkedin_posts_user_status_created_at', 'linkedin_posts', ['user_id', 'status', 'created_at'])
+    op.create_index('ix_linkedin_posts_user_status_published_at', 'linkedin_posts', ['user_id', 'status', 'published_at'])
+    op.create_index('ix_linkedin_posts_user_scheduled_for', 'linkedin_posts', ['user_id', 'scheduled_for'])
+    op.create_index(
+        'ix_linkedin_posts_scheduled_due',
+        'linkedin_posts',
+        ['scheduled_for'],
+        postgresql_where=sa.text("status = 'scheduled'"),
+        sqlite_where=sa.text("status = 'scheduled'")
+    )
+
+    op.create_index('ix_publish_outbox_status_next_attempt_at', 'publish_outbox', ['status', 'next_attempt_at'])
+    op.create_index('ix_publish_outbox_post_id', 'publish_outbox', ['post_id'])
+
+
+def downgrade():
+    op.drop_index('ix_publish_outbox_post_id', table_name='publish_outbox')
+    op.drop_index('ix_publish_outbox_status_next_attempt_at', table_name='publish_outbox')
+    op.drop_index('ix_linkedin_posts_scheduled_due', table_name='linkedin_posts')
+    op.drop_index('ix_linkedin_posts_user_scheduled_for', table_name='linkedin_posts')
+    op.drop_index('ix_linkedin_posts_user_status_published_at', table_name='linkedin_posts')
+    op.drop_index('ix_linkedin_posts_user_status_created_at', table_name='linkedin_posts')
+    op.drop_index('ix_linkedin_posts_user_created_at', table_name='linkedin_posts')
+    op.drop_index('ix_linkedin_users_user_id_is_active', table_name='linkedin_users')
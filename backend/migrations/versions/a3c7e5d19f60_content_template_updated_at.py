@@ -0,0 +1,27 @@
+"""Colonne updated_at des templates (tampon de version du catalogue)
+
+Revision ID: a3c7e5d19f60
+Revises: e2f91b4c6a37
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c7e5d19f60'
+down_revision = 'e2f91b4c6a37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('content_templates') as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute('UPDATE content_templates SET updated_at = created_at')
+
+
+def downgrade():
+    with op.batch_alter_table('content_templates') as batch_op:
+        batch_op.drop_column('updated_at')
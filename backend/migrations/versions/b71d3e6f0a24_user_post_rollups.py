@@ -0,0 +1,61 @@
+"""Agrégats par utilisateur (user_post_rollups)
+
+Revision ID: b71d3e6f0a24
+Revises: 8c4e2a91d5f3
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b71d3e6f0a24'
+down_revision = '8c4e2a91d5f3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'user_post_rollups',
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('draft_count', sa.Integer(), nullable=False),
+        sa.Column('scheduled_count', sa.Integer(), nullable=False),
+        sa.Column('publishing_count', sa.Integer(), nullable=False),
+        sa.Column('published_count', sa.Integer(), nullable=False),
+        sa.Column('failed_count', sa.Integer(), nullable=False),
+        sa.Column('total_likes', sa.BigInteger(), nullable=False),
+        sa.Column('total_comments', sa.BigInteger(), nullable=False),
+        sa.Column('total_shares', sa.BigInteger(), nullable=False),
+        sa.Column('total_views', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('user_id')
+    )
+
+    # Remplissage initial depuis les posts existants
+    op.execute("""
+        INSERT INTO user_post_rollups (
+            user_id, draft_count, scheduled_count, publishing_count, published_count, failed_count,
+            total_likes, total_comments, total_shares, total_views, updated_at
+        )
+        SELECT
+            user_id,
+            SUM(CASE WHEN status = 'draft' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN status = 'scheduled' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN status = 'publishing' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN status = 'published' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END),
+            COALESCE(SUM(likes_count), 0),
+            COALESCE(SUM(comments_count), 0),
+            COALESCE(SUM(shares_count), 0),
+            COALESCE(SUM(views_count), 0),
+            CURRENT_TIMESTAMP
+        FROM linkedin_posts
+        GROUP BY user_id
+    """)
+
+
+def downgrade():
+    op.drop_table('user_post_rollups')
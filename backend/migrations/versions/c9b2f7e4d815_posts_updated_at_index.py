@@ -0,0 +1,23 @@
+"""Index (user_id, updated_at) pour les validateurs ETag des posts
+
+Revision ID: c9b2f7e4d815
+Revises: a3c7e5d19f60
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9b2f7e4d815'
+down_revision = 'a3c7e5d19f60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_linkedin_posts_user_updated_at', 'linkedin_posts', ['user_id', 'updated_at'])
+
+
+def downgrade():
+    op.drop_index('ix_linkedin_posts_user_updated_at', table_name='linkedin_posts')
@@ -0,0 +1,41 @@
+"""Historique des métriques par post (post_metric_snapshots)
+
+Revision ID: d58a0c7e9b12
+Revises: b71d3e6f0a24
+Create Date: 2026-10-19 11:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd58a0c7e9b12'
+down_revision = 'b71d3e6f0a24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'post_metric_snapshots',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('post_id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('resolution', sa.String(length=5), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('likes', sa.Integer(), nullable=False),
+        sa.Column('comments', sa.Integer(), nullable=False),
+        sa.Column('shares', sa.Integer(), nullable=False),
+        sa.Column('views', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['post_id'], ['linkedin_posts.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('post_id', 'resolution', 'bucket_start', name='uq_post_metric_snapshots_bucket')
+    )
+    op.create_index('ix_post_metric_snapshots_user_bucket', 'post_metric_snapshots', ['user_id', 'resolution', 'bucket_start'])
+
+
+def downgrade():
+    op.drop_index('ix_post_metric_snapshots_user_bucket', table_name='post_metric_snapshots')
+    op.drop_table('post_metric_snapshots')
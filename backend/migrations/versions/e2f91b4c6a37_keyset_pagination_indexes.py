@@ -0,0 +1,29 @@
+"""Index de pagination par clé (created_at, id) pour la liste des posts
+
+Revision ID: e2f91b4c6a37
+Revises: d58a0c7e9b12
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'e2f91b4c6a37'
+down_revision = 'd58a0c7e9b12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_linkedin_posts_user_created_at_id', 'linkedin_posts', ['user_id', 'created_at', 'id'])
+    op.create_index('ix_linkedin_posts_user_status_created_at_id', 'linkedin_posts', ['user_id', 'status', 'created_at', 'id'])
+    op.drop_index('ix_linkedin_posts_user_status_created_at', table_name='linkedin_posts')
+    op.drop_index('ix_linkedin_posts_user_created_at', table_name='linkedin_posts')
+
+
+def downgrade():
+    op.create_index('ix_linkedin_posts_user_created_at', 'linkedin_posts', ['user_id', 'created_at'])
+    op.create_index('ix_linkedin_posts_user_status_created_at', 'linkedin_posts', ['user_id', 'status', 'created_at'])
+    op.drop_index('ix_linkedin_posts_user_status_created_at_id', table_name='linkedin_posts')
+    op.drop_index('ix_linkedin_posts_user_created_at_id', table_name='linkedin_posts')
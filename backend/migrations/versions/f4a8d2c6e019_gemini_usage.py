@@ -0,0 +1,37 @@
+"""Registre des tokens Gemini consommés (gemini_usage)
+
+Revision ID: f4a8d2c6e019
+Revises: c9b2f7e4d815
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4a8d2c6e019'
+down_revision = 'c9b2f7e4d815'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'gemini_usage',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('operation', sa.String(length=20), nullable=False),
+        sa.Column('model', sa.String(length=50), nullable=False),
+        sa.Column('prompt_tokens', sa.Integer(), nullable=False),
+        sa.Column('response_tokens', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_gemini_usage_user_created_at', 'gemini_usage', ['user_id', 'created_at'])
+
+
+def downgrade():
+    op.drop_index('ix_gemini_usage_user_created_at', table_name='gemini_usage')
+    op.drop_table('gemini_usage')
@@ -1,5 +1,9 @@
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect, func, case
+from sqlalchemy.orm import load_only, with_expression, query_expression
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 db = None
 
@@ -9,6 +13,10 @@ def init_linkedin_db(database):
 
 class LinkedInUser(db.Model):
     __tablename__ = 'linkedin_users'
+    __table_args__ = (
+        # filter_by(user_id=..., is_active=True) sur toutes les routes
+        db.Index('ix_linkedin_users_user_id_is_active', 'user_id', 'is_active'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -55,6 +63,24 @@ class LinkedInUser(db.Model):
 
 class LinkedInPost(db.Model):
     __tablename__ = 'linkedin_posts'
+    __table_args__ = (
+        # Liste des posts paginée par clé (created_at, id), avec ou sans filtre de statut
+        db.Index('ix_linkedin_posts_user_created_at_id', 'user_id', 'created_at', 'id'),
+        db.Index('ix_linkedin_posts_user_status_created_at_id', 'user_id', 'status', 'created_at', 'id'),
+        # Analytics : posts publiés les plus récents
+        db.Index('ix_linkedin_posts_user_status_published_at', 'user_id', 'status', 'published_at'),
+        # Validateur des GET conditionnels : count/max(updated_at) par utilisateur
+        db.Index('ix_linkedin_posts_user_updated_at', 'user_id', 'updated_at'),
+        # Calendrier : plage de dates par utilisateur
+        db.Index('ix_linkedin_posts_user_scheduled_for', 'user_id', 'scheduled_for'),
+        # Posts programmés à échéance, index partiel limité au statut 'scheduled'
+        db.Index(
+            'ix_linkedin_posts_scheduled_due',
+            'scheduled_for',
+            postgresql_where=db.text("status = 'scheduled'"),
+            sqlite_where=db.text("status = 'scheduled'")
+        ),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -63,7 +89,7 @@ class LinkedInPost(db.Model):
     linkedin_post_id = db.Column(db.String(100))
     published_at = db.Column(db.DateTime)
     scheduled_for = db.Column(db.DateTime)
-    status = db.Column(db.String(20), default='draft')  # draft, scheduled, published, failed
+    status = db.Column(db.String(20), default='draft')  # draft, scheduled, publishing, published, failed
     
     # Métriques LinkedIn
     likes_count = db.Column(db.Integer, default=0)
@@ -84,6 +110,72 @@ class LinkedInPost(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Relations
+    outbox_entries = db.relationship('PublishOutbox', backref='post', lazy=True, cascade='all, delete-orphan')
+    metric_snapshots = db.relationship('PostMetricSnapshot', backref='post', lazy='dynamic', cascade='all, delete-orphan', passive_deletes=True)
+    
+    # Extrait du contenu calculé en SQL pour les vues résumées
+    snippet = query_expression()
+    
+    SNIPPET_LENGTH = 200
+    
+    # Champ de la vue résumée -> colonnes à charger
+    SUMMARY_FIELDS = {
+        'id': ('id',),
+        'status': ('status',),
+        'snippet': (),
+        'linkedinPostId': ('linkedin_post_id',),
+        'publishedAt': ('published_at',),
+        'scheduledFor': ('scheduled_for',),
+        'metrics': ('likes_count', 'comments_count', 'shares_count', 'views_count'),
+        'createdAt': ('created_at',),
+        'updatedAt': ('updated_at',)
+    }
+    
+    @classmethod
+    def summary_options(cls, fields=None):
+        """
+        Options de chargement pour la vue résumée
+        
+        Seules les colonnes des champs demandés sont lues ; content, prompt_used
+        et les colonnes JSON restent différées.
+        """
+        fields = fields or cls.SUMMARY_FIELDS.keys()
+        # Toujours nécessaires : pagination, analytics et rollups
+        columns = {'id', 'user_id', 'status', 'linkedin_post_id', 'created_at'}
+        for field in fields:
+            columns.update(cls.SUMMARY_FIELDS[field])
+        
+        options = [load_only(*[getattr(cls, column) for column in sorted(columns)])]
+        if 'snippet' in fields:
+            options.append(with_expression(cls.snippet, func.substr(cls.content, 1, cls.SNIPPET_LENGTH)))
+        return options
+    
+    def to_summary_dict(self, fields=None):
+        """Sérialisation légère, limitée aux champs demandés"""
+        fields = fields or self.SUMMARY_FIELDS.keys()
+        data = {}
+        for field in fields:
+            if field == 'id':
+                data['id'] = self.id
+            elif field == 'status':
+                data['status'] = self.status
+            elif field == 'snippet':
+                data['snippet'] = self.snippet
+            elif field == 'linkedinPostId':
+                data['linkedinPostId'] = self.linkedin_post_id
+            elif field == 'metrics':
+                data['metrics'] = {
+                    'likes': self.likes_count,
+                    'comments': self.comments_count,
+                    'shares': self.shares_count,
+                    'views': self.views_count
+                }
+            else:
+                value = getattr(self, self.SUMMARY_FIELDS[field][0])
+                data[field] = value.isoformat() if value else None
+        return data
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -127,6 +219,8 @@ class ContentTemplate(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     usage_count = db.Column(db.Integer, default=0)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Tampon de version du catalogue : les compteurs d'usage ne le modifient pas
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     def to_dict(self):
         return {
@@ -143,3 +237,231 @@ class ContentTemplate(db.Model):
     
     def __repr__(self):
         return f'<ContentTemplate {self.name}>'
+
+class PublishOutbox(db.Model):
+    """File d'attente des publications LinkedIn, écrite dans la même transaction que le post"""
+    __tablename__ = 'publish_outbox'
+    __table_args__ = (
+        # Entrées en attente réclamées par le relais
+        db.Index('ix_publish_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+        db.Index('ix_publish_outbox_post_id', 'post_id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    post_id = db.Column(db.Integer, db.ForeignKey('linkedin_posts.id'), nullable=False)
+    status = db.Column(db.String(20), default='pending')  # pending, processing, done, failed
+    attempts = db.Column(db.Integer, default=0)
+    last_error = db.Column(db.Text)
+    next_attempt_at = db.Column(db.DateTime, default=datetime.utcnow)
+    locked_until = db.Column(db.DateTime)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    processed_at = db.Column(db.DateTime)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'postId': self.post_id,
+            'status': self.status,
+            'attempts': self.attempts,
+            'lastError': self.last_error,
+            'nextAttemptAt': self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            'processedAt': self.processed_at.isoformat() if self.processed_at else None
+        }
+    
+    def __repr__(self):
+        return f'<PublishOutbox {self.id} post={self.post_id}>'
+
+class PostMetricSnapshot(db.Model):
+    """Historique des métriques d'un post : horaire sur 7 jours, puis journalier"""
+    __tablename__ = 'post_metric_snapshots'
+    __table_args__ = (
+        db.UniqueConstraint('post_id', 'resolution', 'bucket_start', name='uq_post_metric_snapshots_bucket'),
+        db.Index('ix_post_metric_snapshots_user_bucket', 'user_id', 'resolution', 'bucket_start'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    post_id = db.Column(db.Integer, db.ForeignKey('linkedin_posts.id', ondelete='CASCADE'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    resolution = db.Column(db.String(5), nullable=False)  # hour, day
+    bucket_start = db.Column(db.DateTime, nullable=False)
+    
+    # Compteurs cumulés LinkedIn à la fin du créneau
+    likes = db.Column(db.Integer, default=0, nullable=False)
+    comments = db.Column(db.Integer, default=0, nullable=False)
+    shares = db.Column(db.Integer, default=0, nullable=False)
+    views = db.Column(db.Integer, default=0, nullable=False)
+    
+    def __repr__(self):
+        return f'<PostMetricSnapshot {self.post_id} {self.resolution} {self.bucket_start}>'
+
+class UserPostRollup(db.Model):
+    """Agrégats par utilisateur maintenus à chaque changement de statut ou de métriques"""
+    __tablename__ = 'user_post_rollups'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    
+    # Nombre de posts par statut
+    draft_count = db.Column(db.Integer, default=0, nullable=False)
+    scheduled_count = db.Column(db.Integer, default=0, nullable=False)
+    publishing_count = db.Column(db.Integer, default=0, nullable=False)
+    published_count = db.Column(db.Integer, default=0, nullable=False)
+    failed_count = db.Column(db.Integer, default=0, nullable=False)
+    
+    # Métriques cumulées sur la vie du compte
+    total_likes = db.Column(db.BigInteger, default=0, nullable=False)
+    total_comments = db.Column(db.BigInteger, default=0, nullable=False)
+    total_shares = db.Column(db.BigInteger, default=0, nullable=False)
+    total_views = db.Column(db.BigInteger, default=0, nullable=False)
+    
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def to_dict(self):
+        engagements = self.total_likes + self.total_comments + self.total_shares
+        return {
+            'totalPosts': self.published_count,
+            'scheduledPosts': self.scheduled_count,
+            'draftPosts': self.draft_count,
+            'failedPosts': self.failed_count,
+            'totalLikes': self.total_likes,
+            'totalComments': self.total_comments,
+            'totalShares': self.total_shares,
+            'totalViews': self.total_views,
+            'avgEngagement': round(engagements / self.total_views * 100, 2) if self.total_views else 0
+        }
+    
+    def __repr__(self):
+        return f'<UserPostRollup {self.user_id}>'
+
+class GeminiUsage(db.Model):
+    """Registre des tokens Gemini consommés, une ligne par appel de génération"""
+    __tablename__ = 'gemini_usage'
+    __table_args__ = (
+        # Consommation d'un utilisateur sur une période
+        db.Index('ix_gemini_usage_user_created_at', 'user_id', 'created_at'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    # Nul pour les appels hors requête utilisateur
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'))
+    operation = db.Column(db.String(20), nullable=False)  # post, hashtags
+    model = db.Column(db.String(50), nullable=False)
+    prompt_tokens = db.Column(db.Integer, default=0, nullable=False)
+    response_tokens = db.Column(db.Integer, default=0, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f'<GeminiUsage {self.user_id} {self.operation} {self.prompt_tokens}+{self.response_tokens}>'
+
+# Colonnes de LinkedInPost reportées dans les agrégats
+ROLLUP_STATUSES = ('draft', 'scheduled', 'publishing', 'published', 'failed')
+ROLLUP_METRICS = {
+    'likes_count': 'total_likes',
+    'comments_count': 'total_comments',
+    'shares_count': 'total_shares',
+    'views_count': 'total_views'
+}
+
+def _apply_rollup_delta(connection, user_id, deltas):
+    """Appliquer un delta atomique (col = col + n) aux agrégats d'un utilisateur"""
+    deltas = {column: value for column, value in deltas.items() if value}
+    if not deltas:
+        return
+    
+    table = UserPostRollup.__table__
+    insert = pg_insert if connection.dialect.name == 'postgresql' else sqlite_insert
+    values = {column: 0 for column in [f'{s}_count' for s in ROLLUP_STATUSES] + list(ROLLUP_METRICS.values())}
+    values.update(deltas)
+    
+    statement = insert(table).values(user_id=user_id, updated_at=datetime.utcnow(), **values)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.user_id],
+        set_={
+            'updated_at': datetime.utcnow(),
+            **{column: table.c[column] + value for column, value in deltas.items()}
+        }
+    )
+    connection.execute(statement)
+
+def _post_contribution(status, metrics):
+    """Contribution d'un post aux agrégats"""
+    contribution = {column: metrics.get(attribute) or 0 for attribute, column in ROLLUP_METRICS.items()}
+    if status in ROLLUP_STATUSES:
+        contribution[f'{status}_count'] = 1
+    return contribution
+
+def _track_previous_value(target, value, oldvalue, initiator):
+    return value
+
+# active_history charge l'ancienne valeur lors d'une affectation sur un
+# objet expiré, afin que after_update connaisse le delta exact
+for _attribute in ('status',) + tuple(ROLLUP_METRICS):
+    event.listen(getattr(LinkedInPost, _attribute), 'set', _track_previous_value, active_history=True, retval=True)
+
+@event.listens_for(LinkedInPost, 'after_insert')
+def _rollup_after_insert(mapper, connection, target):
+    metrics = {attribute: getattr(target, attribute) for attribute in ROLLUP_METRICS}
+    _apply_rollup_delta(connection, target.user_id, _post_contribution(target.status or 'draft', metrics))
+
+@event.listens_for(LinkedInPost, 'after_update')
+def _rollup_after_update(mapper, connection, target):
+    state = inspect(target)
+    old_values = {}
+    changed = False
+    for attribute in ('status',) + tuple(ROLLUP_METRICS):
+        history = state.attrs[attribute].history
+        if history.deleted:
+            old_values[attribute] = history.deleted[0]
+            changed = True
+        else:
+            old_values[attribute] = getattr(target, attribute)
+    
+    if not changed:
+        return
+    
+    before = _post_contribution(old_values['status'], old_values)
+    after = _post_contribution(target.status, {attribute: getattr(target, attribute) for attribute in ROLLUP_METRICS})
+    deltas = {column: after.get(column, 0) - before.get(column, 0) for column in set(before) | set(after)}
+    _apply_rollup_delta(connection, target.user_id, deltas)
+
+@event.listens_for(LinkedInPost, 'after_delete')
+def _rollup_after_delete(mapper, connection, target):
+    metrics = {attribute: getattr(target, attribute) for attribute in ROLLUP_METRICS}
+    contribution = _post_contribution(target.status, metrics)
+    _apply_rollup_delta(connection, target.user_id, {column: -value for column, value in contribution.items()})
+
+def compute_user_rollup(user_id):
+    """Agrégats d'un utilisateur calculés depuis linkedin_posts, sans écriture (objet transitoire)"""
+    columns = [
+        func.coalesce(func.sum(case((LinkedInPost.status == status, 1), else_=0)), 0).label(f'{status}_count')
+        for status in ROLLUP_STATUSES
+    ] + [
+        func.coalesce(func.sum(getattr(LinkedInPost, attribute)), 0).label(column)
+        for attribute, column in ROLLUP_METRICS.items()
+    ]
+    row = db.session.query(*columns).filter(LinkedInPost.user_id == user_id).one()
+    return UserPostRollup(user_id=user_id, updated_at=datetime.utcnow(), **row._mapping)
+
+def rebuild_user_rollup(user_id):
+    """
+    Recalculer les agrégats d'un utilisateur depuis linkedin_posts
+    
+    À utiliser après les UPDATE groupés, qui ne déclenchent pas les événements ORM.
+    
+    La ligne d'agrégats est créée si besoin (ON CONFLICT DO NOTHING, sans
+    IntegrityError entre deux reconstructions concurrentes) puis verrouillée
+    avant le recalcul : les deltas concurrents, qui écrivent la même ligne,
+    attendent la fin de la transaction au lieu d'être écrasés par un total
+    calculé sans eux.
+    """
+    table = UserPostRollup.__table__
+    insert = pg_insert if db.session.get_bind().dialect.name == 'postgresql' else sqlite_insert
+    db.session.execute(
+        insert(table).values(user_id=user_id).on_conflict_do_nothing(index_elements=[table.c.user_id])
+    )
+    rollup = UserPostRollup.query.filter_by(user_id=user_id).with_for_update().populate_existing().one()
+    
+    computed = compute_user_rollup(user_id)
+    for column in [f'{status}_count' for status in ROLLUP_STATUSES] + list(ROLLUP_METRICS.values()):
+        setattr(rollup, column, getattr(computed, column))
+    rollup.updated_at = computed.updated_at
+    return rollup
@@ -0,0 +1,185 @@
+# backend/query_guard.py - Budget de requêtes SQL par endpoint, détection N+1 et requêtes lentes
+
+import os
+import time
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from flask import current_app, g, has_request_context, request
+from sqlalchemy import event
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Même instruction exécutée au moins N fois dans une requête : N+1 probable
+REPEAT_THRESHOLD = int(os.getenv('QUERY_REPEAT_THRESHOLD', 5))
+SLOW_QUERY_MS = float(os.getenv('SLOW_QUERY_MS', 250))
+# Dépassement de budget : exception (tests, QUERY_GUARD_STRICT=1) ou simple log
+STRICT = os.getenv('QUERY_GUARD_STRICT', '0').lower() in ('1', 'true', 'yes')
+STATEMENT_PREVIEW = 300
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Plus de requêtes SQL que le budget de l'endpoint (ou du bloc max_queries)"""
+
+
+class QueryLog:
+    """Instructions SQL exécutées pendant une requête HTTP ou un bloc max_queries"""
+    
+    def __init__(self):
+        self.statements = Counter()
+        self.count = 0
+        self.seconds = 0.0
+        # Alimenté aussi par les threads de l'exécuteur des vues async
+        self._lock = threading.Lock()
+    
+    def record(self, statement: str, elapsed: float):
+        with self._lock:
+            self.statements[statement] += 1
+            self.count += 1
+            self.seconds += elapsed
+    
+    def repeated(self, threshold: int = REPEAT_THRESHOLD):
+        """Instructions identiques (aux paramètres près) répétées au moins `threshold` fois"""
+        return [(statement, n) for statement, n in self.statements.most_common() if n >= threshold]
+    
+    def describe(self, limit: int = 10) -> str:
+        return '\n'.join(
+            f"  {n}× {statement[:STATEMENT_PREVIEW]}"
+            for statement, n in self.statements.most_common(limit)
+        )
+
+
+# Blocs max_queries actifs dans le contexte courant (thread ou tâche asyncio) :
+# les requêtes des autres threads ne sont pas comptées
+_active_logs = ContextVar('query_guard_active_logs', default=())
+
+
+def query_budget(limit: int):
+    """
+    Décorateur de vue : nombre maximal de requêtes SQL de l'endpoint
+    
+    Placé sous @bp.route. Le dépassement est journalisé, et lève
+    QueryBudgetExceeded en mode test ou strict.
+    """
+    def decorator(view):
+        view.query_budget = limit
+        return view
+    return decorator
+
+
+@contextmanager
+def max_queries(limit: int):
+    """
+    Assertion de test : au plus `limit` requêtes SQL dans le bloc
+    
+        with max_queries(4):
+            client.get('/api/linkedin/posts')
+    """
+    log = QueryLog()
+    token = _active_logs.set(_active_logs.get() + (log,))
+    try:
+        yield log
+    finally:
+        _active_logs.reset(token)
+    if log.count > limit:
+        raise QueryBudgetExceeded(f"{log.count} requêtes SQL pour un budget de {limit}:\n{log.describe()}")
+
+
+def _location() -> str:
+    if has_request_context():
+        return f"{request.method} {request.url_rule.rule if request.url_rule else 'unmatched'}"
+    return threading.current_thread().name
+
+
+def request_query_log() -> QueryLog:
+    """Journal SQL de la requête HTTP courante (créé au besoin)"""
+    query_log = g.get('query_log')
+    if query_log is None:
+        query_log = g.query_log = QueryLog()
+    return query_log
+
+
+def bind_query_log(func):
+    """
+    Rattacher les requêtes SQL de `func`, exécutée dans un autre thread, à
+    l'appelant : journal de la requête HTTP (budget, métriques par route) et
+    blocs max_queries actifs
+    
+    À appeler dans le contexte de la requête ; `func` s'exécute ensuite sous
+    copy_current_request_context, dont le `g` est distinct.
+    """
+    query_log = request_query_log()
+    active_logs = _active_logs.get()
+    
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        g.query_log = query_log
+        token = _active_logs.set(active_logs)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _active_logs.reset(token)
+    return wrapper
+
+
+def install_query_guard(engine):
+    """
+    Seule instrumentation SQL : journal de la requête HTTP courante, blocs
+    max_queries et compteurs Prometheus globaux
+    
+    metrics.py lit le même journal (g.query_log) pour ses histogrammes par
+    route.
+    """
+    
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_guard_started', []).append(time.perf_counter())
+    
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_guard_started'].pop()
+        metrics.inc('db_queries_total')
+        metrics.inc('db_query_seconds_total', elapsed)
+        
+        if has_request_context():
+            request_query_log().record(statement, elapsed)
+        for log in _active_logs.get():
+            log.record(statement, elapsed)
+        
+        if elapsed * 1000 >= SLOW_QUERY_MS:
+            location = _location()
+            metrics.inc('db_slow_queries_total', route=location)
+            logger.warning("🐢 Requête SQL lente (%.0f ms) sur %s: %s", elapsed * 1000, location, statement[:STATEMENT_PREVIEW])
+
+
+def check_query_log(response):
+    """Hook after_request : N+1 probables et budget de l'endpoint"""
+    query_log = g.get('query_log')
+    if query_log is None:
+        return response
+    
+    location = _location()
+    for statement, n in query_log.repeated():
+        metrics.inc('db_repeated_statements_total', route=location)
+        logger.warning("🔁 N+1 probable sur %s: %s× %s", location, n, statement[:STATEMENT_PREVIEW])
+    
+    view = current_app.view_functions.get(request.endpoint)
+    budget = getattr(view, 'query_budget', None)
+    if budget is not None and query_log.count > budget:
+        message = f"{location}: {query_log.count} requêtes SQL pour un budget de {budget}"
+        if STRICT or current_app.testing:
+            raise QueryBudgetExceeded(f"{message}:\n{query_log.describe()}")
+        logger.warning("⚠️ Budget SQL dépassé, %s", message)
+    
+    return response
+
+
+def init_query_guard(app, db):
+    """Brancher les événements SQL et la vérification de fin de requête"""
+    with app.app_context():
+        install_query_guard(db.engine)
+    app.after_request(check_query_log)
@@ -0,0 +1,173 @@
+# backend/rate_limit.py - Limitation de débit (token bucket) par utilisateur et par route, partagée entre workers
+
+import os
+import math
+import time
+import sqlite3
+import logging
+import tempfile
+import threading
+from flask import current_app, jsonify, request, session
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+ENABLED = os.getenv('RATE_LIMIT_ENABLED', '1').lower() in ('1', 'true', 'yes')
+# Base SQLite locale : les workers gunicorn d'une instance partagent les mêmes seaux
+RATE_LIMIT_DB = os.getenv('RATE_LIMIT_DB') or os.path.join(tempfile.gettempdir(), 'privalead-ratelimit.sqlite3')
+LOCK_TIMEOUT = float(os.getenv('RATE_LIMIT_LOCK_TIMEOUT', 2))
+# Seaux inactifs depuis plus longtemps supprimés (ils seraient pleins de toute façon)
+IDLE_BUCKET_SECONDS = 86400
+PURGE_EVERY = 1000
+
+
+def parse_limit(spec: str):
+    """'5/60' -> (capacité 5, 5/60 jeton par seconde)"""
+    capacity, seconds = spec.split('/')
+    capacity = float(capacity)
+    return capacity, capacity / float(seconds)
+
+
+# Seaux globaux par clé d'API partagée : "appels/secondes"
+GLOBAL_LIMITS = {
+    'gemini': parse_limit(os.getenv('RATE_LIMIT_GEMINI_GLOBAL', '60/60'))
+}
+
+
+class TokenBucketStore:
+    """
+    Seaux à jetons dans une base SQLite locale
+    
+    Chaque vérification est une transaction BEGIN IMMEDIATE : le verrou
+    d'écriture SQLite sérialise les workers, et les seaux d'une même
+    requête (utilisateur + global) ne sont débités que si tous acceptent.
+    """
+    
+    def __init__(self, path: str = RATE_LIMIT_DB):
+        self.path = path
+        self._local = threading.local()
+        self._calls = 0
+        # Une connexion SQLite ne doit pas traverser le fork des workers
+        os.register_at_fork(after_in_child=self._reset)
+    
+    def _reset(self):
+        self._local = threading.local()
+    
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=LOCK_TIMEOUT, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS rate_buckets '
+                '(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)'
+            )
+            self._local.connection = connection
+        return connection
+    
+    def acquire(self, buckets, now: float = None):
+        """
+        Prendre `coût` jetons dans chacun des seaux
+        
+        Args:
+            buckets: [(clé, capacité, jetons par seconde, coût)]
+        
+        Returns:
+            tuple: (0, None) si accepté, sinon (secondes avant le prochain jeton, clé du seau vide)
+        """
+        now = time.time() if now is None else now
+        connection = self._connection()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            levels = []
+            retry_after, blocking = 0.0, None
+            for key, capacity, rate, cost in buckets:
+                row = connection.execute('SELECT tokens, updated_at FROM rate_buckets WHERE key = ?', (key,)).fetchone()
+                tokens = capacity if row is None else min(capacity, row[0] + (now - row[1]) * rate)
+                if tokens < cost and (cost - tokens) / rate > retry_after:
+                    retry_after, blocking = (cost - tokens) / rate, key
+                levels.append((key, tokens - cost))
+            
+            if blocking is None:
+                connection.executemany(
+                    'INSERT INTO rate_buckets (key, tokens, updated_at) VALUES (?, ?, ?) '
+                    'ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated_at = excluded.updated_at',
+                    [(key, tokens, now) for key, tokens in levels]
+                )
+            
+            self._calls += 1
+            if self._calls % PURGE_EVERY == 0:
+                connection.execute('DELETE FROM rate_buckets WHERE updated_at < ?', (now - IDLE_BUCKET_SECONDS,))
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        return retry_after, blocking
+
+
+bucket_store = TokenBucketStore()
+
+
+def rate_limit(scope: str, per_user: str, pool: str = None, pool_cost: int = 1):
+    """
+    Décorateur de vue : seau par utilisateur pour `scope`, et seau global `pool`
+    
+    Placé sous @bp.route. Les vues sync et async d'une même opération
+    partagent le scope. Limite surchargeable par RATE_LIMIT_<SCOPE>. Le
+    seau par utilisateur compte les requêtes ; `pool_cost` est le nombre
+    d'appels à l'API partagée faits par une requête.
+    """
+    capacity, rate = parse_limit(os.getenv(f'RATE_LIMIT_{scope.upper()}', per_user))
+    
+    def decorator(view):
+        view.rate_limit = (scope, capacity, rate, pool, pool_cost)
+        return view
+    return decorator
+
+
+def _too_many_requests(message: str, retry_after: float):
+    seconds = max(1, math.ceil(retry_after))
+    response = jsonify({'error': message, 'retryAfter': seconds})
+    response.status_code = 429
+    response.headers['Retry-After'] = str(seconds)
+    return response
+
+
+def check_rate_limit():
+    """Hook before_request : 429 avec Retry-After si un seau est vide"""
+    if not ENABLED:
+        return None
+    view = current_app.view_functions.get(request.endpoint)
+    limit = getattr(view, 'rate_limit', None)
+    user_id = session.get('user_id')
+    # Sans session la vue répond 401 sans appeler l'API externe
+    if limit is None or user_id is None:
+        return None
+    
+    scope, capacity, rate, pool, pool_cost = limit
+    buckets = [(f'user:{user_id}:{scope}', capacity, rate, 1)]
+    if pool:
+        buckets.append((f'global:{pool}', *GLOBAL_LIMITS[pool], pool_cost))
+    
+    try:
+        retry_after, blocking = bucket_store.acquire(buckets)
+    except Exception as e:
+        # Base locale indisponible : laisser passer plutôt que de bloquer le service
+        logger.error("Erreur limitation de débit: %s", e)
+        return None
+    
+    if blocking is None:
+        return None
+    
+    bucket = 'global' if blocking.startswith('global:') else 'user'
+    metrics.inc('rate_limited_total', route=scope, bucket=bucket)
+    logger.warning("⏳ Limite de débit atteinte: %s (user %s, %s)", blocking, user_id, scope)
+    if bucket == 'global':
+        return _too_many_requests('Service momentanément saturé, réessayez plus tard', retry_after)
+    return _too_many_requests('Trop de requêtes, réessayez plus tard', retry_after)
+
+
+def init_rate_limit(app):
+    """Vérifier les seaux avant les vues décorées par @rate_limit"""
+    app.before_request(check_rate_limit)
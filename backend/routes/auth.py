@@ -40,7 +40,7 @@ def linkedin_callback():
     error = request.args.get("error")
     
     if error:
-        logger.error(f"LinkedIn auth error: {error}")
+        logger.error("LinkedIn auth error: %s", error)
         return redirect(f"{os.getenv('FRONTEND_URL')}/?error=linkedin_auth_failed")
     
     if not code:
@@ -63,7 +63,7 @@ def linkedin_callback():
         )
         
         if token_response.status_code != 200:
-            logger.error(f"Token exchange failed: {token_response.text}")
+            logger.error("Token exchange failed: %s", token_response.text)
             return redirect(f"{os.getenv('FRONTEND_URL')}/?error=token_exchange_failed")
         
         token_info = token_response.json()
@@ -74,7 +74,7 @@ def linkedin_callback():
         user_response = requests.get(LINKEDIN_USERINFO_URL, headers=headers)
         
         if user_response.status_code != 200:
-            logger.error(f"User info failed: {user_response.text}")
+            logger.error("User info failed: %s", user_response.text)
             return redirect(f"{os.getenv('FRONTEND_URL')}/?error=user_info_failed")
         
         user_info = user_response.json()
@@ -105,13 +105,13 @@ def linkedin_callback():
                 setattr(user, key, value)
         
         db.session.commit()
-        logger.info(f"User {user.email} authenticated successfully")
+        logger.info("User %s authenticated successfully", user.email)
         
         # Rediriger vers le frontend
         return redirect(f"{os.getenv('FRONTEND_URL')}/dashboard")
         
     except Exception as e:
-        logger.error(f"Authentication error: {str(e)}")
+        logger.error("Authentication error: %s", e)
         return redirect(f"{os.getenv('FRONTEND_URL')}/?error=auth_failed")
 
 @auth_bp.route('/status')
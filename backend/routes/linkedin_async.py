@@ -0,0 +1,220 @@
+from flask import Blueprint, request, session, jsonify, copy_current_request_context
+import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from models.linkedin_models import LinkedInPost
+from db_engine import DEFAULT_ASYNC_DB_THREADS
+from services.gemini_service import GeminiService
+from services.linkedin_service import LinkedInService
+from services.news_service import NewsService
+from services.http_client import async_http_client, HTTPX_AVAILABLE
+from services.identity import get_linkedin_account
+from services.template_catalogue import template_catalogue
+from services.usage_counters import template_usage
+from routes.linkedin_content import _save_post_metrics
+from rate_limit import rate_limit
+from query_guard import bind_query_log
+import logging
+
+try:
+    import asgiref  # noqa: F401  (requis par Flask pour les vues async)
+    ASYNC_VIEWS_AVAILABLE = HTTPX_AVAILABLE
+except ImportError:
+    ASYNC_VIEWS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Créer le blueprint : mêmes contrats que les routes synchrones, sous /async
+#
+# Flask exécute chaque vue async dans le thread de la requête (asgiref) : le
+# worker ne sert pas plus de requêtes simultanées qu'avec les vues sync.
+# Seuls les appels externes d'une même requête (recherches NewsAPI, métriques
+# LinkedIn, appels Gemini) partent en parallèle sur la boucle d'événements.
+linkedin_async_bp = Blueprint('linkedin_async', __name__, url_prefix='/api/linkedin/async')
+
+# Accès base synchrones exécutés hors de la boucle d'événements
+DB_OFFLOAD_THREADS = int(os.getenv('ASYNC_DB_THREADS', DEFAULT_ASYNC_DB_THREADS))
+MAX_NEWS_KEYWORDS = 10
+
+_db_executor = ThreadPoolExecutor(max_workers=DB_OFFLOAD_THREADS, thread_name_prefix='async-db')
+
+def init_linkedin_async_routes(db_instance):
+    global db
+    db = db_instance
+
+async def _run_db(func, *args):
+    """
+    Exécuter un accès base synchrone dans le pool, avec une copie du contexte de requête
+    
+    Les requêtes SQL restent comptées dans le journal de la requête HTTP.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_db_executor, copy_current_request_context(bind_query_log(func)), *args)
+
+@linkedin_async_bp.route('/generate', methods=['POST'])
+@rate_limit('generate', '5/60', pool='gemini', pool_cost=2)  # deux appels Gemini : post et hashtags
+async def generate_content_async():
+    """Générer du contenu LinkedIn avec l'IA (appels Gemini asynchrones)"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Non authentifié'}), 401
+    
+    user_id = session['user_id']
+    data = request.get_json()
+    
+    if not data:
+        return jsonify({'error': 'Données manquantes'}), 400
+    
+    prompt = data.get('prompt', '').strip()
+    tone = data.get('tone', 'professionnel')
+    selected_article = data.get('selectedArticle')
+    template_id = data.get('templateId')
+    
+    if not prompt and not template_id and not selected_article:
+        return jsonify({'error': 'Prompt, template ou article requis'}), 400
+    
+    try:
+        # Compte LinkedIn et template résolus en parallèle
+        linkedin_user, template = await asyncio.gather(
+            _run_db(get_linkedin_account, user_id),
+            _run_db(template_catalogue.get, template_id) if template_id else asyncio.sleep(0)
+        )
+        if not linkedin_user:
+            return jsonify({'error': 'LinkedIn non connecté'}), 400
+        
+        if template:
+            prompt = template['promptTemplate']
+            tone = template['tone'] or tone
+            template_usage.increment(template['id'])
+        
+        industry = linkedin_user.industry or 'general'
+        user_context = {
+            'name': f"{linkedin_user.first_name} {linkedin_user.last_name}",
+            'headline': linkedin_user.headline or f"Expert {linkedin_user.industry or 'Professionnel'}",
+            'industry': industry
+        }
+        
+        gemini_service = GeminiService()
+        generated_content = await gemini_service.generate_linkedin_post_async(
+            prompt=prompt,
+            tone=tone,
+            industry=industry,
+            user_context=user_context,
+            article_context=selected_article
+        )
+        hashtags = await gemini_service.generate_hashtags_async(generated_content, industry)
+        
+        logger.info("✅ Contenu généré (async) pour user %s", user_id)
+        
+        return jsonify({
+            'success': True,
+            'content': generated_content,
+            'analysis': gemini_service.analyze_content_performance(generated_content),
+            'hashtags': hashtags,
+            'optimalTiming': gemini_service.optimize_posting_time(industry),
+            'metadata': {
+                'tone': tone,
+                'prompt': prompt,
+                'articleSource': selected_article,
+                'generatedAt': datetime.utcnow().isoformat()
+            }
+        })
+    
+    except Exception as e:
+        logger.error("Erreur génération contenu (async): %s", e)
+        return jsonify({'error': f'Erreur de génération: {str(e)}'}), 500
+
+@linkedin_async_bp.route('/news', methods=['GET'])
+async def get_news_async():
+    """
+    Actualités pour inspiration, plusieurs recherches en parallèle
+    
+    keywords=a,b,c lance une recherche par mot-clé sur la même boucle ;
+    sans mot-clé, actualités du secteur (industry).
+    """
+    keywords = [
+        keyword.strip()
+        for keyword in (request.args.get('keywords') or request.args.get('keyword', '')).split(',')
+        if keyword.strip()
+    ][:MAX_NEWS_KEYWORDS]
+    language = request.args.get('language', 'fr')
+    industry = request.args.get('industry', 'general')
+    
+    try:
+        news_service = NewsService()
+        
+        async with async_http_client() as client:
+            if keywords:
+                results = await asyncio.gather(*[
+                    news_service.search_news_async(client, keyword, language)
+                    for keyword in keywords
+                ])
+            else:
+                results = [await news_service.get_industry_news_async(client, industry, language)]
+        
+        if len(results) == 1:
+            return jsonify(results[0])
+        
+        # Fusion sans doublons (même URL)
+        seen = set()
+        articles = []
+        for result in results:
+            for article in result.get('articles', []):
+                if article.get('url') not in seen:
+                    seen.add(article.get('url'))
+                    articles.append(article)
+        
+        return jsonify({
+            'success': all(result.get('success') for result in results),
+            'articles': articles,
+            'keywords': keywords,
+            'language': language
+        })
+    
+    except Exception as e:
+        logger.error("Erreur récupération actualités (async): %s", e)
+        return jsonify({'error': str(e)}), 500
+
+@linkedin_async_bp.route('/analytics/refresh', methods=['POST'])
+async def refresh_analytics_async():
+    """Rafraîchir les métriques des posts publiés, requêtes LinkedIn en parallèle dans la requête"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Non authentifié'}), 401
+    
+    user_id = session['user_id']
+    
+    def load_published():
+        return db.session.query(LinkedInPost.id, LinkedInPost.linkedin_post_id).filter(
+            LinkedInPost.user_id == user_id,
+            LinkedInPost.status == 'published',
+            LinkedInPost.linkedin_post_id.isnot(None)
+        ).all()
+    
+    try:
+        linkedin_user, rows = await asyncio.gather(
+            _run_db(get_linkedin_account, user_id),
+            _run_db(load_published)
+        )
+        if not linkedin_user:
+            return jsonify({'error': 'LinkedIn non connecté'}), 400
+        
+        analytics_by_post = await LinkedInService(linkedin_user.access_token).get_bulk_post_analytics_async(
+            [linkedin_post_id for _, linkedin_post_id in rows]
+        )
+        
+        updated = await _run_db(
+            _save_post_metrics,
+            user_id,
+            [(post_id, analytics_by_post.get(linkedin_post_id)) for post_id, linkedin_post_id in rows]
+        )
+        
+        logger.info("🔄 Métriques rafraîchies (async): %s/%s posts (user %s)", updated, len(rows), user_id)
+        return jsonify({
+            'success': True,
+            'requested': len(rows),
+            'updated': updated
+        })
+    
+    except Exception as e:
+        logger.error("Erreur rafraîchissement analytics (async): %s", e)
+        return jsonify({'error': str(e)}), 500
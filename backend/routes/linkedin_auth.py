@@ -1,9 +1,11 @@
 from flask import Blueprint, request, session, jsonify, redirect, url_for
 from urllib.parse import urlencode
-import requests
+from services.http_client import get_http_session
 import os
 from datetime import datetime, timedelta
 from models.linkedin_models import LinkedInUser
+from services.identity import get_linkedin_account, invalidate_linkedin_account
+from query_guard import query_budget
 from flask_sqlalchemy import SQLAlchemy
 import logging
 
@@ -19,8 +21,8 @@ LINKEDIN_REDIRECT_URI = os.getenv("LINKEDIN_REDIRECT_URI", "https://privalead-1.
 FRONTEND_URL = os.getenv("FRONTEND_URL", "https://privalead-1.onrender.com")
 
 LINKEDIN_AUTH_URL = "https://www.linkedin.com/oauth/v2/authorization"
-LINKEDIN_TOKEN_URL = "https://www.linkedin.com/oauth/v2/accessToken"
-LINKEDIN_USERINFO_URL = "https://api.linkedin.com/v2/userinfo"
+LINKEDIN_TOKEN_URL = os.getenv("LINKEDIN_TOKEN_URL", "https://www.linkedin.com/oauth/v2/accessToken")
+LINKEDIN_USERINFO_URL = f"{os.getenv('LINKEDIN_API_BASE_URL', 'https://api.linkedin.com/v2')}/userinfo"
 SCOPES = "openid email profile w_member_social"
 
 def init_linkedin_routes(db_instance):
@@ -50,7 +52,7 @@ def linkedin_auth():
     
     auth_url = f"{LINKEDIN_AUTH_URL}?{urlencode(params)}"
     
-    logger.info(f"🔗 Redirection LinkedIn pour user {session['user_id']}")
+    logger.info("🔗 Redirection LinkedIn pour user %s", session['user_id'])
     return redirect(auth_url)
 
 @linkedin_auth_bp.route('/callback')
@@ -61,7 +63,7 @@ def linkedin_callback():
     state = request.args.get("state")
     
     if error:
-        logger.error(f"LinkedIn auth error: {error}")
+        logger.error("LinkedIn auth error: %s", error)
         return redirect(f"{FRONTEND_URL}/dashboard?linkedin_error=auth_failed")
     
     if not code:
@@ -90,7 +92,7 @@ def linkedin_callback():
         }
         
         logger.info("🔄 Échange du code contre un token...")
-        token_response = requests.post(
+        token_response = get_http_session().post(
             LINKEDIN_TOKEN_URL, 
             data=token_data,
             headers={"Content-Type": "application/x-www-form-urlencoded"},
@@ -98,7 +100,7 @@ def linkedin_callback():
         )
         
         if token_response.status_code != 200:
-            logger.error(f"Token exchange failed: {token_response.text}")
+            logger.error("Token exchange failed: %s", token_response.text)
             return redirect(f"{FRONTEND_URL}/dashboard?linkedin_error=token_failed")
         
         token_info = token_response.json()
@@ -112,16 +114,17 @@ def linkedin_callback():
         # Récupérer les informations utilisateur LinkedIn
         logger.info("📋 Récupération des infos utilisateur LinkedIn...")
         headers = {"Authorization": f"Bearer {access_token}"}
-        user_response = requests.get(LINKEDIN_USERINFO_URL, headers=headers, timeout=10)
+        user_response = get_http_session().get(LINKEDIN_USERINFO_URL, headers=headers, timeout=10)
         
         if user_response.status_code != 200:
-            logger.error(f"User info failed: {user_response.text}")
+            logger.error("User info failed: %s", user_response.text)
             return redirect(f"{FRONTEND_URL}/dashboard?linkedin_error=userinfo_failed")
         
         user_info = user_response.json()
         
         # Créer ou mettre à jour l'utilisateur LinkedIn
         linkedin_user = LinkedInUser.query.filter_by(linkedin_id=user_info.get("sub")).first()
+        previous_user_id = linkedin_user.user_id if linkedin_user else None
         
         if not linkedin_user:
             # Créer nouvel utilisateur LinkedIn
@@ -139,7 +142,7 @@ def linkedin_callback():
                 token_expires_at=datetime.utcnow() + timedelta(seconds=expires_in)
             )
             db.session.add(linkedin_user)
-            logger.info(f"✅ Nouvel utilisateur LinkedIn créé: {linkedin_user.email}")
+            logger.info("✅ Nouvel utilisateur LinkedIn créé: %s", linkedin_user.email)
         else:
             # Mettre à jour les informations existantes
             linkedin_user.user_id = user_id  # Associer au compte Privalead actuel
@@ -153,29 +156,32 @@ def linkedin_callback():
             linkedin_user.token_expires_at = datetime.utcnow() + timedelta(seconds=expires_in)
             linkedin_user.is_active = True
             linkedin_user.updated_at = datetime.utcnow()
-            logger.info(f"✅ Utilisateur LinkedIn mis à jour: {linkedin_user.email}")
+            logger.info("✅ Utilisateur LinkedIn mis à jour: %s", linkedin_user.email)
         
         db.session.commit()
+        # Nouveau token : le compte mis en cache est périmé (ancien et nouveau propriétaire)
+        invalidate_linkedin_account(user_id, previous_user_id)
         
         # Stocker les infos en session
         session['linkedin_user_id'] = linkedin_user.id
         session['linkedin_access_token'] = access_token
         
-        logger.info(f"🎉 LinkedIn connecté avec succès pour user {user_id}")
+        logger.info("🎉 LinkedIn connecté avec succès pour user %s", user_id)
         return redirect(f"{FRONTEND_URL}/dashboard?linkedin_success=true")
         
     except Exception as e:
-        logger.error(f"Erreur lors de l'authentification LinkedIn: {str(e)}")
+        logger.error("Erreur lors de l'authentification LinkedIn: %s", e)
         return redirect(f"{FRONTEND_URL}/dashboard?linkedin_error=server_error")
 
 @linkedin_auth_bp.route('/status')
+@query_budget(2)
 def linkedin_status():
     """Vérifier le statut de connexion LinkedIn"""
     if 'user_id' not in session:
         return jsonify({'error': 'Non authentifié'}), 401
     
     user_id = session['user_id']
-    linkedin_user = LinkedInUser.query.filter_by(user_id=user_id, is_active=True).first()
+    linkedin_user = get_linkedin_account(user_id)
     
     if not linkedin_user:
         return jsonify({
@@ -211,12 +217,13 @@ def linkedin_disconnect():
         linkedin_user.access_token = None
         linkedin_user.updated_at = datetime.utcnow()
         db.session.commit()
+    invalidate_linkedin_account(user_id)
     
     # Nettoyer la session
     session.pop('linkedin_user_id', None)
     session.pop('linkedin_access_token', None)
     
-    logger.info(f"🔌 LinkedIn déconnecté pour user {user_id}")
+    logger.info("🔌 LinkedIn déconnecté pour user %s", user_id)
     return jsonify({
         'success': True,
         'message': 'LinkedIn déconnecté avec succès'
@@ -0,0 +1,227 @@
+from flask import Blueprint, request, session, jsonify, Response, stream_with_context
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from models.linkedin_models import LinkedInPost
+from services.gemini_service import OPTIMAL_POSTING_TIMES
+from services.identity import get_linkedin_account
+from query_guard import query_budget
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Créer le blueprint
+linkedin_calendar_bp = Blueprint('linkedin_calendar', __name__, url_prefix='/api/linkedin')
+
+UTC = ZoneInfo('UTC')
+
+# Plage maximale d'une requête calendrier
+MAX_RANGE_DAYS = 92
+SNIPPET_LENGTH = 120
+WEEKDAYS = ['monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday']
+
+def init_linkedin_calendar_routes(db_instance):
+    global db
+    db = db_instance
+
+def _parse_date(value, timezone):
+    """
+    Parser une date ISO (YYYY-MM-DD ou datetime complet) en UTC naïf, comme scheduled_for
+    
+    Une date seule ou un datetime sans décalage est une heure locale du
+    fuseau demandé : ?from=2026-10-20 commence à minuit dans ce fuseau, comme
+    le regroupement par jour.
+    """
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone)
+    return parsed.astimezone(UTC).replace(tzinfo=None)
+
+def _parse_range(args, default_from, default_days=None):
+    """
+    Fuseau et plage from/to d'une requête calendrier
+    
+    Returns:
+        tuple: (fuseau, début UTC naïf, fin UTC naïve ou None)
+    
+    Raises:
+        ValueError: message d'erreur destiné au client
+    """
+    try:
+        timezone = ZoneInfo(args.get('timezone', 'Europe/Paris'))
+    except (ZoneInfoNotFoundError, ValueError):
+        raise ValueError('Fuseau horaire invalide')
+    
+    try:
+        date_from = _parse_date(args['from'], timezone) if args.get('from') else default_from
+        if args.get('to'):
+            date_to = _parse_date(args['to'], timezone)
+        else:
+            date_to = date_from + timedelta(days=default_days) if default_days else None
+    except ValueError:
+        raise ValueError('Format de date invalide')
+    
+    if date_to is not None and date_to <= date_from:
+        raise ValueError('La date de fin doit être après la date de début')
+    return timezone, date_from, date_to
+
+def _scheduled_posts_query(user_id, date_from=None, date_to=None):
+    """Requête par plage servie par l'index (user_id, scheduled_for)"""
+    query = db.session.query(
+        LinkedInPost.id,
+        LinkedInPost.content,
+        LinkedInPost.scheduled_for,
+        LinkedInPost.tone
+    ).filter(
+        LinkedInPost.user_id == user_id,
+        LinkedInPost.status == 'scheduled',
+        LinkedInPost.scheduled_for.isnot(None)
+    )
+    
+    if date_from:
+        query = query.filter(LinkedInPost.scheduled_for >= date_from)
+    if date_to:
+        query = query.filter(LinkedInPost.scheduled_for < date_to)
+    
+    return query.order_by(LinkedInPost.scheduled_for)
+
+@linkedin_calendar_bp.route('/calendar', methods=['GET'])
+@query_budget(3)
+def get_calendar():
+    """Récupérer les posts programmés regroupés par jour"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Non authentifié'}), 401
+    
+    user_id = session['user_id']
+    
+    try:
+        timezone, date_from, date_to = _parse_range(request.args, datetime.utcnow(), default_days=30)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    if date_to - date_from > timedelta(days=MAX_RANGE_DAYS):
+        return jsonify({'error': f'Plage limitée à {MAX_RANGE_DAYS} jours'}), 400
+    
+    try:
+        linkedin_user = get_linkedin_account(user_id)
+        industry = linkedin_user.industry if linkedin_user and linkedin_user.industry else 'general'
+        timing = OPTIMAL_POSTING_TIMES.get(industry, OPTIMAL_POSTING_TIMES['default'])
+        optimal_days = set(timing['days'])
+        optimal_hours = set(timing['hours'])
+        
+        days = {}
+        slots = {}
+        for post_id, content, scheduled_for, tone in _scheduled_posts_query(user_id, date_from, date_to):
+            # scheduled_for est stocké en UTC naïf
+            local_time = scheduled_for.replace(tzinfo=UTC).astimezone(timezone)
+            day_key = local_time.date().isoformat()
+            slot_key = (day_key, local_time.hour)
+            
+            entry = {
+                'id': post_id,
+                'snippet': content[:SNIPPET_LENGTH],
+                'scheduledFor': scheduled_for.isoformat(),
+                'localTime': local_time.strftime('%H:%M'),
+                'tone': tone,
+                'inOptimalWindow': WEEKDAYS[local_time.weekday()] in optimal_days and local_time.hour in optimal_hours,
+                'conflictsWith': []
+            }
+            
+            # Deux posts dans le même créneau horaire se concurrencent
+            for other in slots.get(slot_key, []):
+                other['conflictsWith'].append(post_id)
+                entry['conflictsWith'].append(other['id'])
+            slots.setdefault(slot_key, []).append(entry)
+            
+            days.setdefault(day_key, []).append(entry)
+        
+        conflicts = [
+            {'date': day_key, 'hour': hour, 'postIds': [entry['id'] for entry in entries]}
+            for (day_key, hour), entries in slots.items()
+            if len(entries) > 1
+        ]
+        
+        return jsonify({
+            'success': True,
+            'from': date_from.isoformat(),
+            'to': date_to.isoformat(),
+            'timezone': str(timezone),
+            'days': [{'date': day_key, 'posts': posts} for day_key, posts in days.items()],
+            'conflicts': conflicts,
+            'optimalWindows': {
+                'days': timing['days'],
+                'hours': timing['hours']
+            },
+            'total': sum(len(posts) for posts in days.values())
+        })
+    
+    except Exception as e:
+        logger.error("Erreur récupération calendrier: %s", e)
+        return jsonify({'error': str(e)}), 500
+
+def _ics_escape(text):
+    """Échapper un texte selon la RFC 5545"""
+    return (text or '').replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\r\n', '\\n').replace('\n', '\\n')
+
+def _ics_line(line):
+    """Replier une ligne ICS à 75 octets"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + '\r\n'
+    
+    parts = []
+    current = ''
+    limit = 75
+    for char in line:
+        if len((current + char).encode('utf-8')) > limit:
+            parts.append(current)
+            current = char
+            limit = 74  # l'espace de continuation compte
+        else:
+            current += char
+    parts.append(current)
+    return '\r\n '.join(parts) + '\r\n'
+
+@linkedin_calendar_bp.route('/calendar.ics', methods=['GET'])
+# Pas de @query_budget : la requête s'exécute pendant le streaming, après after_request
+def get_calendar_ics():
+    """Flux ICS des posts programmés, généré au fil de l'eau (from/to/timezone comme /calendar)"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Non authentifié'}), 401
+    
+    user_id = session['user_id']
+    
+    try:
+        _, date_from, date_to = _parse_range(request.args, datetime.utcnow() - timedelta(days=1))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    def generate():
+        yield _ics_line('BEGIN:VCALENDAR')
+        yield _ics_line('VERSION:2.0')
+        yield _ics_line('PRODID:-//Privalead//LinkedIn Calendar//FR')
+        yield _ics_line('CALSCALE:GREGORIAN')
+        yield _ics_line('X-WR-CALNAME:Posts LinkedIn programmés')
+        
+        stamp = datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')
+        query = _scheduled_posts_query(user_id, date_from, date_to)
+        for post_id, content, scheduled_for, tone in query.yield_per(200):
+            summary = content.strip().split('\n', 1)[0][:SNIPPET_LENGTH]
+            yield (
+                _ics_line('BEGIN:VEVENT')
+                + _ics_line(f'UID:linkedin-post-{post_id}@privalead')
+                + _ics_line(f'DTSTAMP:{stamp}')
+                + _ics_line(f"DTSTART:{scheduled_for.strftime('%Y%m%dT%H%M%SZ')}")
+                + _ics_line(f"DTEND:{(scheduled_for + timedelta(minutes=15)).strftime('%Y%m%dT%H%M%SZ')}")
+                + _ics_line(f'SUMMARY:{_ics_escape(summary)}')
+                + _ics_line(f'DESCRIPTION:{_ics_escape(content)}')
+                + _ics_line('END:VEVENT')
+            )
+        
+        yield _ics_line('END:VCALENDAR')
+    
+    logger.info("📅 Export ICS demandé (user %s)", user_id)
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/calendar',
+        headers={'Content-Disposition': 'inline; filename="privalead-calendar.ics"'}
+    )
@@ -1,9 +1,23 @@
 from flask import Blueprint, request, session, jsonify
+import os
+import base64
+import binascii
+import json
 from datetime import datetime, timedelta
-from models.linkedin_models import LinkedInUser, LinkedInPost, ContentTemplate
+from sqlalchemy import update, func
+from models.linkedin_models import LinkedInPost, PublishOutbox, UserPostRollup, compute_user_rollup, rebuild_user_rollup
 from services.gemini_service import GeminiService
 from services.linkedin_service import LinkedInService
 from services.news_service import NewsService
+from services.content_renderer import render_content, merge_hashtags
+from services.publish_relay import publish_relay
+from services.usage_counters import template_usage
+from services.template_catalogue import template_catalogue, catalogue_etag
+from services.identity import get_linkedin_account
+from http_cache import make_etag, etag_matches, not_modified, freshness_bucket
+from query_guard import query_budget
+from rate_limit import rate_limit
+from services.metrics_timeseries import record_snapshots, get_post_series, get_user_series
 import logging
 
 logger = logging.getLogger(__name__)
@@ -15,7 +29,105 @@ def init_linkedin_content_routes(db_instance):
     global db
     db = db_instance
 
+# Taille de page maximale pour la liste des posts
+MAX_PAGE_SIZE = 100
+# Durée pendant laquelle un 304 peut resservir les analytics LinkedIn de la liste
+POSTS_ANALYTICS_FRESHNESS = int(os.getenv('POSTS_ANALYTICS_FRESHNESS', 60))
+
+def _encode_cursor(post):
+    """Curseur opaque encodant la clé (created_at, id) du dernier post de la page"""
+    payload = json.dumps({'c': post.created_at.isoformat(), 'i': post.id}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def _decode_cursor(cursor):
+    """Décoder un curseur ; lève ValueError s'il est invalide"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(payload['c']), int(payload['i'])
+    except (KeyError, TypeError, binascii.Error, json.JSONDecodeError) as e:
+        raise ValueError(f'Curseur invalide: {e}')
+
+def _parse_datetime_arg(name):
+    """Lire un paramètre de date ISO optionnel"""
+    value = request.args.get(name)
+    return datetime.fromisoformat(value.replace('Z', '')) if value else None
+
+def _parse_summary_fields():
+    """
+    Lire view=summary ou fields=a,b,c
+    
+    Returns:
+        Liste des champs de la vue résumée, ou None pour la vue complète
+    """
+    fields = request.args.get('fields')
+    if fields:
+        requested = [field.strip() for field in fields.split(',') if field.strip()]
+        unknown = [field for field in requested if field not in LinkedInPost.SUMMARY_FIELDS]
+        if unknown:
+            raise ValueError(f"Champs inconnus: {', '.join(unknown)}")
+        return requested
+    
+    if request.args.get('view') == 'summary':
+        return list(LinkedInPost.SUMMARY_FIELDS)
+    
+    return None
+
+def _posts_version(user_id, status=None):
+    """Version des posts d'un utilisateur : nombre et dernier updated_at (index user_id, updated_at)"""
+    query = db.session.query(func.count(LinkedInPost.id), func.max(LinkedInPost.updated_at)).filter(
+        LinkedInPost.user_id == user_id
+    )
+    if status:
+        query = query.filter(LinkedInPost.status == status)
+    return tuple(query.one())
+
+def _save_post_metrics(user_id, metrics_rows):
+    """
+    Enregistrer les métriques de plusieurs posts en un seul UPDATE groupé
+    
+    Args:
+        user_id: Propriétaire des posts (pour recalculer ses agrégats)
+        metrics_rows: Liste de tuples (id du post, métriques ou None)
+        
+    Returns:
+        int: Nombre de posts mis à jour
+    """
+    rows = [
+        {
+            'id': post_id,
+            'likes_count': metrics.get('likes', 0),
+            'comments_count': metrics.get('comments', 0),
+            'shares_count': metrics.get('shares', 0),
+            'views_count': metrics.get('views', 0)
+        }
+        for post_id, metrics in metrics_rows
+        # Ne jamais persister de métriques simulées
+        if metrics and not metrics.get('simulated') and not metrics.get('error')
+    ]
+    
+    if not rows:
+        return 0
+    
+    # UPDATE par clé primaire exécuté en executemany, sans flush par ligne
+    db.session.execute(update(LinkedInPost), rows)
+    # L'UPDATE groupé ne passe pas par les événements ORM
+    rebuild_user_rollup(user_id)
+    record_snapshots(db, user_id, [
+        (row['id'], {
+            'likes': row['likes_count'],
+            'comments': row['comments_count'],
+            'shares': row['shares_count'],
+            'views': row['views_count']
+        })
+        for row in rows
+    ])
+    db.session.commit()
+    return len(rows)
+
 @linkedin_content_bp.route('/generate', methods=['POST'])
+@query_budget(3)
+@rate_limit('generate', '5/60', pool='gemini', pool_cost=2)  # deux appels Gemini : post et hashtags
 def generate_content():
     """Générer du contenu LinkedIn avec l'IA"""
     if 'user_id' not in session:
@@ -37,8 +149,8 @@ def generate_content():
         return jsonify({'error': 'Prompt, template ou article requis'}), 400
     
     try:
-        # Récupérer l'utilisateur LinkedIn
-        linkedin_user = LinkedInUser.query.filter_by(user_id=user_id, is_active=True).first()
+        # Compte LinkedIn résolu une fois par requête (cache court)
+        linkedin_user = get_linkedin_account(user_id)
         if not linkedin_user:
             return jsonify({'error': 'LinkedIn non connecté'}), 400
         
@@ -51,13 +163,12 @@ def generate_content():
         
         # Si un template est sélectionné
         if template_id:
-            template = ContentTemplate.query.get(template_id)
+            template = template_catalogue.get(template_id)
             if template:
-                prompt = template.prompt_template
-                tone = template.tone or tone
-                # Incrémenter le compteur d'usage
-                template.usage_count += 1
-                db.session.commit()
+                prompt = template['promptTemplate']
+                tone = template['tone'] or tone
+                # Compteur tamponné, écrit en base par lots
+                template_usage.increment(template['id'])
         
         # Initialiser le service Gemini
         gemini_service = GeminiService()
@@ -80,7 +191,7 @@ def generate_content():
         # Suggestion de timing optimal
         optimal_timing = gemini_service.optimize_posting_time(linkedin_user.industry or 'general')
         
-        logger.info(f"✅ Contenu généré pour user {user_id}")
+        logger.info("✅ Contenu généré pour user %s", user_id)
         
         return jsonify({
             'success': True,
@@ -97,10 +208,11 @@ def generate_content():
         })
         
     except Exception as e:
-        logger.error(f"Erreur génération contenu: {str(e)}")
+        logger.error("Erreur génération contenu: %s", e)
         return jsonify({'error': f'Erreur de génération: {str(e)}'}), 500
 
 @linkedin_content_bp.route('/publish', methods=['POST'])
+@query_budget(6)
 def publish_content():
     """Publier ou programmer du contenu LinkedIn"""
     if 'user_id' not in session:
@@ -121,11 +233,14 @@ def publish_content():
         return jsonify({'error': 'Contenu requis'}), 400
     
     try:
-        # Récupérer l'utilisateur LinkedIn
-        linkedin_user = LinkedInUser.query.filter_by(user_id=user_id, is_active=True).first()
+        # Compte LinkedIn résolu une fois par requête (cache court)
+        linkedin_user = get_linkedin_account(user_id)
         if not linkedin_user:
             return jsonify({'error': 'LinkedIn non connecté'}), 400
         
+        # Extraire mentions, hashtags et liens en une passe
+        rendered = render_content(content)
+        
         # Créer le post en base
         linkedin_post = LinkedInPost(
             user_id=user_id,
@@ -135,34 +250,28 @@ def publish_content():
             generated_by_ai=True,
             prompt_used=metadata.get('prompt'),
             article_source=metadata.get('articleSource'),
-            hashtags=metadata.get('hashtags', [])
+            hashtags=merge_hashtags(metadata.get('hashtags', []), rendered['hashtags']),
+            # content est enregistré brut : positions des mentions dans ce texte
+            mentions=rendered['sourceMentions']
         )
         
         if publish_now:
-            # Publication immédiate
-            linkedin_service = LinkedInService(linkedin_user.access_token)
-            result = linkedin_service.publish_post(
-                content=content,
-                linkedin_id=linkedin_user.linkedin_id
-            )
+            # Publication asynchrone : le post et l'entrée d'outbox sont
+            # validés dans la même transaction, le relais publie ensuite
+            linkedin_post.status = 'publishing'
+            db.session.add(linkedin_post)
+            db.session.add(PublishOutbox(post=linkedin_post))
+            db.session.commit()
+            publish_relay.wake()
             
-            if result['success']:
-                linkedin_post.status = 'published'
-                linkedin_post.published_at = datetime.utcnow()
-                linkedin_post.linkedin_post_id = result.get('post_id')
-                db.session.add(linkedin_post)
-                db.session.commit()
-                
-                logger.info(f"📤 Post publié immédiatement pour user {user_id}")
-                return jsonify({
-                    'success': True,
-                    'message': 'Post publié avec succès sur LinkedIn',
-                    'postId': linkedin_post.id,
-                    'linkedinPostId': result.get('post_id')
-                })
-            else:
-                logger.error(f"Erreur publication LinkedIn: {result['error']}")
-                return jsonify({'error': result['error']}), 500
+            logger.info("📮 Post %s mis en file de publication (user %s)", linkedin_post.id, user_id)
+            return jsonify({
+                'success': True,
+                'message': 'Publication sur LinkedIn en cours',
+                'postId': linkedin_post.id,
+                'status': linkedin_post.status,
+                'statusUrl': f"/api/linkedin/posts/{linkedin_post.id}/status"
+            }), 202
         
         else:
             # Programmation
@@ -182,7 +291,7 @@ def publish_content():
             db.session.add(linkedin_post)
             db.session.commit()
             
-            logger.info(f"📅 Post programmé pour {schedule_datetime} (user {user_id})")
+            logger.info("📅 Post programmé pour %s (user %s)", schedule_datetime, user_id)
             return jsonify({
                 'success': True,
                 'message': f'Post programmé pour le {schedule_datetime.strftime("%d/%m/%Y à %H:%M")}',
@@ -191,10 +300,11 @@ def publish_content():
             })
             
     except Exception as e:
-        logger.error(f"Erreur publication/programmation: {str(e)}")
+        logger.error("Erreur publication/programmation: %s", e)
         return jsonify({'error': f'Erreur: {str(e)}'}), 500
 
 @linkedin_content_bp.route('/posts', methods=['GET'])
+@query_budget(4)
 def get_posts():
     """Récupérer les posts LinkedIn de l'utilisateur"""
     if 'user_id' not in session:
@@ -202,42 +312,163 @@ def get_posts():
     
     user_id = session['user_id']
     status_filter = request.args.get('status')  # draft, scheduled, published
-    limit = int(request.args.get('limit', 20))
     
     try:
+        limit = min(max(int(request.args.get('limit', 20)), 1), MAX_PAGE_SIZE)
+        cursor = _decode_cursor(request.args['cursor']) if request.args.get('cursor') else None
+        date_from = _parse_datetime_arg('from')
+        date_to = _parse_datetime_arg('to')
+    except ValueError:
+        return jsonify({'error': 'Paramètres de pagination invalides'}), 400
+    
+    include_total = request.args.get('includeTotal', 'false').lower() == 'true'
+    
+    try:
+        summary_fields = _parse_summary_fields()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        # GET conditionnel : 304 avant toute requête de page ou appel LinkedIn.
+        # Les analytics viennent de LinkedIn, pas de la base : le créneau de
+        # fraîcheur force un nouvel appel toutes les POSTS_ANALYTICS_FRESHNESS s
+        etag = make_etag(
+            'posts', user_id, request.query_string, _posts_version(user_id),
+            freshness_bucket(POSTS_ANALYTICS_FRESHNESS)
+        )
+        if etag_matches(etag):
+            return not_modified(etag)
+        
         query = LinkedInPost.query.filter_by(user_id=user_id)
         
+        if summary_fields:
+            query = query.options(*LinkedInPost.summary_options(summary_fields))
+        
         if status_filter:
             query = query.filter_by(status=status_filter)
-        
-        posts = query.order_by(LinkedInPost.created_at.desc()).limit(limit).all()
-        
-        # Récupérer les analytics pour les posts publiés
-        linkedin_user = LinkedInUser.query.filter_by(user_id=user_id, is_active=True).first()
-        linkedin_service = LinkedInService(linkedin_user.access_token if linkedin_user else None)
+        if date_from:
+            query = query.filter(LinkedInPost.created_at >= date_from)
+        if date_to:
+            query = query.filter(LinkedInPost.created_at < date_to)
+        
+        total_count = query.count() if include_total else None
+        
+        # Pagination par clé (created_at, id) : coût constant quelle que soit la page
+        if cursor:
+            cursor_created_at, cursor_id = cursor
+            query = query.filter(db.or_(
+                LinkedInPost.created_at < cursor_created_at,
+                db.and_(LinkedInPost.created_at == cursor_created_at, LinkedInPost.id < cursor_id)
+            ))
+        
+        posts = query.order_by(
+            LinkedInPost.created_at.desc(),
+            LinkedInPost.id.desc()
+        ).limit(limit + 1).all()
+        
+        has_more = len(posts) > limit
+        posts = posts[:limit]
+        next_cursor = _encode_cursor(posts[-1]) if has_more else None
+        
+        # Récupérer les analytics des posts publiés en une seule vague
+        linkedin_user = get_linkedin_account(user_id)
+        analytics_by_post = {}
+        if linkedin_user:
+            published = [post for post in posts if post.status == 'published' and post.linkedin_post_id]
+            if published:
+                linkedin_service = LinkedInService(linkedin_user.access_token)
+                analytics_by_post = linkedin_service.get_bulk_post_analytics(
+                    [post.linkedin_post_id for post in published]
+                )
         
         posts_data = []
         for post in posts:
-            post_data = post.to_dict()
-            
-            # Ajouter les analytics si le post est publié
-            if post.status == 'published' and post.linkedin_post_id and linkedin_user:
-                analytics = linkedin_service.get_post_analytics(post.linkedin_post_id)
-                post_data['analytics'] = analytics
-            
+            post_data = post.to_summary_dict(summary_fields) if summary_fields else post.to_dict()
+            if post.linkedin_post_id in analytics_by_post:
+                post_data['analytics'] = analytics_by_post[post.linkedin_post_id]
             posts_data.append(post_data)
         
-        return jsonify({
+        # Lecture seule : l'écriture des métriques passe par POST /analytics/refresh
+        result = {
             'success': True,
             'posts': posts_data,
-            'total': len(posts_data)
+            'total': len(posts_data),
+            'nextCursor': next_cursor,
+            'hasMore': has_more
+        }
+        if include_total:
+            result['totalCount'] = total_count
+        
+        response = jsonify(result)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+        
+    except Exception as e:
+        logger.error("Erreur récupération posts: %s", e)
+        return jsonify({'error': str(e)}), 500
+
+@linkedin_content_bp.route('/posts/<int:post_id>/status', methods=['GET'])
+@query_budget(3)
+def get_post_status(post_id):
+    """Suivre l'état de publication d'un post"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Non authentifié'}), 401
+    
+    user_id = session['user_id']
+    
+    try:
+        post = LinkedInPost.query.filter_by(id=post_id, user_id=user_id).first()
+        if not post:
+            return jsonify({'error': 'Post introuvable'}), 404
+        
+        outbox_entry = PublishOutbox.query.filter_by(post_id=post.id).order_by(PublishOutbox.id.desc()).first()
+        
+        return jsonify({
+            'success': True,
+            'postId': post.id,
+            'status': post.status,
+            'linkedinPostId': post.linkedin_post_id,
+            'publishedAt': post.published_at.isoformat() if post.published_at else None,
+            'outbox': outbox_entry.to_dict() if outbox_entry else None
         })
         
     except Exception as e:
-        logger.error(f"Erreur récupération posts: {str(e)}")
+        logger.error("Erreur statut post: %s", e)
+        return jsonify({'error': str(e)}), 500
+
+@linkedin_content_bp.route('/posts/<int:post_id>/metrics/history', methods=['GET'])
+@query_budget(3)
+def get_post_metrics_history(post_id):
+    """Historique des métriques d'un post (colonnes parallèles)"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Non authentifié'}), 401
+    
+    user_id = session['user_id']
+    
+    try:
+        post = db.session.query(LinkedInPost.id).filter_by(id=post_id, user_id=user_id).first()
+        if not post:
+            return jsonify({'error': 'Post introuvable'}), 404
+        
+        since = request.args.get('since')
+        series = get_post_series(post_id, since=datetime.fromisoformat(since.replace('Z', '')) if since else None)
+        
+        return jsonify({
+            'success': True,
+            'postId': post_id,
+            'series': series,
+            'points': len(series['timestamps'])
+        })
+        
+    except ValueError:
+        return jsonify({'error': 'Format de date invalide'}), 400
+    except Exception as e:
+        logger.error("Erreur historique métriques: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @linkedin_content_bp.route('/posts/<int:post_id>', methods=['DELETE'])
+@query_budget(6)
 def delete_post(post_id):
     """Supprimer un post"""
     if 'user_id' not in session:
@@ -253,17 +484,18 @@ def delete_post(post_id):
         db.session.delete(post)
         db.session.commit()
         
-        logger.info(f"🗑️ Post {post_id} supprimé (user {user_id})")
+        logger.info("🗑️ Post %s supprimé (user %s)", post_id, user_id)
         return jsonify({
             'success': True,
             'message': 'Post supprimé avec succès'
         })
         
     except Exception as e:
-        logger.error(f"Erreur suppression post: {str(e)}")
+        logger.error("Erreur suppression post: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @linkedin_content_bp.route('/posts/<int:post_id>', methods=['PUT'])
+@query_budget(5)
 def update_post(post_id):
     """Modifier un post"""
     if 'user_id' not in session:
@@ -278,7 +510,7 @@ def update_post(post_id):
             return jsonify({'error': 'Post introuvable'}), 404
         
         # Seuls les posts non publiés peuvent être modifiés
-        if post.status == 'published':
+        if post.status in ('published', 'publishing'):
             return jsonify({'error': 'Impossible de modifier un post publié'}), 400
         
         # Mettre à jour les champs autorisés
@@ -294,7 +526,7 @@ def update_post(post_id):
         post.updated_at = datetime.utcnow()
         db.session.commit()
         
-        logger.info(f"✏️ Post {post_id} modifié (user {user_id})")
+        logger.info("✏️ Post %s modifié (user %s)", post_id, user_id)
         return jsonify({
             'success': True,
             'message': 'Post modifié avec succès',
@@ -302,22 +534,41 @@ def update_post(post_id):
         })
         
     except Exception as e:
-        logger.error(f"Erreur modification post: {str(e)}")
+        logger.error("Erreur modification post: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @linkedin_content_bp.route('/templates', methods=['GET'])
+@query_budget(2)
 def get_templates():
-    """Récupérer les templates de contenu"""
+    """Récupérer les templates de contenu (catalogue en mémoire, revalidation par ETag)"""
+    category = request.args.get('category')
+    tag = request.args.get('tag')
+    
     try:
-        templates = ContentTemplate.query.filter_by(is_active=True).order_by(ContentTemplate.usage_count.desc()).all()
+        snapshot = template_catalogue.snapshot()
+        unseen = template_usage.unseen()
         
-        return jsonify({
+        # Classement sur la vue tamponnée (instantané + incréments de ce worker)
+        templates = [
+            {**template, 'usageCount': (template['usageCount'] or 0) + unseen.get(template['id'], 0)}
+            for template in template_catalogue.list_active(category=category, tag=tag)
+        ]
+        templates.sort(key=lambda template: template['usageCount'], reverse=True)
+        
+        etag = catalogue_etag(snapshot, templates)
+        if etag_matches(etag):
+            return not_modified(etag, 'no-cache')
+        
+        response = jsonify({
             'success': True,
-            'templates': [template.to_dict() for template in templates]
+            'templates': templates
         })
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
         
     except Exception as e:
-        logger.error(f"Erreur récupération templates: {str(e)}")
+        logger.error("Erreur récupération templates: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @linkedin_content_bp.route('/news', methods=['GET'])
@@ -338,10 +589,11 @@ def get_news():
         return jsonify(result)
         
     except Exception as e:
-        logger.error(f"Erreur récupération actualités: {str(e)}")
+        logger.error("Erreur récupération actualités: %s", e)
         return jsonify({'error': str(e)}), 500
 
 @linkedin_content_bp.route('/analytics', methods=['GET'])
+@query_budget(5)
 def get_analytics():
     """Récupérer les analytics des posts LinkedIn"""
     if 'user_id' not in session:
@@ -350,39 +602,120 @@ def get_analytics():
     user_id = session['user_id']
     
     try:
-        # Statistiques générales
-        total_posts = LinkedInPost.query.filter_by(user_id=user_id, status='published').count()
-        scheduled_posts = LinkedInPost.query.filter_by(user_id=user_id, status='scheduled').count()
+        summary_fields = _parse_summary_fields()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    try:
+        # Agrégats maintenus incrémentalement (une lecture par clé primaire)
+        rollup = db.session.get(UserPostRollup, user_id)
+        if not rollup:
+            # Pas encore de ligne (aucun post depuis la migration) : calcul en
+            # lecture seule, la ligne est créée par le premier delta
+            rollup = compute_user_rollup(user_id)
+        
+        etag = make_etag('analytics', user_id, request.query_string, rollup.to_dict(), _posts_version(user_id, 'published'))
+        if etag_matches(etag):
+            return not_modified(etag)
         
         # Posts récents avec analytics
-        recent_posts = LinkedInPost.query.filter_by(
+        query = LinkedInPost.query.filter_by(
             user_id=user_id, 
             status='published'
-        ).order_by(LinkedInPost.published_at.desc()).limit(10).all()
+        )
+        if summary_fields:
+            query = query.options(*LinkedInPost.summary_options(summary_fields))
+        recent_posts = query.order_by(LinkedInPost.published_at.desc()).limit(10).all()
+        
+        response = jsonify({
+            'success': True,
+            'overview': rollup.to_dict(),
+            'recentPosts': [
+                post.to_summary_dict(summary_fields) if summary_fields else post.to_dict()
+                for post in recent_posts
+            ]
+        })
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+        
+    except Exception as e:
+        logger.error("Erreur récupération analytics: %s", e)
+        return jsonify({'error': str(e)}), 500
+
+@linkedin_content_bp.route('/analytics/history', methods=['GET'])
+@query_budget(2)
+def get_analytics_history():
+    """Courbe d'engagement agrégée de l'utilisateur"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Non authentifié'}), 401
+    
+    user_id = session['user_id']
+    resolution = request.args.get('resolution', 'day')
+    
+    if resolution not in ('hour', 'day'):
+        return jsonify({'error': 'Résolution invalide (hour ou day)'}), 400
+    
+    try:
+        since = request.args.get('since')
+        series = get_user_series(
+            user_id,
+            resolution=resolution,
+            since=datetime.fromisoformat(since.replace('Z', '')) if since else None
+        )
+        
+        return jsonify({
+            'success': True,
+            'resolution': resolution,
+            'series': series,
+            'points': len(series['timestamps'])
+        })
+        
+    except ValueError:
+        return jsonify({'error': 'Format de date invalide'}), 400
+    except Exception as e:
+        logger.error("Erreur historique analytics: %s", e)
+        return jsonify({'error': str(e)}), 500
+
+@linkedin_content_bp.route('/analytics/refresh', methods=['POST'])
+@query_budget(8)
+def refresh_analytics():
+    """Rafraîchir les métriques de tous les posts publiés depuis LinkedIn"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Non authentifié'}), 401
+    
+    user_id = session['user_id']
+    
+    try:
+        linkedin_user = get_linkedin_account(user_id)
+        if not linkedin_user:
+            return jsonify({'error': 'LinkedIn non connecté'}), 400
         
-        # Calculer les métriques totales (simulation)
-        total_likes = sum(post.likes_count for post in recent_posts)
-        total_comments = sum(post.comments_count for post in recent_posts)
-        total_shares = sum(post.shares_count for post in recent_posts)
-        total_views = sum(post.views_count for post in recent_posts)
+        # Charger uniquement les identifiants, pas les lignes complètes
+        rows = db.session.query(LinkedInPost.id, LinkedInPost.linkedin_post_id).filter(
+            LinkedInPost.user_id == user_id,
+            LinkedInPost.status == 'published',
+            LinkedInPost.linkedin_post_id.isnot(None)
+        ).all()
         
-        # Calculs d'engagement
-        avg_engagement = ((total_likes + total_comments + total_shares) / max(total_views, 1)) * 100 if total_views > 0 else 0
+        linkedin_service = LinkedInService(linkedin_user.access_token)
+        analytics_by_post = linkedin_service.get_bulk_post_analytics(
+            [linkedin_post_id for _, linkedin_post_id in rows]
+        )
+        
+        updated = _save_post_metrics(
+            user_id,
+            [(post_id, analytics_by_post.get(linkedin_post_id)) for post_id, linkedin_post_id in rows]
+        )
         
+        logger.info("🔄 Métriques rafraîchies: %s/%s posts (user %s)", updated, len(rows), user_id)
         return jsonify({
             'success': True,
-            'overview': {
-                'totalPosts': total_posts,
-                'scheduledPosts': scheduled_posts,
-                'totalLikes': total_likes,
-                'totalComments': total_comments,
-                'totalShares': total_shares,
-                'totalViews': total_views,
-                'avgEngagement': round(avg_engagement, 2)
-            },
-            'recentPosts': [post.to_dict() for post in recent_posts]
+            'requested': len(rows),
+            'updated': updated
         })
         
     except Exception as e:
-        logger.error(f"Erreur récupération analytics: {str(e)}")
+        db.session.rollback()
+        logger.error("Erreur rafraîchissement analytics: %s", e)
         return jsonify({'error': str(e)}), 500
@@ -0,0 +1,264 @@
+from flask import Blueprint, request, session, jsonify, Response, stream_with_context, current_app
+import io
+import csv
+import json
+import codecs
+from datetime import datetime
+from sqlalchemy import select, insert
+from models.linkedin_models import LinkedInPost, rebuild_user_rollup
+from services.identity import get_linkedin_account
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Créer le blueprint
+linkedin_export_bp = Blueprint('linkedin_export', __name__, url_prefix='/api/linkedin')
+
+EXPORT_FORMATS = ('jsonl', 'csv')
+# Lignes lues par aller-retour avec le curseur serveur
+EXPORT_BATCH_SIZE = 1000
+# Lignes par INSERT groupé à l'import
+IMPORT_BATCH_SIZE = 1000
+# Limite de LinkedIn pour le texte d'un post
+MAX_CONTENT_LENGTH = 3000
+MAX_REPORTED_ERRORS = 100
+
+# Champ exporté -> colonne (ordre des colonnes CSV)
+EXPORT_FIELDS = (
+    ('id', LinkedInPost.id),
+    ('status', LinkedInPost.status),
+    ('content', LinkedInPost.content),
+    ('tone', LinkedInPost.tone),
+    ('hashtags', LinkedInPost.hashtags),
+    ('linkedinPostId', LinkedInPost.linkedin_post_id),
+    ('publishedAt', LinkedInPost.published_at),
+    ('scheduledFor', LinkedInPost.scheduled_for),
+    ('likes', LinkedInPost.likes_count),
+    ('comments', LinkedInPost.comments_count),
+    ('shares', LinkedInPost.shares_count),
+    ('views', LinkedInPost.views_count),
+    ('generatedByAi', LinkedInPost.generated_by_ai),
+    ('createdAt', LinkedInPost.created_at),
+    ('updatedAt', LinkedInPost.updated_at)
+)
+EXPORT_HEADER = [name for name, _ in EXPORT_FIELDS]
+
+def init_linkedin_export_routes(db_instance):
+    global db
+    db = db_instance
+
+def _export_record(row):
+    """Ligne SQL -> dict sérialisable (dates ISO)"""
+    record = {}
+    for name, value in zip(EXPORT_HEADER, row):
+        record[name] = value.isoformat() if isinstance(value, datetime) else value
+    return record
+
+def _csv_line(writer, buffer, values):
+    """Écrire une ligne CSV dans le tampon réutilisé et la renvoyer"""
+    buffer.seek(0)
+    buffer.truncate()
+    writer.writerow(values)
+    return buffer.getvalue()
+
+def _parse_hashtags(value):
+    """Hashtags d'import : liste JSON, ou chaîne 'a, b' / '["a"]' (CSV)"""
+    if value in (None, ''):
+        return []
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith('['):
+            value = json.loads(value)
+        else:
+            value = [tag for tag in value.replace(',', ' ').split() if tag]
+    if not isinstance(value, list) or not all(isinstance(tag, str) for tag in value):
+        raise ValueError('hashtags doit être une liste de chaînes')
+    return [tag if tag.startswith('#') else f'#{tag}' for tag in value]
+
+def _validate_import_record(record):
+    """
+    Valider une ligne d'import et la convertir en colonnes de brouillon
+    
+    Raises:
+        ValueError: Ligne invalide
+    """
+    if not isinstance(record, dict):
+        raise ValueError('objet attendu')
+    
+    content = record.get('content')
+    if not isinstance(content, str) or not content.strip():
+        raise ValueError('content requis')
+    if len(content) > MAX_CONTENT_LENGTH:
+        raise ValueError(f'content dépasse {MAX_CONTENT_LENGTH} caractères')
+    
+    tone = record.get('tone') or None
+    if tone is not None and (not isinstance(tone, str) or len(tone) > 50):
+        raise ValueError('tone invalide')
+    
+    return {
+        'content': content.strip(),
+        'tone': tone,
+        'hashtags': _parse_hashtags(record.get('hashtags'))
+    }
+
+def _iter_import_records(stream, import_format):
+    """Itérer (numéro de ligne, enregistrement) sans charger le fichier en mémoire"""
+    text = codecs.getreader('utf-8-sig')(stream)
+    
+    if import_format == 'csv':
+        reader = csv.DictReader(text)
+        for record in reader:
+            yield reader.line_num, record
+        return
+    
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, ValueError(f'JSON invalide: {e.msg}')
+
+@linkedin_export_bp.route('/posts/export', methods=['GET'])
+def export_posts():
+    """Exporter tout l'historique des posts (JSONL ou CSV) en flux, mémoire constante"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Non authentifié'}), 401
+    
+    user_id = session['user_id']
+    export_format = request.args.get('format', 'jsonl').lower()
+    status_filter = request.args.get('status')
+    
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"Format invalide, attendu: {', '.join(EXPORT_FORMATS)}"}), 400
+    
+    query = select(*[column for _, column in EXPORT_FIELDS]).where(LinkedInPost.user_id == user_id)
+    if status_filter:
+        query = query.where(LinkedInPost.status == status_filter)
+    # Ordre stable servi par l'index (user_id, created_at, id)
+    query = query.order_by(LinkedInPost.created_at, LinkedInPost.id)
+    
+    def generate():
+        # Curseur côté serveur : les lignes arrivent par lots de EXPORT_BATCH_SIZE
+        result = db.session.execute(query.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        
+        if export_format == 'csv':
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            yield _csv_line(writer, buffer, EXPORT_HEADER)
+            for partition in result.partitions():
+                yield ''.join(
+                    _csv_line(writer, buffer, [
+                        json.dumps(value, ensure_ascii=False) if isinstance(value, list) else value
+                        for value in _export_record(row).values()
+                    ])
+                    for row in partition
+                )
+        else:
+            # Provider de l'application (orjson si installé), ordre des colonnes conservé
+            dumps = current_app.json.dumps
+            for partition in result.partitions():
+                yield ''.join(
+                    dumps(_export_record(row), sort_keys=False) + '\n'
+                    for row in partition
+                )
+    
+    filename = f"privalead-posts-{datetime.utcnow().strftime('%Y%m%d')}.{export_format}"
+    logger.info("📦 Export %s demandé (user %s)", export_format, user_id)
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/csv' if export_format == 'csv' else 'application/x-ndjson',
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
+@linkedin_export_bp.route('/posts/import', methods=['POST'])
+def import_posts():
+    """
+    Importer des brouillons en masse (JSONL ou CSV)
+    
+    Fichier multipart 'file' ou corps brut. Les lignes invalides sont
+    ignorées et signalées ; les valides sont insérées par INSERT groupés.
+    """
+    if 'user_id' not in session:
+        return jsonify({'error': 'Non authentifié'}), 401
+    
+    user_id = session['user_id']
+    
+    upload = request.files.get('file')
+    if upload:
+        stream = upload.stream
+        default_format = 'csv' if (upload.filename or '').lower().endswith('.csv') else 'jsonl'
+    else:
+        stream = request.stream
+        default_format = 'csv' if request.mimetype == 'text/csv' else 'jsonl'
+    import_format = request.args.get('format', default_format).lower()
+    
+    if import_format not in EXPORT_FORMATS:
+        return jsonify({'error': f"Format invalide, attendu: {', '.join(EXPORT_FORMATS)}"}), 400
+    
+    linkedin_user = get_linkedin_account(user_id)
+    if not linkedin_user:
+        return jsonify({'error': 'LinkedIn non connecté'}), 400
+    
+    imported = 0
+    rejected = 0
+    errors = []
+    batch = []
+    now = datetime.utcnow()
+    statement = insert(LinkedInPost)
+    
+    def flush_batch():
+        # executemany : un aller-retour par lot, sans objets ORM
+        db.session.execute(statement, batch)
+        batch.clear()
+    
+    try:
+        for line_number, record in _iter_import_records(stream, import_format):
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                values = _validate_import_record(record)
+            except ValueError as e:
+                rejected += 1
+                if len(errors) < MAX_REPORTED_ERRORS:
+                    errors.append({'line': line_number, 'error': str(e)})
+                continue
+            
+            batch.append({
+                **values,
+                'user_id': user_id,
+                'linkedin_user_id': linkedin_user.id,
+                'status': 'draft',
+                'generated_by_ai': False,
+                'created_at': now,
+                'updated_at': now
+            })
+            imported += 1
+            
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                flush_batch()
+        
+        if batch:
+            flush_batch()
+        
+        # L'INSERT groupé ne passe pas par les événements ORM
+        if imported:
+            rebuild_user_rollup(user_id)
+        db.session.commit()
+    
+    except UnicodeDecodeError:
+        db.session.rollback()
+        return jsonify({'error': 'Le fichier doit être encodé en UTF-8'}), 400
+    except Exception as e:
+        db.session.rollback()
+        logger.error("Erreur import posts: %s", e)
+        return jsonify({'error': str(e)}), 500
+    
+    logger.info("📥 Import %s: %s brouillons, %s lignes rejetées (user %s)", import_format, imported, rejected, user_id)
+    return jsonify({
+        'success': True,
+        'imported': imported,
+        'rejected': rejected,
+        'errors': errors,
+        'errorsTruncated': rejected > len(errors)
+    })
@@ -27,11 +27,11 @@ def get_news():
         else:
             articles = news_service.get_by_sector(sector, language=language)
         
-        logger.info(f"News retrieved: {len(articles)} articles")
+        logger.info("News retrieved: %s articles", len(articles))
         return jsonify({"articles": articles})
         
     except Exception as e:
-        logger.error(f"News retrieval error: {str(e)}")
+        logger.error("News retrieval error: %s", e)
         return jsonify({"error": str(e)}), 500
 
 @news_bp.route('/trending', methods=['GET'])
@@ -50,5 +50,5 @@ def get_trending_news():
         return jsonify({"trending": trending})
         
     except Exception as e:
-        logger.error(f"Trending news error: {str(e)}")
+        logger.error("Trending news error: %s", e)
         return jsonify({"error": str(e)}), 500
@@ -81,11 +81,11 @@ def generate_post():
                 sector=user.secteur
             )
         
-        logger.info(f"Post generated for user {user.email}")
+        logger.info("Post generated for user %s", user.email)
         return jsonify({"draft": draft})
         
     except Exception as e:
-        logger.error(f"Post generation error: {str(e)}")
+        logger.error("Post generation error: %s", e)
         return jsonify({"error": f"Erreur de génération: {str(e)}"}), 500
 
 @posts_bp.route('/publish', methods=['POST'])
@@ -131,7 +131,7 @@ def publish_post():
                 db.session.add(post)
                 db.session.commit()
                 
-                logger.info(f"Post published for user {user.email}")
+                logger.info("Post published for user %s", user.email)
                 return jsonify({"success": True, "message": "Post publié avec succès"})
             else:
                 return jsonify({"error": "Erreur lors de la publication LinkedIn"}), 500
@@ -147,11 +147,11 @@ def publish_post():
             db.session.add(post)
             db.session.commit()
             
-            logger.info(f"Post scheduled for user {user.email}")
+            logger.info("Post scheduled for user %s", user.email)
             return jsonify({"success": True, "message": "Post programmé avec succès"})
             
     except Exception as e:
-        logger.error(f"Post publish error: {str(e)}")
+        logger.error("Post publish error: %s", e)
         return jsonify({"error": str(e)}), 500
 
 @posts_bp.route('/', methods=['DELETE'])
@@ -172,9 +172,9 @@ def delete_post(post_id):
         db.session.delete(post)
         db.session.commit()
         
-        logger.info(f"Post {post_id} deleted by user {user.email}")
+        logger.info("Post %s deleted by user %s", post_id, user.email)
         return jsonify({"success": True, "message": "Post supprimé avec succès"})
         
     except Exception as e:
-        logger.error(f"Post deletion error: {str(e)}")
+        logger.error("Post deletion error: %s", e)
         return jsonify({"error": "Erreur lors de la suppression"}), 500
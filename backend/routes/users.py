@@ -39,7 +39,7 @@ def update_user_profile():
     
     try:
         db.session.commit()
-        logger.info(f"Profile updated for user {user.email}")
+        logger.info("Profile updated for user %s", user.email)
         return jsonify({
             "success": True, 
             "user": user.to_dict(),
@@ -47,7 +47,7 @@ def update_user_profile():
         })
     except Exception as e:
         db.session.rollback()
-        logger.error(f"Profile update error: {str(e)}")
+        logger.error("Profile update error: %s", e)
         return jsonify({"error": "Erreur lors de la mise à jour"}), 500
 
 @users_bp.route('/stats', methods=['GET'])
@@ -1,6 +1,16 @@
-from .gemini_service import GeminiService
-from .linkedin_service import LinkedInService
-from .news_service import NewsService
+import importlib
+
+# Import paresseux : `import services.x` ne charge plus tous les services
+_EXPORTS = {
+    'GeminiService': '.gemini_service',
+    'LinkedInService': '.linkedin_service',
+    'NewsService': '.news_service'
+}
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     'GeminiService',
@@ -0,0 +1,123 @@
+import re
+from typing import Dict, List
+
+# Un seul motif alterné : mentions @[Nom](URL), liens http(s) et hashtags.
+# L'ordre des alternatives compte : une mention est reconnue avant l'URL
+# qu'elle contient.
+TOKEN_PATTERN = re.compile(
+    r'@\[(?P<mention_name>[^\]]*)\]\((?P<mention_url>[^)]*)\)'
+    r'|(?P<url>https?://[^\s<>()]+)'
+    r'|(?<![\w#])#(?P<hashtag>\w+)'
+)
+
+# Ponctuation finale à ne pas inclure dans une URL ("voir https://x.fr.")
+URL_TRAILING_PUNCTUATION = '.,;:!?\'"'
+
+
+def render_content(content: str) -> Dict:
+    """
+    Analyser le contenu d'un post en une seule passe
+
+    Remplace les mentions @[Nom](URL) par @Nom et calcule les positions
+    des entités directement dans le texte final, tout en extrayant les
+    hashtags et les liens. 'sourceMentions' donne les mêmes entités avec
+    leurs positions dans le contenu brut, celui qui est enregistré en base.
+
+    Args:
+        content: Contenu brut du post
+
+    Returns:
+        Dict avec 'text', 'mentions' (entités LinkedIn), 'sourceMentions',
+        'hashtags' et 'urls'
+    """
+    if not content:
+        return {'text': content or '', 'mentions': [], 'sourceMentions': [], 'hashtags': [], 'urls': []}
+
+    parts: List[str] = []
+    mentions: List[Dict] = []
+    source_mentions: List[Dict] = []
+    hashtags: List[str] = []
+    urls: List[str] = []
+    seen_hashtags = set()
+    seen_urls = set()
+
+    # Position courante dans le contenu source et longueur du texte produit
+    cursor = 0
+    output_length = 0
+
+    for match in TOKEN_PATTERN.finditer(content):
+        start = match.start()
+        if start > cursor:
+            parts.append(content[cursor:start])
+            output_length += start - cursor
+
+        if match.group('mention_url') is not None:
+            name = match.group('mention_name')
+            url = match.group('mention_url')
+            linkedin_id = url.rstrip('/').split('/')[-1]
+            replacement = f"@{name}"
+            mentions.append({
+                "entity": f"urn:li:person:{linkedin_id}",
+                "textRange": {
+                    "start": output_length,
+                    "length": len(replacement)
+                }
+            })
+            source_mentions.append({
+                "entity": f"urn:li:person:{linkedin_id}",
+                "textRange": {
+                    "start": start,
+                    "length": match.end() - start
+                }
+            })
+            parts.append(replacement)
+            output_length += len(replacement)
+            cursor = match.end()
+            continue
+
+        token = match.group(0)
+        if match.group('url') is not None:
+            url = token.rstrip(URL_TRAILING_PUNCTUATION)
+            if url not in seen_urls:
+                seen_urls.add(url)
+                urls.append(url)
+            # La ponctuation retirée reste dans le texte tel quel
+        else:
+            hashtag = f"#{match.group('hashtag')}"
+            key = hashtag.lower()
+            if key not in seen_hashtags:
+                seen_hashtags.add(key)
+                hashtags.append(hashtag)
+
+        parts.append(token)
+        output_length += len(token)
+        cursor = match.end()
+
+    if cursor < len(content):
+        parts.append(content[cursor:])
+
+    return {
+        'text': ''.join(parts),
+        'mentions': mentions,
+        'sourceMentions': source_mentions,
+        'hashtags': hashtags,
+        'urls': urls
+    }
+
+
+def merge_hashtags(*hashtag_lists: List[str]) -> List[str]:
+    """Fusionner des listes de hashtags sans doublons (insensible à la casse)"""
+    merged = []
+    seen = set()
+    for hashtags in hashtag_lists:
+        for tag in hashtags or []:
+            tag = tag.strip()
+            if not tag:
+                continue
+            if not tag.startswith('#'):
+                tag = f"#{tag}"
+            key = tag.lower()
+            if key not in seen:
+                seen.add(key)
+                merged.append(tag)
+    return merged
@@ -1,15 +1,60 @@
 import os
 import logging
+import threading
 from typing import Dict, Any, Optional
+from services.lazy_imports import module_available, load_module
+from metrics import observe_upstream
+from services.usage_ledger import usage_ledger
 
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
+# Le SDK (protobuf, grpc) coûte près d'une seconde à l'import : il n'est
+# chargé qu'à la création du premier modèle
+GEMINI_SDK = 'google.generativeai'
+GEMINI_AVAILABLE = module_available(GEMINI_SDK)
+GEMINI_MODEL = "gemini-1.5-pro"
 
 logger = logging.getLogger(__name__)
 
+# Meilleurs moments de publication par industrie (simulation)
+OPTIMAL_POSTING_TIMES = {
+    'tech': {
+        'days': ['tuesday', 'wednesday', 'thursday'],
+        'hours': [9, 14, 17],
+        'best': 'tuesday_09:00'
+    },
+    'marketing': {
+        'days': ['monday', 'tuesday', 'wednesday'],
+        'hours': [8, 13, 16],
+        'best': 'tuesday_13:00'
+    },
+    'finance': {
+        'days': ['tuesday', 'wednesday', 'thursday'],
+        'hours': [8, 12, 15],
+        'best': 'wednesday_08:00'
+    },
+    'default': {
+        'days': ['tuesday', 'wednesday'],
+        'hours': [9, 14],
+        'best': 'tuesday_09:00'
+    }
+}
+
+# genai.configure modifie un état global du SDK : le configurer une seule
+# fois par processus et partager le modèle entre threads
+_model_lock = threading.Lock()
+_shared_models = {}
+
+def _get_shared_model(api_key: str):
+    """Modèle Gemini du processus, créé au premier appel"""
+    with _model_lock:
+        model = _shared_models.get(api_key)
+        if model is None:
+            genai = load_module(GEMINI_SDK)
+            genai.configure(api_key=api_key)
+            model = genai.GenerativeModel(GEMINI_MODEL)
+            _shared_models[api_key] = model
+            logger.info("✅ Gemini AI initialisé avec succès")
+        return model
+
 class GeminiService:
     """Service pour la génération de contenu avec Google Gemini AI"""
     
@@ -25,14 +70,13 @@ class GeminiService:
             self.simulation_mode = True
         else:
             try:
-                genai.configure(api_key=self.api_key)
-                self.model = genai.GenerativeModel("gemini-1.5-pro")
+                self.model = _get_shared_model(self.api_key)
                 self.simulation_mode = False
-                logger.info("✅ Gemini AI initialisé avec succès")
             except Exception as e:
-                logger.error(f"❌ Erreur initialisation Gemini: {e}")
+                logger.error("❌ Erreur initialisation Gemini: %s", e)
                 self.simulation_mode = True
     
+    @observe_upstream
     def generate_linkedin_post(
         self, 
         prompt: str, 
@@ -60,11 +104,46 @@ class GeminiService:
         try:
             linkedin_prompt = self._build_linkedin_prompt(prompt, tone, industry, user_context, article_context)
             response = self.model.generate_content(linkedin_prompt)
+            self._record_usage('post', response)
             return response.text.strip()
         except Exception as e:
-            logger.error(f"Erreur génération Gemini: {str(e)}")
+            logger.error("Erreur génération Gemini: %s", e)
             return self._simulate_linkedin_generation(prompt, tone, industry, user_context, article_context)
     
+    @observe_upstream
+    async def generate_linkedin_post_async(
+        self,
+        prompt: str,
+        tone: str = "professionnel",
+        industry: str = "general",
+        user_context: dict = None,
+        article_context: dict = None
+    ) -> str:
+        """Variante async de generate_linkedin_post (client async du SDK)"""
+        if self.simulation_mode:
+            return self._simulate_linkedin_generation(prompt, tone, industry, user_context, article_context)
+        
+        try:
+            linkedin_prompt = self._build_linkedin_prompt(prompt, tone, industry, user_context, article_context)
+            response = await self.model.generate_content_async(linkedin_prompt)
+            self._record_usage('post', response)
+            return response.text.strip()
+        except Exception as e:
+            logger.error("Erreur génération Gemini: %s", e)
+            return self._simulate_linkedin_generation(prompt, tone, industry, user_context, article_context)
+    
+    def _record_usage(self, operation: str, response):
+        """Tokens de l'appel (usage_metadata du SDK) ajoutés au registre, écrit par lots"""
+        usage = getattr(response, 'usage_metadata', None)
+        if usage is None:
+            return
+        usage_ledger.record(
+            operation,
+            GEMINI_MODEL,
+            getattr(usage, 'prompt_token_count', 0) or 0,
+            getattr(usage, 'candidates_token_count', 0) or 0
+        )
+    
     def _build_linkedin_prompt(
         self, 
         prompt: str, 
@@ -183,7 +262,7 @@ Commencez directement par l'accroche, sans titre ni introduction.
         article_context: dict = None
     ) -> str:
         """Mode simulation pour les tests et développement"""
-        logger.info(f"🤖 Simulation génération LinkedIn: {prompt[:50]}... (ton: {tone})")
+        logger.info("🤖 Simulation génération LinkedIn: %s... (ton: %s)", prompt[:50], tone)
         
         user_name = user_context.get('name', 'Expert') if user_context else 'Expert'
         
@@ -256,7 +335,28 @@ Et vous, comment abordez-vous ce défi au quotidien ?
             return self._simulate_hashtags(content, industry)
         
         try:
-            hashtag_prompt = f"""
+            response = self.model.generate_content(self._build_hashtag_prompt(content, industry))
+            self._record_usage('hashtags', response)
+            return self._parse_hashtags(response.text)
+        except Exception as e:
+            logger.error("Erreur génération hashtags: %s", e)
+            return self._simulate_hashtags(content, industry)
+    
+    async def generate_hashtags_async(self, content: str, industry: str) -> list:
+        """Variante async de generate_hashtags"""
+        if self.simulation_mode:
+            return self._simulate_hashtags(content, industry)
+        
+        try:
+            response = await self.model.generate_content_async(self._build_hashtag_prompt(content, industry))
+            self._record_usage('hashtags', response)
+            return self._parse_hashtags(response.text)
+        except Exception as e:
+            logger.error("Erreur génération hashtags: %s", e)
+            return self._simulate_hashtags(content, industry)
+    
+    def _build_hashtag_prompt(self, content: str, industry: str) -> str:
+        return f"""
 Analysez ce contenu LinkedIn et générez 5-7 hashtags pertinents :
 
 Contenu: {content[:200]}...
@@ -270,12 +370,10 @@ Règles:
 
 Format: liste de hashtags séparés par des virgules, sans le #
 """
-            response = self.model.generate_content(hashtag_prompt)
-            hashtags = [f"#{tag.strip()}" for tag in response.text.strip().split(',')]
-            return hashtags[:7]  # Limiter à 7 hashtags
-        except Exception as e:
-            logger.error(f"Erreur génération hashtags: {e}")
-            return self._simulate_hashtags(content, industry)
+    
+    def _parse_hashtags(self, text: str) -> list:
+        hashtags = [f"#{tag.strip()}" for tag in text.strip().split(',')]
+        return hashtags[:7]  # Limiter à 7 hashtags
     
     def _simulate_hashtags(self, content: str, industry: str) -> list:
         """Simulation de génération de hashtags"""
@@ -297,31 +395,7 @@ Format: liste de hashtags séparés par des virgules, sans le #
     
     def optimize_posting_time(self, industry: str, user_timezone: str = 'Europe/Paris') -> dict:
         """Suggérer le meilleur moment pour publier"""
-        # Simulation des meilleurs moments par industrie
-        optimal_times = {
-            'tech': {
-                'days': ['tuesday', 'wednesday', 'thursday'],
-                'hours': [9, 14, 17],
-                'best': 'tuesday_09:00'
-            },
-            'marketing': {
-                'days': ['monday', 'tuesday', 'wednesday'],
-                'hours': [8, 13, 16],
-                'best': 'tuesday_13:00'
-            },
-            'finance': {
-                'days': ['tuesday', 'wednesday', 'thursday'],
-                'hours': [8, 12, 15],
-                'best': 'wednesday_08:00'
-            },
-            'default': {
-                'days': ['tuesday', 'wednesday'],
-                'hours': [9, 14],
-                'best': 'tuesday_09:00'
-            }
-        }
-        
-        timing = optimal_times.get(industry, optimal_times['default'])
+        timing = OPTIMAL_POSTING_TIMES.get(industry, OPTIMAL_POSTING_TIMES['default'])
         
         return {
             'recommendedDays': timing['days'],
@@ -0,0 +1,50 @@
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from services.lazy_imports import module_available, load_module
+
+# httpx n'est importé qu'à la première vue async
+HTTPX_AVAILABLE = module_available('httpx')
+
+# Connexions conservées par hôte et par thread (keep-alive vers les API)
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 4))
+# Appels simultanés par client async (toutes requêtes en vol confondues)
+ASYNC_MAX_CONNECTIONS = int(os.getenv('ASYNC_HTTP_MAX_CONNECTIONS', 100))
+
+# threading.local devient local à la greenlet quand gevent patche le processus
+_local = threading.local()
+
+
+def get_http_session() -> requests.Session:
+    """
+    Session HTTP propre au thread courant
+    
+    requests.Session n'est pas garantie thread-safe : chaque thread (ou
+    greenlet) garde la sienne et réutilise ses connexions d'une requête à
+    l'autre au lieu d'ouvrir une connexion TLS par appel.
+    """
+    http = getattr(_local, 'session', None)
+    if http is None:
+        http = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_MAXSIZE)
+        http.mount('https://', adapter)
+        http.mount('http://', adapter)
+        _local.session = http
+    return http
+
+
+def async_http_client(max_connections: int = ASYNC_MAX_CONNECTIONS, timeout: float = 15.0):
+    """
+    Client HTTP asynchrone (httpx) borné en connexions
+    
+    Un client est lié à sa boucle d'événements : en créer un par vue async
+    et le fermer avec `async with`.
+    """
+    if not HTTPX_AVAILABLE:
+        raise RuntimeError("httpx non installé : vues async indisponibles")
+    httpx = load_module('httpx')
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        timeout=timeout
+    )
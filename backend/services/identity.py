@@ -0,0 +1,193 @@
+import os
+import time
+import sqlite3
+import tempfile
+import threading
+import logging
+from typing import Optional
+from flask import g, session
+from sqlalchemy import inspect
+from models.linkedin_models import LinkedInUser
+from metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+# Durée de vie du cache de processus (0 pour le désactiver)
+ACCOUNT_CACHE_TTL = float(os.getenv('LINKEDIN_ACCOUNT_CACHE_TTL', 30))
+# Base SQLite locale : les invalidations sont vues par tous les workers de l'instance
+ACCOUNT_INVALIDATION_DB = os.getenv('LINKEDIN_ACCOUNT_INVALIDATION_DB') or os.path.join(
+    tempfile.gettempdir(), 'privalead-accounts.sqlite3'
+)
+
+_MISSING = object()
+
+
+class LinkedInAccount:
+    """
+    Copie en lecture seule d'un LinkedInUser actif
+    
+    Détachée de toute session : elle peut être partagée entre requêtes et
+    threads. Les routes qui modifient le compte relisent le LinkedInUser.
+    """
+    
+    __slots__ = tuple(column.key for column in inspect(LinkedInUser).column_attrs)
+    
+    def __init__(self, linkedin_user):
+        for key in self.__slots__:
+            object.__setattr__(self, key, getattr(linkedin_user, key))
+    
+    def __setattr__(self, key, value):
+        raise AttributeError('LinkedInAccount est en lecture seule')
+    
+    def to_dict(self):
+        return LinkedInUser.to_dict(self)
+    
+    def __repr__(self):
+        return f'<LinkedInAccount {self.email}>'
+
+
+class InvalidationStore:
+    """
+    Dates d'invalidation des comptes, partagées entre workers
+    
+    Une entrée du cache de processus antérieure à la dernière invalidation
+    du compte est ignorée : connexion, déconnexion ou transfert du compte
+    dans un worker sont vus immédiatement par les autres workers de la même
+    instance. Entre instances distinctes, la fenêtre reste ACCOUNT_CACHE_TTL.
+    """
+    
+    def __init__(self, path: str = ACCOUNT_INVALIDATION_DB):
+        self.path = path
+        self._local = threading.local()
+        # Une connexion SQLite ne doit pas traverser le fork des workers
+        os.register_at_fork(after_in_child=self._reset)
+    
+    def _reset(self):
+        self._local = threading.local()
+    
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=2, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS account_invalidations '
+                '(user_id TEXT PRIMARY KEY, invalidated_at REAL NOT NULL)'
+            )
+            self._local.connection = connection
+        return connection
+    
+    def invalidated_since(self, user_id, cached_at: float) -> bool:
+        """Le compte a-t-il été invalidé depuis `cached_at` ? (oui en cas d'erreur)"""
+        try:
+            row = self._connection().execute(
+                'SELECT invalidated_at FROM account_invalidations WHERE user_id = ?', (str(user_id),)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("⚠️ Invalidations de comptes illisibles: %s", e)
+            return True
+        return row is not None and row[0] >= cached_at
+    
+    def invalidate(self, *user_ids):
+        now = time.time()
+        try:
+            self._connection().executemany(
+                'INSERT INTO account_invalidations (user_id, invalidated_at) VALUES (?, ?) '
+                'ON CONFLICT(user_id) DO UPDATE SET invalidated_at = excluded.invalidated_at',
+                [(str(user_id), now) for user_id in user_ids]
+            )
+        except sqlite3.Error as e:
+            # Les autres workers retombent sur l'expiration du cache
+            logger.error("Erreur invalidation partagée des comptes: %s", e)
+
+
+class AccountCache:
+    """
+    Cache de processus à durée de vie courte, indexé par user_id
+    
+    Chaque lecture vérifie aussi les invalidations partagées entre workers.
+    """
+    
+    def __init__(self, ttl: float, invalidations: InvalidationStore):
+        self.ttl = ttl
+        self.invalidations = invalidations
+        self._entries = {}
+        self._lock = threading.Lock()
+    
+    def get(self, user_id):
+        if self.ttl <= 0:
+            return _MISSING
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return _MISSING
+            expires_at, cached_at, account = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return _MISSING
+        if self.invalidations.invalidated_since(user_id, cached_at):
+            with self._lock:
+                self._entries.pop(user_id, None)
+            return _MISSING
+        return account
+    
+    def set(self, user_id, account: Optional[LinkedInAccount]):
+        if self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, time.time(), account)
+    
+    def invalidate(self, *user_ids):
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(user_id, None)
+        self.invalidations.invalidate(*user_ids)
+
+
+account_cache = AccountCache(ACCOUNT_CACHE_TTL, InvalidationStore())
+
+
+def get_linkedin_account(user_id) -> Optional[LinkedInAccount]:
+    """
+    Compte LinkedIn actif d'un utilisateur, résolu une seule fois par requête
+    
+    Ordre de recherche : g (requête courante), cache de processus, base.
+    L'absence de compte est aussi mise en cache.
+    """
+    accounts = g.setdefault('linkedin_accounts', {})
+    if user_id in accounts:
+        return accounts[user_id]
+    
+    account = account_cache.get(user_id)
+    record_cache('linkedin_account', account is not _MISSING)
+    if account is _MISSING:
+        linkedin_user = LinkedInUser.query.filter_by(user_id=user_id, is_active=True).first()
+        account = LinkedInAccount(linkedin_user) if linkedin_user else None
+        account_cache.set(user_id, account)
+    
+    accounts[user_id] = account
+    return account
+
+
+def current_linkedin_account() -> Optional[LinkedInAccount]:
+    """Compte LinkedIn actif de l'utilisateur de la session"""
+    user_id = session.get('user_id')
+    return get_linkedin_account(user_id) if user_id is not None else None
+
+
+def invalidate_linkedin_account(*user_ids):
+    """
+    À appeler après connexion, déconnexion ou renouvellement du token
+    
+    Invalide le cache de ce worker et, via InvalidationStore, celui des
+    autres workers de l'instance.
+    """
+    user_ids = [user_id for user_id in user_ids if user_id is not None]
+    if not user_ids:
+        return
+    account_cache.invalidate(*user_ids)
+    accounts = g.get('linkedin_accounts')
+    if accounts:
+        for user_id in user_ids:
+            accounts.pop(user_id, None)
+
@@ -0,0 +1,78 @@
+import os
+import time
+import threading
+import importlib
+import importlib.util
+import logging
+
+logger = logging.getLogger(__name__)
+
+# PREWARM_SERVICES=1 : charger les SDK lourds en arrière-plan dès le démarrage
+PREWARM_ENABLED = os.getenv('PREWARM_SERVICES', '0').lower() in ('1', 'true', 'yes')
+
+_lock = threading.Lock()
+_modules = {}
+_failures = {}
+
+
+def module_available(name: str) -> bool:
+    """Le module est installé, sans l'importer (seuls ses paquets parents le sont)"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def load_module(name: str):
+    """
+    Importer un module au premier usage
+    
+    Un échec est mémorisé : un SDK cassé n'est pas réimporté à chaque
+    requête, l'ImportError d'origine est relevée à nouveau.
+    """
+    module = _modules.get(name)
+    if module is not None:
+        return module
+    
+    with _lock:
+        if name in _modules:
+            return _modules[name]
+        if name in _failures:
+            raise _failures[name]
+        
+        started = time.perf_counter()
+        try:
+            module = importlib.import_module(name)
+        except ImportError as e:
+            _failures[name] = e
+            raise
+        _modules[name] = module
+        logger.info("📦 %s chargé en %.0f ms", name, (time.perf_counter() - started) * 1000)
+        return module
+
+
+def prewarm_services():
+    """Importer les SDK lourds et initialiser le modèle Gemini partagé"""
+    started = time.perf_counter()
+    try:
+        from services.gemini_service import GeminiService
+        GeminiService()
+        if module_available('httpx'):
+            load_module('httpx')
+        logger.info("🔥 Services préchauffés en %.0f ms", (time.perf_counter() - started) * 1000)
+    except Exception as e:
+        logger.error("❌ Erreur préchauffage des services: %s", e)
+
+
+def start_prewarm():
+    """
+    Préchauffage optionnel (PREWARM_SERVICES=1) dans un thread d'arrière-plan
+    
+    À appeler une fois le port ouvert : le worker répond déjà aux health
+    checks pendant l'import des SDK, la première génération ne le paie plus.
+    """
+    if not PREWARM_ENABLED:
+        return None
+    thread = threading.Thread(target=prewarm_services, name='service-prewarm', daemon=True)
+    thread.start()
+    return thread
@@ -1,22 +1,32 @@
+import os
+import asyncio
 import requests
 import logging
-import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
 from datetime import datetime
 from typing import Dict, List, Optional
+from services.content_renderer import render_content
+from services.http_client import get_http_session, async_http_client
+from metrics import observe_upstream
 
 logger = logging.getLogger(__name__)
 
+# Surchargeable pour pointer vers le serveur de substitution local
+LINKEDIN_API_BASE_URL = os.getenv('LINKEDIN_API_BASE_URL', 'https://api.linkedin.com/v2')
+
 class LinkedInService:
     """Service pour les interactions avec l'API LinkedIn"""
     
     def __init__(self, access_token: str = None):
         self.access_token = access_token
-        self.base_url = "https://api.linkedin.com/v2"
+        self.base_url = LINKEDIN_API_BASE_URL
         
     def set_access_token(self, token: str):
         """Définir le token d'accès"""
         self.access_token = token
     
+    @observe_upstream
     def publish_post(
         self, 
         content: str, 
@@ -81,7 +91,7 @@ class LinkedInService:
                 post_data["specificContent"]["com.linkedin.ugc.ShareContent"]["mentions"] = mention_entities
             
             # Publier le post
-            response = requests.post(
+            response = get_http_session().post(
                 f"{self.base_url}/ugcPosts",
                 headers=headers,
                 json=post_data,
@@ -90,7 +100,7 @@ class LinkedInService:
             
             if response.status_code == 201:
                 post_id = response.headers.get('x-restli-id') or response.json().get('id')
-                logger.info(f"✅ Post LinkedIn publié avec succès: {post_id}")
+                logger.info("✅ Post LinkedIn publié avec succès: %s", post_id)
                 return {
                     'success': True,
                     'post_id': post_id,
@@ -122,43 +132,8 @@ class LinkedInService:
         Returns:
             tuple: (contenu traité, entités de mention)
         """
-        # Pattern pour détecter les mentions @[Nom](URL)
-        mention_pattern = r'@\[(.*?)\]\((.*?)\)'
-        mentions = re.findall(mention_pattern, content)
-        
-        if not mentions:
-            return content, []
-        
-        mention_entities = []
-        processed_content = content
-        
-        for i, (name, url) in enumerate(mentions):
-            # Extraire l'ID LinkedIn de l'URL
-            linkedin_id = url.rstrip('/').split('/')[-1]
-            
-            # Position de la mention dans le texte traité
-            mention_start = processed_content.find(f"@[{name}]({url})")
-            if mention_start == -1:
-                continue
-            
-            # Créer l'entité de mention
-            mention_entity = {
-                "entity": f"urn:li:person:{linkedin_id}",
-                "textRange": {
-                    "start": mention_start,
-                    "length": len(f"@{name}")
-                }
-            }
-            mention_entities.append(mention_entity)
-            
-            # Remplacer par la version simple
-            processed_content = processed_content.replace(
-                f"@[{name}]({url})", 
-                f"@{name}", 
-                1
-            )
-        
-        return processed_content, mention_entities
+        rendered = render_content(content)
+        return rendered['text'], rendered['mentions']
     
     def _upload_images(self, images: List[str], author_urn: str, headers: Dict) -> List[Dict]:
         """
@@ -175,7 +150,7 @@ class LinkedInService:
         # 3. Ajouter l'asset au média
         
         # Implémentation simplifiée pour la démo
-        logger.info(f"📸 Upload de {len(images)} image(s) (fonctionnalité à implémenter)")
+        logger.info("📸 Upload de %s image(s) (fonctionnalité à implémenter)", len(images))
         
         return media_assets
     
@@ -199,7 +174,7 @@ class LinkedInService:
         
         try:
             # Récupérer les statistiques du post
-            response = requests.get(
+            response = get_http_session().get(
                 f"{self.base_url}/socialActions/{post_id}/statistics",
                 headers=headers,
                 timeout=10
@@ -215,13 +190,138 @@ class LinkedInService:
                     'last_updated': datetime.utcnow().isoformat()
                 }
             else:
-                logger.warning(f"Impossible de récupérer les analytics: {response.status_code}")
+                logger.warning("Impossible de récupérer les analytics: %s", response.status_code)
                 return self._get_simulated_analytics()
                 
         except Exception as e:
-            logger.error(f"Erreur récupération analytics: {e}")
+            logger.error("Erreur récupération analytics: %s", e)
             return self._get_simulated_analytics()
     
+    def get_bulk_post_analytics(
+        self,
+        post_ids: List[str],
+        max_workers: int = 16,
+        max_connections_per_host: int = 10
+    ) -> Dict[str, Dict]:
+        """
+        Récupérer les analytics de nombreux posts en parallèle
+        
+        Args:
+            post_ids: IDs des posts LinkedIn
+            max_workers: Nombre maximal de requêtes simultanées
+            max_connections_per_host: Taille du pool de connexions vers l'API
+            
+        Returns:
+            Dict post_id -> métriques (les échecs sont simulés et marqués 'simulated')
+        """
+        post_ids = list(dict.fromkeys(pid for pid in post_ids if pid))
+        if not post_ids:
+            return {}
+        
+        if not self.access_token:
+            return {post_id: self._get_simulated_analytics() for post_id in post_ids}
+        
+        # pool_block borne le nombre de connexions ouvertes vers l'hôte
+        http = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max_connections_per_host,
+            pool_block=True
+        )
+        http.mount('https://', adapter)
+        http.mount('http://', adapter)
+        http.headers.update({
+            "Authorization": f"Bearer {self.access_token}",
+            "X-Restli-Protocol-Version": "2.0.0"
+        })
+        
+        results = {}
+        try:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(post_ids))) as executor:
+                futures = {
+                    executor.submit(self._fetch_post_statistics, http, post_id): post_id
+                    for post_id in post_ids
+                }
+                for future in as_completed(futures):
+                    post_id = futures[future]
+                    try:
+                        results[post_id] = future.result()
+                    except Exception as e:
+                        logger.error("Erreur analytics %s: %s", post_id, e)
+                        results[post_id] = self._get_simulated_analytics()
+        finally:
+            http.close()
+        
+        fetched = sum(1 for metrics in results.values() if not metrics.get('simulated'))
+        logger.info("📊 Analytics récupérées: %s/%s posts", fetched, len(post_ids))
+        return results
+    
+    def _fetch_post_statistics(self, http: requests.Session, post_id: str) -> Dict:
+        """Récupérer les statistiques d'un post avec une session partagée"""
+        response = http.get(
+            f"{self.base_url}/socialActions/{post_id}/statistics",
+            timeout=10
+        )
+        
+        return self._parse_statistics(post_id, response.status_code, response.json)
+    
+    async def get_bulk_post_analytics_async(
+        self,
+        post_ids: List[str],
+        max_connections_per_host: int = 50
+    ) -> Dict[str, Dict]:
+        """
+        Variante async de get_bulk_post_analytics
+        
+        Toutes les requêtes partent sur la même boucle d'événements ; seul le
+        nombre de connexions simultanées vers l'API est borné.
+        """
+        post_ids = list(dict.fromkeys(pid for pid in post_ids if pid))
+        if not post_ids:
+            return {}
+        
+        if not self.access_token:
+            return {post_id: self._get_simulated_analytics() for post_id in post_ids}
+        
+        headers = {
+            "Authorization": f"Bearer {self.access_token}",
+            "X-Restli-Protocol-Version": "2.0.0"
+        }
+        
+        async with async_http_client(max_connections=max_connections_per_host, timeout=10) as client:
+            async def fetch(post_id):
+                try:
+                    response = await client.get(
+                        f"{self.base_url}/socialActions/{post_id}/statistics",
+                        headers=headers
+                    )
+                    return self._parse_statistics(post_id, response.status_code, response.json)
+                except Exception as e:
+                    logger.error("Erreur analytics %s: %s", post_id, e)
+                    return self._get_simulated_analytics()
+            
+            metrics = await asyncio.gather(*[fetch(post_id) for post_id in post_ids])
+        
+        results = dict(zip(post_ids, metrics))
+        fetched = sum(1 for metrics in results.values() if not metrics.get('simulated'))
+        logger.info("📊 Analytics récupérées (async): %s/%s posts", fetched, len(post_ids))
+        return results
+    
+    def _parse_statistics(self, post_id: str, status_code: int, read_json) -> Dict:
+        """Convertir une réponse socialActions/statistics en métriques"""
+        if status_code != 200:
+            logger.warning("Impossible de récupérer les analytics %s: %s", post_id, status_code)
+            return self._get_simulated_analytics()
+        
+        data = read_json()
+        return {
+            'likes': data.get('numLikes', 0),
+            'comments': data.get('numComments', 0),
+            'shares': data.get('numShares', 0),
+            'views': data.get('numViews', 0),
+            'last_updated': datetime.utcnow().isoformat()
+        }
+    
     def _get_simulated_analytics(self) -> Dict:
         """Générer des analytics simulées pour la démo"""
         import random
@@ -241,7 +341,7 @@ class LinkedInService:
         Note: L'API de recherche LinkedIn est très restrictive
         Cette fonction retourne des résultats simulés
         """
-        logger.info(f"🔍 Recherche LinkedIn simulée: {query}")
+        logger.info("🔍 Recherche LinkedIn simulée: %s", query)
         
         # Résultats simulés pour la démo
         simulated_users = [
@@ -289,8 +389,8 @@ class LinkedInService:
         }
         
         try:
-            response = requests.get(
-                "https://api.linkedin.com/v2/userinfo",
+            response = get_http_session().get(
+                f"{self.base_url}/userinfo",
                 headers=headers,
                 timeout=10
             )
@@ -0,0 +1,278 @@
+import os
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+from sqlalchemy import and_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from models.linkedin_models import PostMetricSnapshot
+from services.lazy_imports import load_module
+
+logger = logging.getLogger(__name__)
+
+# Résolution horaire conservée 7 jours, puis un point par jour
+HOURLY_RETENTION_DAYS = int(os.getenv('METRICS_HOURLY_RETENTION_DAYS', 7))
+DAILY_RETENTION_DAYS = int(os.getenv('METRICS_DAILY_RETENTION_DAYS', 365))
+# Intervalle entre deux compactages du thread d'arrière-plan
+COMPACTION_INTERVAL = float(os.getenv('METRICS_COMPACTION_INTERVAL', 3600))
+COMPACTION_BATCH_SIZE = 5000
+
+METRIC_FIELDS = ('likes', 'comments', 'shares', 'views')
+
+def _dialect_insert(session):
+    """Choisir l'INSERT compatible ON CONFLICT selon le moteur"""
+    return pg_insert if session.get_bind().dialect.name == 'postgresql' else sqlite_insert
+
+def _upsert_snapshots(session, rows: List[Dict]):
+    """Insérer des points en remplaçant ceux du même créneau"""
+    if not rows:
+        return
+    
+    table = PostMetricSnapshot.__table__
+    statement = _dialect_insert(session)(table)
+    statement = statement.on_conflict_do_update(
+        index_elements=[table.c.post_id, table.c.resolution, table.c.bucket_start],
+        set_={field: statement.excluded[field] for field in METRIC_FIELDS}
+    )
+    session.execute(statement, rows)
+
+def record_snapshots(db, user_id: int, metrics_rows, now: datetime = None) -> int:
+    """
+    Enregistrer un point horaire par post (le dernier relevé de l'heure l'emporte)
+    
+    Args:
+        db: Instance SQLAlchemy
+        user_id: Propriétaire des posts
+        metrics_rows: Liste de tuples (id du post, métriques)
+        now: Horodatage du relevé (UTC)
+    
+    Returns:
+        int: Nombre de points écrits
+    """
+    now = now or datetime.utcnow()
+    bucket_start = now.replace(minute=0, second=0, microsecond=0)
+    
+    rows = [
+        {
+            'post_id': post_id,
+            'user_id': user_id,
+            'resolution': 'hour',
+            'bucket_start': bucket_start,
+            'likes': metrics.get('likes', 0),
+            'comments': metrics.get('comments', 0),
+            'shares': metrics.get('shares', 0),
+            'views': metrics.get('views', 0)
+        }
+        for post_id, metrics in metrics_rows
+    ]
+    _upsert_snapshots(db.session, rows)
+    return len(rows)
+
+def compact_snapshots(db, now: datetime = None) -> Dict:
+    """
+    Sous-échantillonner et purger l'historique
+    
+    Les points horaires de plus de HOURLY_RETENTION_DAYS sont réduits au
+    dernier point de chaque jour (compteurs cumulés), et les points
+    journaliers de plus de DAILY_RETENTION_DAYS sont supprimés.
+    
+    Returns:
+        Dict avec le nombre de points journaliers écrits et supprimés
+    """
+    now = now or datetime.utcnow()
+    hourly_cutoff = (now - timedelta(days=HOURLY_RETENTION_DAYS)).replace(hour=0, minute=0, second=0, microsecond=0)
+    daily_cutoff = now - timedelta(days=DAILY_RETENTION_DAYS)
+    
+    old_hourly = db.session.query(
+        PostMetricSnapshot.post_id,
+        PostMetricSnapshot.user_id,
+        PostMetricSnapshot.bucket_start,
+        *[getattr(PostMetricSnapshot, field) for field in METRIC_FIELDS]
+    ).filter(
+        PostMetricSnapshot.resolution == 'hour',
+        PostMetricSnapshot.bucket_start < hourly_cutoff
+    ).order_by(PostMetricSnapshot.post_id, PostMetricSnapshot.bucket_start)
+    
+    # Les lignes arrivent triées : le dernier point vu pour (post, jour) gagne
+    daily_points = {}
+    written = 0
+    for post_id, user_id, bucket_start, *values in old_hourly.yield_per(COMPACTION_BATCH_SIZE):
+        day = bucket_start.replace(hour=0)
+        daily_points[(post_id, day)] = {
+            'post_id': post_id,
+            'user_id': user_id,
+            'resolution': 'day',
+            'bucket_start': day,
+            **dict(zip(METRIC_FIELDS, values))
+        }
+        if len(daily_points) >= COMPACTION_BATCH_SIZE:
+            # Garder le jour en cours, il peut encore recevoir des points
+            pending = daily_points.pop((post_id, day))
+            _upsert_snapshots(db.session, list(daily_points.values()))
+            written += len(daily_points)
+            daily_points = {(post_id, day): pending}
+    
+    _upsert_snapshots(db.session, list(daily_points.values()))
+    written += len(daily_points)
+    
+    deleted = PostMetricSnapshot.query.filter(
+        PostMetricSnapshot.resolution == 'hour',
+        PostMetricSnapshot.bucket_start < hourly_cutoff
+    ).delete(synchronize_session=False)
+    
+    deleted += PostMetricSnapshot.query.filter(
+        PostMetricSnapshot.resolution == 'day',
+        PostMetricSnapshot.bucket_start < daily_cutoff
+    ).delete(synchronize_session=False)
+    
+    db.session.commit()
+    logger.info("🗜️ Historique compacté: %s points journaliers, %s points supprimés", written, deleted)
+    return {'dailyWritten': written, 'deleted': deleted}
+
+class SnapshotCompactor:
+    """
+    Compactage périodique de l'historique, hors des requêtes
+    
+    Chaque worker compacte toutes les COMPACTION_INTERVAL secondes (premier
+    passage après un intervalle, pas au démarrage). Le compactage est
+    idempotent : un second worker ne trouve plus rien à réduire. Pour un
+    compactage unique, planifier `flask compact-metrics` et laisser
+    METRICS_COMPACTION_INTERVAL=0.
+    """
+    
+    def __init__(self):
+        self.app = None
+        self.db = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop_event = threading.Event()
+    
+    def init_app(self, app, db):
+        self.app = app
+        self.db = db
+    
+    def compact_in_context(self):
+        with self.app.app_context():
+            try:
+                return compact_snapshots(self.db)
+            except Exception:
+                self.db.session.rollback()
+                raise
+    
+    def start(self):
+        """Démarrer le thread de compactage (idempotent, à appeler après le fork)"""
+        if self.app is None or COMPACTION_INTERVAL <= 0:
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name='metrics-compaction', daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        self._stop_event.set()
+    
+    def _run(self):
+        while not self._stop_event.wait(COMPACTION_INTERVAL):
+            try:
+                self.compact_in_context()
+            except Exception as e:
+                logger.error("Erreur compactage historique: %s", e)
+
+
+snapshot_compactor = SnapshotCompactor()
+
+
+def init_snapshot_compactor(app, db):
+    """Associer le compacteur à l'application (démarré dans chaque worker)"""
+    snapshot_compactor.init_app(app, db)
+    return snapshot_compactor
+
+def _to_series(rows, as_numpy: bool) -> Dict:
+    """Convertir des lignes (bucket, likes, comments, shares, views) en colonnes"""
+    series = {
+        # bucket_start est stocké en UTC naïf
+        'timestamps': [int(row[0].replace(tzinfo=timezone.utc).timestamp()) for row in rows],
+        **{field: [int(row[index + 1] or 0) for row in rows] for index, field in enumerate(METRIC_FIELDS)}
+    }
+    
+    if as_numpy:
+        # Chargé au premier appel : pas d'import de numpy au démarrage
+        np = load_module('numpy')
+        series['timestamps'] = np.asarray(series['timestamps'], dtype='datetime64[s]')
+        for field in METRIC_FIELDS:
+            series[field] = np.asarray(series[field], dtype=np.int64)
+    
+    return series
+
+def get_post_series(post_id: int, since: datetime = None, as_numpy: bool = False) -> Dict:
+    """
+    Historique d'un post, points journaliers puis horaires, triés par date
+    
+    Returns:
+        Dict de colonnes de même longueur : 'timestamps' (secondes UTC), 'likes', 'comments', 'shares', 'views'
+    """
+    query = PostMetricSnapshot.query.with_entities(
+        PostMetricSnapshot.bucket_start,
+        *[getattr(PostMetricSnapshot, field) for field in METRIC_FIELDS]
+    ).filter(PostMetricSnapshot.post_id == post_id)
+    
+    if since:
+        query = query.filter(PostMetricSnapshot.bucket_start >= since)
+    
+    return _to_series(query.order_by(PostMetricSnapshot.bucket_start).all(), as_numpy)
+
+def get_user_series(user_id: int, resolution: str = 'day', since: datetime = None, as_numpy: bool = False) -> Dict:
+    """
+    Historique agrégé de tous les posts d'un utilisateur
+    
+    Les compteurs étant cumulés, chaque créneau somme la dernière valeur
+    connue de chaque post, reportée tant que le post n'a pas de nouveau
+    relevé (et pas seulement les posts relevés dans ce créneau). En
+    résolution 'day', les points horaires des derniers jours sont ramenés
+    au dernier point de chaque jour.
+    
+    Returns:
+        Dict de colonnes de même longueur, sommées par créneau
+    """
+    query = PostMetricSnapshot.query.with_entities(
+        PostMetricSnapshot.post_id,
+        PostMetricSnapshot.bucket_start,
+        *[getattr(PostMetricSnapshot, field) for field in METRIC_FIELDS]
+    ).filter(PostMetricSnapshot.user_id == user_id)
+    if resolution == 'hour' and since is None:
+        # Points horaires : fenêtre de rétention, les jours plus anciens servent de point de départ
+        since = (datetime.utcnow() - timedelta(days=HOURLY_RETENTION_DAYS)).replace(hour=0, minute=0, second=0, microsecond=0)
+    
+    # Valeur de chaque post au début de la période : dernier point avant `since`
+    last_values = {}
+    if since:
+        latest = query.with_entities(
+            PostMetricSnapshot.post_id,
+            func.max(PostMetricSnapshot.bucket_start).label('bucket_start')
+        ).filter(PostMetricSnapshot.bucket_start < since).group_by(PostMetricSnapshot.post_id).subquery()
+        baseline = query.join(latest, and_(
+            PostMetricSnapshot.post_id == latest.c.post_id,
+            PostMetricSnapshot.bucket_start == latest.c.bucket_start
+        ))
+        for post_id, _, *values in baseline:
+            last_values[post_id] = [value or 0 for value in values]
+        query = query.filter(PostMetricSnapshot.bucket_start >= since)
+    
+    totals = [sum(values[index] for values in last_values.values()) for index in range(len(METRIC_FIELDS))]
+    points = []
+    for post_id, bucket_start, *values in query.order_by(PostMetricSnapshot.bucket_start, PostMetricSnapshot.id):
+        values = [value or 0 for value in values]
+        previous = last_values.get(post_id, [0] * len(METRIC_FIELDS))
+        totals = [total + value - old for total, value, old in zip(totals, values, previous)]
+        last_values[post_id] = values
+        
+        bucket = bucket_start.replace(hour=0) if resolution == 'day' else bucket_start
+        if points and points[-1][0] == bucket:
+            points[-1] = (bucket, *totals)
+        else:
+            points.append((bucket, *totals))
+    
+    return _to_series(points, as_numpy)
@@ -1,4 +1,5 @@
-import requests
+from services.http_client import get_http_session
+from metrics import observe_upstream
 import os
 from datetime import datetime, timedelta
 import logging
@@ -7,12 +8,26 @@ from typing import List, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+NEWS_API_BASE_URL = os.getenv('NEWS_API_BASE_URL', 'https://newsapi.org/v2')
+
+# Mapping des secteurs vers des mots-clés de recherche
+INDUSTRY_KEYWORDS = {
+    'tech': 'technologie OR informatique OR numérique OR startup OR IA',
+    'marketing': 'marketing OR publicité OR communication OR digital',
+    'finance': 'finance OR économie OR banque OR investissement OR fintech',
+    'health': 'santé OR médecine OR bien-être OR pharmaceutique OR biotechnologie',
+    'education': 'éducation OR formation OR enseignement OR université OR edtech',
+    'rh': 'ressources humaines OR emploi OR recrutement OR travail OR RH',
+    'consulting': 'conseil OR consulting OR stratégie OR management OR transformation',
+    'retail': 'commerce OR distribution OR vente OR e-commerce OR retail'
+}
+
 class NewsService:
     """Service pour récupérer les actualités via NewsAPI"""
     
     def __init__(self):
         self.api_key = os.getenv('NEWS_API_KEY')
-        self.base_url = "https://newsapi.org/v2"
+        self.base_url = NEWS_API_BASE_URL
         
         if not self.api_key:
             logger.warning("NEWS_API_KEY non configurée, mode simulation activé")
@@ -21,6 +36,7 @@ class NewsService:
             self.simulation_mode = False
             logger.info("✅ NewsAPI configuré")
     
+    @observe_upstream
     def search_news(
         self, 
         keyword: str, 
@@ -44,44 +60,66 @@ class NewsService:
             return self._get_simulated_news(keyword, language)
         
         try:
-            date_from = (datetime.utcnow() - timedelta(days=days)).strftime('%Y-%m-%d')
-            
-            params = {
-                'q': keyword,
-                'from': date_from,
-                'sortBy': 'relevancy',
-                'language': language,
-                'apiKey': self.api_key,
-                'pageSize': min(page_size, 100)  # Limite API
-            }
+            params = self._search_params(keyword, language, days, page_size)
+            logger.info("🔍 Recherche actualités: %s (%s)", keyword, language)
             
-            logger.info(f"🔍 Recherche actualités: {keyword} ({language})")
-            
-            response = requests.get(
+            response = get_http_session().get(
                 f"{self.base_url}/everything",
                 params=params,
                 timeout=15
             )
-            
-            if response.status_code == 200:
-                data = response.json()
-                articles = self._format_articles(data.get('articles', []))
-                
-                return {
-                    'success': True,
-                    'articles': articles,
-                    'total_results': data.get('totalResults', 0),
-                    'keyword': keyword,
-                    'language': language
-                }
-            else:
-                logger.error(f"Erreur NewsAPI: {response.status_code}")
-                return self._get_simulated_news(keyword, language)
+            return self._search_result(response.status_code, response.json, keyword, language)
                 
         except Exception as e:
-            logger.error(f"Erreur recherche actualités: {e}")
+            logger.error("Erreur recherche actualités: %s", e)
             return self._get_simulated_news(keyword, language)
     
+    @observe_upstream
+    async def search_news_async(
+        self,
+        client,
+        keyword: str,
+        language: str = "fr",
+        days: int = 30,
+        page_size: int = 20
+    ) -> Dict:
+        """Variante async de search_news avec un client httpx partagé"""
+        if self.simulation_mode:
+            return self._get_simulated_news(keyword, language)
+        
+        try:
+            params = self._search_params(keyword, language, days, page_size)
+            response = await client.get(f"{self.base_url}/everything", params=params)
+            return self._search_result(response.status_code, response.json, keyword, language)
+        except Exception as e:
+            logger.error("Erreur recherche actualités: %s", e)
+            return self._get_simulated_news(keyword, language)
+    
+    def _search_params(self, keyword: str, language: str, days: int, page_size: int) -> Dict:
+        date_from = (datetime.utcnow() - timedelta(days=days)).strftime('%Y-%m-%d')
+        return {
+            'q': keyword,
+            'from': date_from,
+            'sortBy': 'relevancy',
+            'language': language,
+            'apiKey': self.api_key,
+            'pageSize': min(page_size, 100)  # Limite API
+        }
+    
+    def _search_result(self, status_code: int, read_json, keyword: str, language: str) -> Dict:
+        if status_code != 200:
+            logger.error("Erreur NewsAPI: %s", status_code)
+            return self._get_simulated_news(keyword, language)
+        
+        data = read_json()
+        return {
+            'success': True,
+            'articles': self._format_articles(data.get('articles', [])),
+            'total_results': data.get('totalResults', 0),
+            'keyword': keyword,
+            'language': language
+        }
+    
     def get_trending_news(
         self, 
         industry: str = "business", 
@@ -125,9 +163,9 @@ class NewsService:
             if language == 'fr':
                 params['country'] = 'fr'
             
-            logger.info(f"📰 Récupération actualités tendance: {category} ({language})")
+            logger.info("📰 Récupération actualités tendance: %s (%s)", category, language)
             
-            response = requests.get(
+            response = get_http_session().get(
                 f"{self.base_url}/top-headlines",
                 params=params,
                 timeout=15
@@ -145,11 +183,11 @@ class NewsService:
                     'language': language
                 }
             else:
-                logger.error(f"Erreur NewsAPI trending: {response.status_code}")
+                logger.error("Erreur NewsAPI trending: %s", response.status_code)
                 return self._get_simulated_trending(industry, language)
                 
         except Exception as e:
-            logger.error(f"Erreur actualités tendance: {e}")
+            logger.error("Erreur actualités tendance: %s", e)
             return self._get_simulated_trending(industry, language)
     
     def get_industry_news(
@@ -169,19 +207,7 @@ class NewsService:
         Returns:
             Dict contenant les articles du secteur
         """
-        # Mapping des secteurs vers des mots-clés de recherche
-        industry_keywords = {
-            'tech': 'technologie OR informatique OR numérique OR startup OR IA',
-            'marketing': 'marketing OR publicité OR communication OR digital',
-            'finance': 'finance OR économie OR banque OR investissement OR fintech',
-            'health': 'santé OR médecine OR bien-être OR pharmaceutique OR biotechnologie',
-            'education': 'éducation OR formation OR enseignement OR université OR edtech',
-            'rh': 'ressources humaines OR emploi OR recrutement OR travail OR RH',
-            'consulting': 'conseil OR consulting OR stratégie OR management OR transformation',
-            'retail': 'commerce OR distribution OR vente OR e-commerce OR retail'
-        }
-        
-        keywords = industry_keywords.get(industry, industry)
+        keywords = INDUSTRY_KEYWORDS.get(industry, industry)
         
         return self.search_news(
             keyword=keywords,
@@ -190,6 +216,16 @@ class NewsService:
             page_size=15
         )
     
+    async def get_industry_news_async(self, client, industry: str, language: str = "fr", days: int = 7) -> Dict:
+        """Variante async de get_industry_news"""
+        return await self.search_news_async(
+            client,
+            keyword=INDUSTRY_KEYWORDS.get(industry, industry),
+            language=language,
+            days=days,
+            page_size=15
+        )
+    
     def _format_articles(self, articles: List[Dict]) -> List[Dict]:
         """Formater les articles pour l'interface"""
         formatted_articles = []
@@ -247,7 +283,7 @@ class NewsService:
     
     def _get_simulated_news(self, keyword: str, language: str) -> Dict:
         """Générer des actualités simulées pour la démo"""
-        logger.info(f"📰 Génération actualités simulées: {keyword}")
+        logger.info("📰 Génération actualités simulées: %s", keyword)
         
         simulated_articles = [
             {
@@ -293,7 +329,7 @@ class NewsService:
     
     def _get_simulated_trending(self, industry: str, language: str) -> Dict:
         """Générer des actualités tendance simulées"""
-        logger.info(f"📈 Génération trending simulé: {industry}")
+        logger.info("📈 Génération trending simulé: %s", industry)
         
         industry_topics = {
             'tech': [
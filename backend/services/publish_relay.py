@@ -0,0 +1,202 @@
+import os
+import threading
+import logging
+from datetime import datetime, timedelta
+from typing import Dict
+from models.linkedin_models import LinkedInUser, PublishOutbox
+from services.linkedin_service import LinkedInService
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = int(os.getenv('PUBLISH_MAX_ATTEMPTS', 5))
+BATCH_SIZE = int(os.getenv('PUBLISH_BATCH_SIZE', 10))
+POLL_INTERVAL = float(os.getenv('PUBLISH_POLL_INTERVAL', 5))
+# Durée pendant laquelle une entrée réclamée est réservée à un worker
+LEASE_SECONDS = 120
+
+
+class PublishRelay:
+    """
+    Relais de l'outbox de publication
+
+    Un thread par worker réclame les entrées en attente, publie sur LinkedIn
+    hors transaction puis met à jour le post. Les entrées dont le bail a
+    expiré (worker mort en cours de publication) sont reprises.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.db = None
+        self._thread = None
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def init_app(self, app, db):
+        """Associer le relais à l'application et à la base"""
+        self.app = app
+        self.db = db
+
+    def start(self):
+        """Démarrer le thread de relais (idempotent, à appeler après le fork)"""
+        if os.getenv('PUBLISH_RELAY_ENABLED', 'true').lower() != 'true':
+            logger.info("⏸️ Relais de publication désactivé")
+            return
+
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name='publish-relay', daemon=True)
+            self._thread.start()
+        logger.info("📮 Relais de publication démarré")
+
+    def stop(self):
+        """Arrêter le thread de relais"""
+        self._stop_event.set()
+        self._wake_event.set()
+
+    def wake(self):
+        """Réveiller le relais après l'ajout d'une entrée"""
+        self._wake_event.set()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                with self.app.app_context():
+                    processed = self.drain_once()
+            except Exception as e:
+                logger.error("Erreur relais de publication: %s", e)
+                processed = 0
+
+            # Enchaîner tant que le lot était plein
+            if processed >= BATCH_SIZE:
+                continue
+
+            self._wake_event.wait(POLL_INTERVAL)
+            self._wake_event.clear()
+
+    def drain_once(self, batch_size: int = BATCH_SIZE) -> int:
+        """
+        Traiter un lot d'entrées de l'outbox
+
+        Returns:
+            int: Nombre d'entrées traitées
+        """
+        entry_ids = self._claim(batch_size)
+        for entry_id in entry_ids:
+            try:
+                self._process(entry_id)
+            except Exception as e:
+                # L'entrée sera reprise à l'expiration du bail
+                self.db.session.rollback()
+                logger.error("Erreur traitement outbox %s: %s", entry_id, e)
+        return len(entry_ids)
+
+    def _claim(self, batch_size: int) -> list:
+        """Réclamer un lot d'entrées dans une transaction courte"""
+        db = self.db
+        now = datetime.utcnow()
+
+        try:
+            # Tri sur next_attempt_at : ix_publish_outbox_status_next_attempt_at
+            # sert le filtre ; avec ORDER BY id, le planificateur parcourait
+            # toute la table par clé primaire (check_query_plans.py)
+            entries = PublishOutbox.query.filter(
+                db.or_(
+                    db.and_(PublishOutbox.status == 'pending', PublishOutbox.next_attempt_at <= now),
+                    db.and_(PublishOutbox.status == 'processing', PublishOutbox.locked_until < now)
+                )
+            ).order_by(PublishOutbox.next_attempt_at, PublishOutbox.id).limit(batch_size).with_for_update(skip_locked=True).all()
+
+            claimed = []
+            for entry in entries:
+                # Bail expiré après la dernière tentative (worker mort pendant
+                # la publication) : abandonner au lieu de reprendre sans fin
+                if (entry.attempts or 0) >= MAX_ATTEMPTS:
+                    self._dead_letter(entry, entry.last_error or 'Bail expiré pendant la publication', now)
+                    continue
+                entry.status = 'processing'
+                entry.locked_until = now + timedelta(seconds=LEASE_SECONDS)
+                entry.attempts = (entry.attempts or 0) + 1
+                claimed.append(entry.id)
+
+            db.session.commit()
+            return claimed
+        except Exception:
+            db.session.rollback()
+            raise
+
+    def _process(self, entry_id: int):
+        """Publier le post d'une entrée réclamée et enregistrer le résultat"""
+        db = self.db
+        entry = db.session.get(PublishOutbox, entry_id)
+        post = entry.post if entry else None
+
+        if not post:
+            if entry:
+                entry.status = 'done'
+                entry.processed_at = datetime.utcnow()
+                db.session.commit()
+            return
+
+        linkedin_user = db.session.get(LinkedInUser, post.linkedin_user_id)
+        if not linkedin_user or not linkedin_user.is_active:
+            result = {'success': False, 'error': 'LinkedIn non connecté', 'permanent': True}
+        else:
+            # Libérer la connexion pendant l'appel LinkedIn
+            access_token = linkedin_user.access_token
+            linkedin_id = linkedin_user.linkedin_id
+            content = post.content
+            db.session.commit()
+            result = LinkedInService(access_token).publish_post(
+                content=content,
+                linkedin_id=linkedin_id
+            )
+
+        self._record_result(entry_id, result)
+
+    def _record_result(self, entry_id: int, result: Dict):
+        db = self.db
+        entry = db.session.get(PublishOutbox, entry_id)
+        post = entry.post
+        now = datetime.utcnow()
+
+        if result['success']:
+            post.status = 'published'
+            post.published_at = now
+            post.linkedin_post_id = result.get('post_id')
+            entry.status = 'done'
+            entry.last_error = None
+            entry.processed_at = now
+            logger.info("📤 Post %s publié via l'outbox (user %s)", post.id, post.user_id)
+        elif result.get('permanent') or entry.attempts >= MAX_ATTEMPTS:
+            self._dead_letter(entry, result.get('error'), now)
+        else:
+            # Backoff exponentiel : 30s, 60s, 120s...
+            entry.status = 'pending'
+            entry.last_error = result.get('error')
+            entry.next_attempt_at = now + timedelta(seconds=30 * 2 ** (entry.attempts - 1))
+            logger.warning("🔁 Publication du post %s replanifiée (tentative %s)", post.id, entry.attempts)
+
+        entry.locked_until = None
+        db.session.commit()
+
+    def _dead_letter(self, entry, error: str, now: datetime):
+        """Marquer l'entrée et son post en échec définitif (sans commit)"""
+        if entry.post:
+            entry.post.status = 'failed'
+        entry.status = 'failed'
+        entry.last_error = error
+        entry.locked_until = None
+        entry.processed_at = now
+        logger.error("❌ Publication du post %s abandonnée après %s tentatives: %s", entry.post_id, entry.attempts, error)
+
+
+publish_relay = PublishRelay()
+
+
+def init_publish_relay(app, db_instance):
+    """Initialiser le relais de publication partagé"""
+    publish_relay.init_app(app, db_instance)
+    return publish_relay
@@ -0,0 +1,160 @@
+import os
+import time
+import zlib
+import threading
+import logging
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import event, func
+from models.linkedin_models import ContentTemplate
+from services.usage_counters import template_usage
+from metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+# Fréquence de vérification du tampon de version en base (autres workers)
+VERSION_CHECK_INTERVAL = float(os.getenv('TEMPLATE_CATALOGUE_CHECK_INTERVAL', 10))
+# Rechargement forcé pour récupérer les compteurs d'usage des autres workers
+MAX_SNAPSHOT_AGE = float(os.getenv('TEMPLATE_CATALOGUE_MAX_AGE', 300))
+
+
+class CatalogueSnapshot:
+    """Instantané immuable des templates, indexé par id, catégorie et tag"""
+    
+    def __init__(self, templates: List[Dict], version: Tuple):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.by_id = MappingProxyType({
+            template['id']: MappingProxyType({**template, 'tags': tuple(template['tags'])})
+            for template in templates
+        })
+        self.active_ids = tuple(template['id'] for template in templates if template['isActive'])
+        
+        by_category: Dict[str, List[int]] = {}
+        by_tag: Dict[str, List[int]] = {}
+        for template_id in self.active_ids:
+            template = self.by_id[template_id]
+            if template['category']:
+                by_category.setdefault(template['category'].lower(), []).append(template_id)
+            for tag in template['tags']:
+                by_tag.setdefault(str(tag).lower(), []).append(template_id)
+        
+        self.by_category = MappingProxyType({key: tuple(ids) for key, ids in by_category.items()})
+        self.by_tag = MappingProxyType({key: tuple(ids) for key, ids in by_tag.items()})
+        self.stamp = f"{version[0]}-{version[1]}"
+
+
+class TemplateCatalogue:
+    """
+    Catalogue des templates propre au processus
+    
+    L'instantané est remplacé d'un bloc, jamais modifié : les lecteurs
+    n'ont pas besoin de verrou. Il est invalidé par les événements ORM de
+    ce processus, et par le tampon de version (nombre de templates et
+    dernier updated_at) vérifié au plus toutes les VERSION_CHECK_INTERVAL
+    secondes pour les modifications faites ailleurs.
+    """
+    
+    def __init__(self):
+        self.db = None
+        self._snapshot: Optional[CatalogueSnapshot] = None
+        self._stale = True
+        self._last_check = 0.0
+        self._reload_lock = threading.Lock()
+    
+    def init_app(self, db):
+        self.db = db
+    
+    def invalidate(self):
+        """Forcer le rechargement au prochain accès"""
+        self._stale = True
+    
+    def _read_version(self) -> Tuple:
+        count, last_update = self.db.session.query(
+            func.count(ContentTemplate.id),
+            func.max(ContentTemplate.updated_at)
+        ).one()
+        return (count, last_update.isoformat() if last_update else '0')
+    
+    def _load(self) -> CatalogueSnapshot:
+        template_usage.mark_snapshot()
+        version = self._read_version()
+        templates = [template.to_dict() for template in ContentTemplate.query.order_by(ContentTemplate.id).all()]
+        snapshot = CatalogueSnapshot(templates, version)
+        logger.info("📚 Catalogue de templates chargé: %s templates (version %s)", len(templates), snapshot.stamp)
+        return snapshot
+    
+    def snapshot(self) -> CatalogueSnapshot:
+        """Instantané courant, rechargé s'il est invalidé ou périmé"""
+        snapshot = self._snapshot
+        now = time.monotonic()
+        
+        needs_reload = (
+            snapshot is None
+            or self._stale
+            or now - snapshot.loaded_at > MAX_SNAPSHOT_AGE
+        )
+        if not needs_reload and now - self._last_check > VERSION_CHECK_INTERVAL:
+            self._last_check = now
+            needs_reload = self._read_version() != snapshot.version
+        
+        record_cache('template_catalogue', not needs_reload)
+        if not needs_reload:
+            return snapshot
+        
+        with self._reload_lock:
+            # Un autre thread a pu recharger pendant l'attente du verrou
+            if self._snapshot is not snapshot and not self._stale:
+                return self._snapshot
+            self._stale = False
+            self._snapshot = self._load()
+            self._last_check = time.monotonic()
+            return self._snapshot
+    
+    def get(self, template_id) -> Optional[MappingProxyType]:
+        """Template par id (actif ou non), sans requête"""
+        try:
+            return self.snapshot().by_id.get(int(template_id))
+        except (TypeError, ValueError):
+            return None
+    
+    def list_active(self, category: str = None, tag: str = None) -> List[MappingProxyType]:
+        """Templates actifs, filtrés par catégorie et/ou tag"""
+        snapshot = self.snapshot()
+        ids = snapshot.active_ids
+        if category:
+            ids = snapshot.by_category.get(category.lower(), ())
+        if tag:
+            tagged = set(snapshot.by_tag.get(tag.lower(), ()))
+            ids = [template_id for template_id in ids if template_id in tagged]
+        return [snapshot.by_id[template_id] for template_id in ids]
+
+
+template_catalogue = TemplateCatalogue()
+
+
+def _invalidate_catalogue(mapper, connection, target):
+    template_catalogue.invalidate()
+
+
+for _event_name in ('after_insert', 'after_update', 'after_delete'):
+    event.listen(ContentTemplate, _event_name, _invalidate_catalogue)
+
+
+def catalogue_etag(snapshot: CatalogueSnapshot, entries: List[Dict]) -> str:
+    """ETag : version du catalogue et ordre/compteurs de la réponse"""
+    usage = ','.join(f"{entry['id']}:{entry['usageCount']}" for entry in entries)
+    return f"tpl-{snapshot.stamp}-{zlib.crc32(usage.encode()):08x}"
+
+
+def init_template_catalogue(app, db_instance):
+    """Initialiser le catalogue et le charger au démarrage"""
+    template_catalogue.init_app(db_instance)
+    try:
+        with app.app_context():
+            template_catalogue.snapshot()
+    except Exception as e:
+        # Table absente avant la première migration : chargement au premier accès
+        template_catalogue.invalidate()
+        logger.warning("⚠️ Catalogue de templates non chargé au démarrage: %s", e)
+    return template_catalogue
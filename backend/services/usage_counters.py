@@ -0,0 +1,133 @@
+import os
+import atexit
+import threading
+import logging
+from collections import Counter
+from typing import Dict
+from sqlalchemy import update
+from models.linkedin_models import ContentTemplate
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = float(os.getenv('TEMPLATE_USAGE_FLUSH_INTERVAL', 30))
+
+
+class TemplateUsageBuffer:
+    """
+    Compteurs d'usage des templates, tamponnés en mémoire par worker
+    
+    Les incréments sont regroupés puis écrits périodiquement en un seul
+    UPDATE atomique par template (usage_count = usage_count + n), sans
+    lecture-modification-écriture ni transaction dans la requête.
+    """
+    
+    def __init__(self):
+        self.app = None
+        self.db = None
+        self._pending = Counter()
+        self._unseen = Counter()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop_event = threading.Event()
+    
+    def init_app(self, app, db):
+        """Associer le tampon à l'application et à la base"""
+        self.app = app
+        self.db = db
+    
+    def increment(self, template_id: int, amount: int = 1):
+        """Compter une utilisation (aucun accès base)"""
+        with self._lock:
+            self._pending[template_id] += amount
+            self._unseen[template_id] += amount
+    
+    def pending(self) -> Dict[int, int]:
+        """Incréments pas encore écrits en base"""
+        with self._lock:
+            return dict(self._pending)
+    
+    def unseen(self) -> Dict[int, int]:
+        """Incréments de ce worker absents du dernier instantané du catalogue"""
+        with self._lock:
+            return dict(self._unseen)
+    
+    def mark_snapshot(self):
+        """Le catalogue relit la base : seuls les incréments non écrits restent à ajouter"""
+        with self._lock:
+            self._unseen = Counter(self._pending)
+    
+    def flush(self) -> int:
+        """
+        Écrire les incréments en attente dans une seule transaction
+        
+        Returns:
+            int: Nombre de templates mis à jour
+        """
+        with self._lock:
+            batch = self._pending
+            self._pending = Counter()
+        
+        if not batch:
+            return 0
+        
+        db = self.db
+        try:
+            for template_id, amount in sorted(batch.items()):
+                db.session.execute(
+                    update(ContentTemplate)
+                    .where(ContentTemplate.id == template_id)
+                    .values(
+                        usage_count=db.func.coalesce(ContentTemplate.usage_count, 0) + amount,
+                        # Ne pas déclencher onupdate : le catalogue ne doit pas être invalidé
+                        updated_at=ContentTemplate.updated_at
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+            db.session.commit()
+            logger.info("📊 Compteurs de templates écrits: %s templates", len(batch))
+            return len(batch)
+        except Exception as e:
+            db.session.rollback()
+            # Remettre les incréments pour la prochaine tentative
+            with self._lock:
+                self._pending.update(batch)
+            logger.error("Erreur écriture compteurs templates: %s", e)
+            return 0
+    
+    def flush_in_context(self):
+        """Écrire les incréments depuis un contexte hors requête (thread, arrêt)"""
+        if self.app is None:
+            return 0
+        with self.app.app_context():
+            return self.flush()
+    
+    def start(self):
+        """Démarrer le thread d'écriture périodique (idempotent, à appeler après le fork)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name='template-usage-flush', daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        """Arrêter le thread et écrire ce qui reste"""
+        self._stop_event.set()
+        self.flush_in_context()
+    
+    def _run(self):
+        while not self._stop_event.wait(FLUSH_INTERVAL):
+            try:
+                self.flush_in_context()
+            except Exception as e:
+                logger.error("Erreur thread compteurs templates: %s", e)
+
+
+template_usage = TemplateUsageBuffer()
+
+
+def init_template_usage(app, db_instance):
+    """Initialiser le tampon partagé et l'écriture à l'arrêt du processus"""
+    template_usage.init_app(app, db_instance)
+    atexit.register(template_usage.flush_in_context)
+    return template_usage
@@ -0,0 +1,167 @@
+import os
+import atexit
+import threading
+import logging
+from datetime import datetime
+from typing import List
+from flask import has_request_context, session
+from sqlalchemy import insert, select
+from models.linkedin_models import GeminiUsage
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = float(os.getenv('GEMINI_USAGE_FLUSH_INTERVAL', 30))
+# Au-delà (base indisponible), les lignes les plus anciennes sont abandonnées
+MAX_PENDING = int(os.getenv('GEMINI_USAGE_MAX_PENDING', 10000))
+
+
+class GeminiUsageLedger:
+    """
+    Registre des tokens Gemini, tamponné en mémoire par worker
+    
+    Chaque génération ajoute une ligne en mémoire ; le thread d'écriture
+    insère le lot en un seul INSERT multi-lignes, sans commit dans la
+    requête.
+    """
+    
+    def __init__(self):
+        self.app = None
+        self.db = None
+        self._pending = []
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop_event = threading.Event()
+    
+    def init_app(self, app, db):
+        """Associer le registre à l'application et à la base"""
+        self.app = app
+        self.db = db
+    
+    def record(self, operation: str, model: str, prompt_tokens: int, response_tokens: int):
+        """Enregistrer un appel Gemini (aucun accès base), attribué à l'utilisateur de la session"""
+        user_id = session.get('user_id') if has_request_context() else None
+        metrics.inc('gemini_tokens_total', prompt_tokens, operation=operation, kind='prompt')
+        metrics.inc('gemini_tokens_total', response_tokens, operation=operation, kind='response')
+        row = {
+            'user_id': user_id,
+            'operation': operation,
+            'model': model,
+            'prompt_tokens': prompt_tokens,
+            'response_tokens': response_tokens,
+            'created_at': datetime.utcnow()
+        }
+        with self._lock:
+            if len(self._pending) >= MAX_PENDING:
+                self._pending.pop(0)
+                self._dropped += 1
+            self._pending.append(row)
+    
+    def pending(self) -> List[dict]:
+        """Lignes pas encore écrites en base"""
+        with self._lock:
+            return list(self._pending)
+    
+    def flush(self) -> int:
+        """
+        Écrire les lignes en attente dans une seule transaction (ligne par
+        ligne si le lot est refusé)
+        
+        Returns:
+            int: Nombre de lignes écrites
+        """
+        with self._lock:
+            batch = self._pending
+            self._pending = []
+            dropped, self._dropped = self._dropped, 0
+        
+        if dropped:
+            logger.warning("⚠️ Registre Gemini: %s appels abandonnés (base indisponible)", dropped)
+        if not batch:
+            return 0
+        
+        db = self.db
+        try:
+            db.session.execute(insert(GeminiUsage), batch)
+            db.session.commit()
+            logger.info("📊 Registre Gemini écrit: %s appels", len(batch))
+            return len(batch)
+        except Exception as e:
+            db.session.rollback()
+            logger.error("Erreur écriture registre Gemini (lot de %s): %s", len(batch), e)
+        
+        # Lot refusé : ligne par ligne, pour qu'une ligne invalide ne bloque
+        # pas les autres. Les lignes refusées sont abandonnées ; les autres
+        # sont remises en attente si la base elle-même est indisponible.
+        written, rejected = 0, 0
+        for index, row in enumerate(batch):
+            try:
+                db.session.execute(insert(GeminiUsage), [row])
+                db.session.commit()
+                written += 1
+            except Exception as e:
+                db.session.rollback()
+                if not self._database_available():
+                    self._requeue(batch[index:])
+                    break
+                rejected += 1
+                logger.error("Ligne du registre Gemini abandonnée (%s): %s", row.get('operation'), e)
+        if written:
+            logger.info("📊 Registre Gemini écrit ligne par ligne: %s appels (%s rejetés)", written, rejected)
+        return written
+    
+    def _database_available(self) -> bool:
+        try:
+            self.db.session.execute(select(1))
+            return True
+        except Exception:
+            self.db.session.rollback()
+            return False
+    
+    def _requeue(self, rows: List[dict]):
+        """Remettre des lignes en tête pour la prochaine tentative"""
+        with self._lock:
+            self._pending[:0] = rows[-MAX_PENDING:]
+            overflow = len(self._pending) - MAX_PENDING
+            if overflow > 0:
+                del self._pending[:overflow]
+                self._dropped += overflow
+    
+    def flush_in_context(self):
+        """Écrire les lignes depuis un contexte hors requête (thread, arrêt)"""
+        if self.app is None:
+            return 0
+        with self.app.app_context():
+            return self.flush()
+    
+    def start(self):
+        """Démarrer le thread d'écriture périodique (idempotent, à appeler après le fork)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name='gemini-usage-flush', daemon=True)
+            self._thread.start()
+    
+    def stop(self):
+        """Arrêter le thread et écrire ce qui reste"""
+        self._stop_event.set()
+        self.flush_in_context()
+    
+    def _run(self):
+        while not self._stop_event.wait(FLUSH_INTERVAL):
+            try:
+                self.flush_in_context()
+            except Exception as e:
+                logger.error("Erreur thread registre Gemini: %s", e)
+
+
+usage_ledger = GeminiUsageLedger()
+
+
+def init_usage_ledger(app, db_instance):
+    """Initialiser le registre partagé et l'écriture à l'arrêt du processus"""
+    usage_ledger.init_app(app, db_instance)
+    atexit.register(usage_ledger.flush_in_context)
+    return usage_ledger
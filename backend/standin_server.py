@@ -0,0 +1,330 @@
+# backend/standin_server.py - Serveur de substitution LinkedIn / NewsAPI pour les tests de charge
+#
+# Usage :
+#   python standin_server.py --port 8099 --latency lognormal:80:0.5 --error-rate 0.02 --rate-limit-rate 0.05
+#   python standin_server.py --mode record --cassette cassettes/prod.jsonl   (proxy + enregistrement)
+#   python standin_server.py --mode replay --cassette cassettes/prod.jsonl   (rejoue les formes réelles)
+#
+# Puis pointer l'API vers le serveur :
+#   LINKEDIN_API_BASE_URL=http://localhost:8099/linkedin/v2
+#   LINKEDIN_TOKEN_URL=http://localhost:8099/linkedin/oauth/v2/accessToken
+#   NEWS_API_BASE_URL=http://localhost:8099/newsapi/v2
+
+import os
+import json
+import time
+import random
+import argparse
+import logging
+import threading
+from datetime import datetime, timedelta
+from flask import Flask, jsonify, request, Response
+import requests
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Hôtes réels utilisés en mode enregistrement
+UPSTREAMS = {
+    'linkedin': 'https://api.linkedin.com',
+    'linkedin_oauth': 'https://www.linkedin.com',
+    'newsapi': 'https://newsapi.org'
+}
+
+# En-têtes de réponse conservés dans les cassettes
+RECORDED_HEADERS = ('content-type', 'x-restli-id', 'retry-after')
+
+# Routes jamais enregistrées (jetons OAuth) : proxy seul
+UNRECORDED_ROUTES = ('linkedin.accessToken',)
+
+# Champs masqués avant écriture dans une cassette (jetons et données personnelles)
+REDACTED_KEYS = {
+    'access_token', 'refresh_token', 'id_token',
+    'sub', 'email', 'name', 'given_name', 'family_name', 'picture',
+    'localizedFirstName', 'localizedLastName', 'vanityName'
+}
+
+
+def redact(value):
+    """Copie d'un document JSON avec les champs de REDACTED_KEYS masqués"""
+    if isinstance(value, dict):
+        return {
+            key: (f'redacted-{key}' if isinstance(item, str) else None) if key in REDACTED_KEYS else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    return value
+
+
+def redact_body(body: str):
+    """Corps JSON masqué, ou None s'il n'est pas JSON (il n'est alors pas enregistré)"""
+    try:
+        return json.dumps(redact(json.loads(body)), ensure_ascii=False)
+    except ValueError:
+        return None
+
+
+class LatencyModel:
+    """Distribution de latence configurable : fixed:MS, uniform:MIN:MAX, lognormal:MEDIAN:SIGMA"""
+
+    def __init__(self, spec: str = 'fixed:0'):
+        parts = spec.split(':')
+        self.kind = parts[0]
+        self.params = [float(p) for p in parts[1:]]
+        if self.kind not in ('fixed', 'uniform', 'lognormal'):
+            raise ValueError(f"Distribution de latence inconnue: {spec}")
+
+    def sample(self, rng: random.Random) -> float:
+        """Tirer une latence en secondes"""
+        if self.kind == 'fixed':
+            ms = self.params[0] if self.params else 0
+        elif self.kind == 'uniform':
+            ms = rng.uniform(self.params[0], self.params[1])
+        else:
+            median, sigma = self.params[0], self.params[1] if len(self.params) > 1 else 0.5
+            ms = rng.lognormvariate(0, sigma) * median
+        return max(ms, 0) / 1000.0
+
+
+class Cassette:
+    """Réponses enregistrées (JSONL), rejouées en tourniquet par route"""
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.entries = {}
+        self._cursors = {}
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding='utf-8') as handle:
+                for line in handle:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.entries.setdefault(entry['route'], []).append(entry)
+            logger.info("📼 Cassette chargée: %s réponses", sum(len(v) for v in self.entries.values()))
+
+    def record(self, route: str, status: int, headers: dict, body: str):
+        entry = {'route': route, 'status': status, 'headers': headers, 'body': body}
+        with self._lock:
+            self.entries.setdefault(route, []).append(entry)
+            if self.path:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as handle:
+                    handle.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+    def next(self, route: str):
+        with self._lock:
+            entries = self.entries.get(route)
+            if not entries:
+                return None
+            index = self._cursors.get(route, 0)
+            self._cursors[route] = (index + 1) % len(entries)
+            return entries[index]
+
+
+def create_standin_app(
+    mode: str = 'synthetic',
+    latency: str = 'fixed:0',
+    error_rate: float = 0.0,
+    rate_limit_rate: float = 0.0,
+    retry_after: int = 1,
+    cassette_path: str = None,
+    seed: int = None
+) -> Flask:
+    """
+    Construire le serveur de substitution
+
+    Args:
+        mode: 'synthetic' (réponses générées), 'record' (proxy vers les vraies API,
+            jetons et données personnelles masqués dans la cassette) ou 'replay'
+        latency: Distribution de latence appliquée à chaque réponse
+        error_rate: Proportion de réponses 500
+        rate_limit_rate: Proportion de réponses 429 (avec Retry-After)
+        retry_after: Valeur de Retry-After en secondes
+        cassette_path: Fichier JSONL des réponses enregistrées
+        seed: Graine pour rendre un scénario reproductible
+    """
+    app = Flask(__name__)
+    latency_model = LatencyModel(latency)
+    cassette = Cassette(cassette_path)
+    rng = random.Random(seed)
+    rng_lock = threading.Lock()
+    stats = {'requests': 0, 'errors': 0, 'rate_limited': 0}
+
+    def inject_faults():
+        """Appliquer latence et pannes ; renvoie une réponse d'erreur ou None"""
+        with rng_lock:
+            delay = latency_model.sample(rng)
+            roll = rng.random()
+            stats['requests'] += 1
+            if roll < rate_limit_rate:
+                stats['rate_limited'] += 1
+            elif roll < rate_limit_rate + error_rate:
+                stats['errors'] += 1
+        time.sleep(delay)
+
+        if roll < rate_limit_rate:
+            response = jsonify({'status': 429, 'message': 'Resource level throttle limit reached'})
+            response.status_code = 429
+            response.headers['Retry-After'] = str(retry_after)
+            return response
+        if roll < rate_limit_rate + error_rate:
+            response = jsonify({'status': 500, 'message': 'Internal Server Error'})
+            response.status_code = 500
+            return response
+        return None
+
+    def serve(route: str, upstream: str, upstream_path: str, synthetic):
+        fault = inject_faults()
+        if fault is not None:
+            return fault
+
+        if mode == 'record':
+            upstream_response = requests.request(
+                request.method,
+                f"{UPSTREAMS[upstream]}{upstream_path}",
+                params=request.args,
+                data=request.get_data(),
+                headers={k: v for k, v in request.headers if k.lower() not in ('host', 'content-length')},
+                timeout=30
+            )
+            headers = {k: v for k, v in upstream_response.headers.items() if k.lower() in RECORDED_HEADERS}
+            body = None if route in UNRECORDED_ROUTES else redact_body(upstream_response.text)
+            if body is not None:
+                cassette.record(route, upstream_response.status_code, headers, body)
+            else:
+                logger.info("📼 Réponse %s non enregistrée (jeton ou corps non JSON)", route)
+            return Response(upstream_response.text, status=upstream_response.status_code, headers=headers)
+
+        if mode == 'replay':
+            entry = cassette.next(route)
+            if entry is not None:
+                return Response(entry['body'], status=entry['status'], headers=entry['headers'])
+            logger.warning("📼 Aucune réponse enregistrée pour %s, réponse synthétique", route)
+
+        return synthetic()
+
+    # --- LinkedIn ---
+
+    @app.route('/linkedin/v2/ugcPosts', methods=['POST'])
+    def ugc_posts():
+        def synthetic():
+            with rng_lock:
+                post_id = f"urn:li:share:{rng.randint(10**18, 10**19 - 1)}"
+            response = jsonify({'id': post_id})
+            response.status_code = 201
+            response.headers['x-restli-id'] = post_id
+            return response
+        return serve('linkedin.ugcPosts', 'linkedin', '/v2/ugcPosts', synthetic)
+
+    @app.route('/linkedin/v2/socialActions/<path:post_id>/statistics')
+    def statistics(post_id):
+        def synthetic():
+            # Valeurs stables par post pour des rafraîchissements cohérents
+            post_rng = random.Random(post_id)
+            return jsonify({
+                'numLikes': post_rng.randint(10, 150),
+                'numComments': post_rng.randint(2, 25),
+                'numShares': post_rng.randint(1, 15),
+                'numViews': post_rng.randint(200, 2000)
+            })
+        return serve('linkedin.statistics', 'linkedin', f'/v2/socialActions/{post_id}/statistics', synthetic)
+
+    @app.route('/linkedin/v2/userinfo')
+    def userinfo():
+        def synthetic():
+            return jsonify({
+                'sub': 'standin-member',
+                'email': 'standin@example.com',
+                'email_verified': True,
+                'name': 'Stand In',
+                'given_name': 'Stand',
+                'family_name': 'In',
+                'picture': None,
+                'locale': {'country': 'FR', 'language': 'fr'}
+            })
+        return serve('linkedin.userinfo', 'linkedin', '/v2/userinfo', synthetic)
+
+    @app.route('/linkedin/oauth/v2/accessToken', methods=['POST'])
+    def access_token():
+        def synthetic():
+            with rng_lock:
+                token = f"standin-token-{rng.randint(0, 10**9)}"
+            return jsonify({
+                'access_token': token,
+                'expires_in': 5184000,
+                'scope': 'openid,email,profile,w_member_social'
+            })
+        return serve('linkedin.accessToken', 'linkedin_oauth', '/oauth/v2/accessToken', synthetic)
+
+    # --- NewsAPI ---
+
+    def synthetic_articles(topic: str, count: int):
+        now = datetime.utcnow()
+        articles = [
+            {
+                'source': {'id': None, 'name': f'Source {i % 5}'},
+                'author': 'Stand-in',
+                'title': f'{topic} : article de test {i + 1}',
+                'description': f'Description générée pour {topic} ({i + 1}).',
+                'url': f'https://example.com/{i + 1}',
+                'urlToImage': None,
+                'publishedAt': (now - timedelta(hours=i)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                'content': f'Contenu de test pour {topic}...'
+            }
+            for i in range(count)
+        ]
+        return jsonify({'status': 'ok', 'totalResults': count * 10, 'articles': articles})
+
+    @app.route('/newsapi/v2/everything')
+    def everything():
+        page_size = min(int(request.args.get('pageSize', 20)), 100)
+        return serve(
+            'newsapi.everything', 'newsapi', '/v2/everything',
+            lambda: synthetic_articles(request.args.get('q', 'actualité'), page_size)
+        )
+
+    @app.route('/newsapi/v2/top-headlines')
+    def top_headlines():
+        page_size = min(int(request.args.get('pageSize', 20)), 100)
+        return serve(
+            'newsapi.top-headlines', 'newsapi', '/v2/top-headlines',
+            lambda: synthetic_articles(request.args.get('category', 'business'), page_size)
+        )
+
+    @app.route('/_standin/stats')
+    def standin_stats():
+        return jsonify(stats)
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serveur de substitution LinkedIn / NewsAPI')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=int(os.getenv('STANDIN_PORT', 8099)))
+    parser.add_argument('--mode', choices=['synthetic', 'record', 'replay'], default='synthetic')
+    parser.add_argument('--latency', default=os.getenv('STANDIN_LATENCY', 'fixed:0'),
+                        help='fixed:MS, uniform:MIN:MAX ou lognormal:MEDIAN:SIGMA')
+    parser.add_argument('--error-rate', type=float, default=float(os.getenv('STANDIN_ERROR_RATE', 0)))
+    parser.add_argument('--rate-limit-rate', type=float, default=float(os.getenv('STANDIN_RATE_LIMIT_RATE', 0)))
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--cassette', default=os.getenv('STANDIN_CASSETTE'))
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    app = create_standin_app(
+        mode=args.mode,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        cassette_path=args.cassette,
+        seed=args.seed
+    )
+    logger.info("🧪 Serveur de substitution (%s) sur http://%s:%s", args.mode, args.host, args.port)
+    app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == '__main__':
+    main()